@@ -0,0 +1,299 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.bible_utils import decode_rtf_text
+from core.cache_utils import file_signature, get_cache_path
+from core.db_pool import open_readonly_connection
+from core.module_schema import get_module_schema
+
+# ========== 성경 본문 압축 바이너리 형식 (mmap) ==========
+# 성경 모듈(.mybible/.twm/.cdb/.sqlite3)을 한 번 변환해 두면, 이후 절 조회는
+# SQLite 쿼리와 RTF 디코딩 없이 mmap 한 파일에서 오프셋 두 개를 읽어 바로 잘라냅니다.
+# 여러 Streamlit 워커 프로세스가 같은 파일을 열면 OS 페이지 캐시를 함께 씁니다.
+#
+# 파일 구성 (모두 little-endian)
+#   머리말  : HEADER  = 매직 "BBIN", 형식 버전, 원본 mtime_ns, 원본 크기, 장 수, 절 칸 수, 절 수
+#   장 목록 : 장마다 CHAPTER_ENTRY = (책, 장, 첫 절 칸 번호, 절 칸 수)
+#   오프셋  : 절 칸 수 + 1 개의 u32 (본문 묶음 안의 시작 위치, 마지막은 끝 위치)
+#   본문    : 디코딩한 평문을 UTF-8 로 이어 붙인 묶음
+# 장마다 절 0 ~ 마지막 절까지 칸을 두므로 (책, 장, 절) 의 본문은
+#   text[offsets[첫 칸 + 절] : offsets[첫 칸 + 절 + 1]]  (길이 0 이면 없는 절)
+# 원본 모듈의 (mtime, size) 가 머리말과 다르면 오래된 파일로 보고 쓰지 않습니다.
+
+BIBLE_BIN_DIR = "bible_bin"
+BIBLE_BIN_EXT = ".bbin"
+MAGIC = b"BBIN"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sIqqIII")
+CHAPTER_ENTRY = struct.Struct("<IIII")
+OFFSET = struct.Struct("<I")
+# 절 번호가 이보다 큰 행은 손상된 값으로 보고 건너뜀 (장마다 절 칸을 0 부터 두므로)
+MAX_VERSE_SLOT = 999
+
+# 형식별 전체 본문 조회 SQL. 결과 행: (책, 장, 절, 본문)
+_ALL_VERSES_SQL = {
+    ".mybible": "SELECT book, chapter, verse, text FROM verses",
+    ".twm": "SELECT bi, ci, vi, data FROM bible",
+    ".cdb": "SELECT book, chapter, verse, btext FROM Bible",
+}
+
+
+@lru_cache(maxsize=None)
+def bible_binary_path(module_path: str) -> str:
+    """성경 모듈별 바이너리 경로 (캐시 폴더/bible_bin/<이름>-<경로 해시>.bbin)"""
+    abs_path = os.path.abspath(module_path)
+    digest = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:12]
+    name = os.path.basename(abs_path).split(".")[0]
+    folder = get_cache_path(BIBLE_BIN_DIR)
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, f"{name}-{digest}{BIBLE_BIN_EXT}")
+
+
+def _all_verses_sql(path: str) -> Optional[str]:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in _ALL_VERSES_SQL:
+        return _ALL_VERSES_SQL[ext]
+    if ext in (".sqlite3", ".sqlite"):
+        schema = get_module_schema(path, "bible_sqlite")
+        if schema:
+            c = schema.columns
+            return f"SELECT {c['book']}, {c['chapter']}, {c['verse']}, {c['text']} FROM {schema.table}"
+    return None
+
+
+# ========== 변환 ==========
+
+def _read_module_verses(path: str) -> Optional[Dict[Tuple[int, int], Dict[int, bytes]]]:
+    """모듈 전체 본문을 {(책, 장): {절: UTF-8 평문}} 으로 읽습니다. (같은 절은 첫 행 사용)"""
+    sql = _all_verses_sql(path)
+    if sql is None:
+        return None
+    chapters: Dict[Tuple[int, int], Dict[int, bytes]] = {}
+    conn = open_readonly_connection(path)
+    try:
+        for book, chap, verse, raw in conn.execute(sql):
+            try:
+                book, chap, verse = int(book), int(chap), int(verse)
+            except (TypeError, ValueError):
+                continue
+            if book < 0 or chap < 0 or not 0 <= verse <= MAX_VERSE_SLOT or not raw:
+                continue
+            verses = chapters.setdefault((book, chap), {})
+            if verse in verses:
+                continue
+            content = decode_rtf_text(raw).strip()
+            if content:
+                verses[verse] = content.encode("utf-8")
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    return chapters
+
+
+def compile_bible_module(path: str, force: bool = False) -> Optional[Tuple[int, int]]:
+    """
+    성경 모듈 하나를 바이너리로 변환합니다. (프로세스 풀 워커에서도 실행)
+    이미 최신이면 다시 만들지 않습니다. 반환: (절 수, 파일 크기), 성경 모듈이 아니면 None
+    """
+    sig = file_signature(path)
+    if sig is None:
+        return None
+    out_path = bible_binary_path(sig[0])
+    if not force:
+        existing = _read_header(out_path)
+        if existing is not None and existing[2:4] == sig[1:]:
+            return existing[6], os.path.getsize(out_path)
+
+    chapters = _read_module_verses(sig[0])
+    if not chapters:
+        return None
+
+    directory = []
+    offsets: List[int] = [0]
+    blob: List[bytes] = []
+    pos = 0
+    verse_count = 0
+    for book, chap in sorted(chapters):
+        verses = chapters[(book, chap)]
+        directory.append((book, chap, len(offsets) - 1, max(verses) + 1))
+        for verse in range(max(verses) + 1):
+            data = verses.get(verse, b"")
+            if data:
+                blob.append(data)
+                pos += len(data)
+                verse_count += 1
+            offsets.append(pos)
+    if pos > 0xFFFFFFFF:
+        return None
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, sig[1], sig[2], len(directory), len(offsets) - 1, verse_count))
+            f.write(b"".join(CHAPTER_ENTRY.pack(*entry) for entry in directory))
+            f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+            f.write(b"".join(blob))
+        os.replace(tmp_path, out_path)
+    except OSError:
+        # 다른 프로세스가 mmap 으로 열고 있는 경우 (Windows) 등은 기존 파일을 유지
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+    return verse_count, os.path.getsize(out_path)
+
+
+def compile_bible_modules(
+    files: Iterable[str],
+    force: bool = False,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+) -> Dict[str, Optional[Tuple[int, int]]]:
+    """여러 성경 모듈을 프로세스 풀로 변환합니다. 반환: {모듈 경로: (절 수, 파일 크기) 또는 None}"""
+    # core.parallel_scan → core.search_engine → core.chapter_cache → 이 모듈 순환을 피해 여기서 import
+    from core.parallel_scan import map_files_parallel
+
+    files = list(files)
+    # 열어 둔 바이너리가 있으면 교체할 수 없는 OS(Windows)가 있으므로 먼저 닫음
+    close_bible_binaries()
+    results: Dict[str, Optional[Tuple[int, int]]] = {}
+    for done, (_, path, res) in enumerate(map_files_parallel(compile_bible_module, files, force), 1):
+        results[path] = res
+        if progress_callback:
+            progress_callback(done, len(files), path)
+    return results
+
+
+# ========== 읽기 ==========
+
+def _read_header(bin_path: str) -> Optional[Tuple]:
+    try:
+        with open(bin_path, "rb") as f:
+            header = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    if header[0] != MAGIC or header[1] != FORMAT_VERSION:
+        return None
+    return header
+
+
+class BibleBinary:
+    """mmap 으로 연 성경 바이너리 (읽기 전용, 여러 스레드에서 같이 사용 가능)"""
+
+    def __init__(self, bin_path: str):
+        self.path = bin_path
+        with open(bin_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (_, _, self.source_mtime_ns, self.source_size, n_chapters, n_slots, self.verse_count) = HEADER.unpack_from(
+            self._mm, 0
+        )
+        dir_start = HEADER.size
+        self._offsets_start = dir_start + n_chapters * CHAPTER_ENTRY.size
+        self._text_start = self._offsets_start + (n_slots + 1) * OFFSET.size
+        # 장 목록만 파이썬 사전으로 (66권 기준 1200개 정도), 절 오프셋/본문은 mmap 에서 바로 읽음
+        self._chapters: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        for book, chap, first, count in CHAPTER_ENTRY.iter_unpack(self._mm[dir_start : self._offsets_start]):
+            self._chapters[(book, chap)] = (first, count)
+
+    def __len__(self) -> int:
+        return len(self._chapters)
+
+    def chapters(self) -> List[Tuple[int, int]]:
+        """(책, 장) 목록 (정렬됨)"""
+        return list(self._chapters)
+
+    def _span(self, slot: int) -> Tuple[int, int]:
+        start, end = struct.unpack_from("<II", self._mm, self._offsets_start + slot * OFFSET.size)
+        return self._text_start + start, self._text_start + end
+
+    def verse_bytes(self, book: int, chap: int, verse: int) -> Optional[memoryview]:
+        """절 본문의 UTF-8 바이트 (복사 없이 mmap 을 가리키는 memoryview). 없으면 None"""
+        entry = self._chapters.get((book, chap))
+        if entry is None or not 0 <= verse < entry[1]:
+            return None
+        start, end = self._span(entry[0] + verse)
+        return memoryview(self._mm)[start:end] if end > start else None
+
+    def verse(self, book: int, chap: int, verse: int) -> Optional[str]:
+        entry = self._chapters.get((book, chap))
+        if entry is None or not 0 <= verse < entry[1]:
+            return None
+        start, end = self._span(entry[0] + verse)
+        return self._mm[start:end].decode("utf-8") if end > start else None
+
+    def chapter(self, book: int, chap: int) -> Dict[int, str]:
+        """장 전체 {절: 본문} (오프셋은 한 번에 읽음)"""
+        entry = self._chapters.get((book, chap))
+        if entry is None:
+            return {}
+        first, count = entry
+        offsets = struct.unpack_from(f"<{count + 1}I", self._mm, self._offsets_start + first * OFFSET.size)
+        base = self._text_start
+        mm = self._mm
+        return {
+            verse: mm[base + offsets[verse] : base + offsets[verse + 1]].decode("utf-8")
+            for verse in range(count)
+            if offsets[verse + 1] > offsets[verse]
+        }
+
+    def iter_verses(self) -> Iterator[Tuple[int, int, int, str]]:
+        """성경 전체를 (책, 장, 절, 본문) 순서로 순회"""
+        for book, chap in self._chapters:
+            for verse, text in self.chapter(book, chap).items():
+                yield book, chap, verse, text
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except (BufferError, ValueError):
+            # 바깥에 memoryview 가 남아 있으면 닫지 못함 (참조가 사라지면 함께 해제)
+            pass
+
+
+# 원본 경로 -> ((원본 mtime, size, 바이너리 mtime), 바이너리). 다른 프로세스에서 변환해도 바이너리 mtime 으로 감지
+_binaries: Dict[str, Tuple[Tuple[int, int, int], Optional[BibleBinary]]] = {}
+_binaries_lock = threading.Lock()
+
+
+def get_bible_binary(module_path: str) -> Optional[BibleBinary]:
+    """성경 모듈의 최신 바이너리 (변환 전이거나 원본이 바뀌었으면 None). 프로세스당 한 번 엶"""
+    sig = file_signature(module_path)
+    if sig is None:
+        return None
+    bin_path = bible_binary_path(sig[0])
+    try:
+        bin_mtime = os.stat(bin_path).st_mtime_ns
+    except OSError:
+        bin_mtime = 0
+    key = (sig[1], sig[2], bin_mtime)
+    with _binaries_lock:
+        cached = _binaries.get(sig[0])
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        binary: Optional[BibleBinary] = None
+        header = _read_header(bin_path) if bin_mtime else None
+        if header is not None and header[2:4] == sig[1:]:
+            try:
+                binary = BibleBinary(bin_path)
+            except (OSError, ValueError, struct.error):
+                binary = None
+        # 교체된 예전 바이너리는 다른 스레드가 읽는 중일 수 있으므로 닫지 않고 참조만 버림
+        _binaries[sig[0]] = (key, binary)
+        return binary
+
+
+def close_bible_binaries() -> None:
+    with _binaries_lock:
+        for _, binary in _binaries.values():
+            if binary is not None:
+                binary.close()
+        _binaries.clear()
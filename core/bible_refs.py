@@ -0,0 +1,218 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from core.bible_utils import get_ultimate_bible_map
+
+# ========== 성경 참조 인식기 (Aho–Corasick) ==========
+# get_ultimate_bible_map 의 모든 책 별칭(한글/영문/약어, 대소문자 변형)을
+# 하나의 Aho–Corasick 오토마톤으로 묶어, 임의의 본문에서
+#   "요 3:16", "롬8:28-30", "1Cor 13", "요한복음 3장 16절"
+# 같은 자유 형식 참조를 본문 길이에 비례하는 시간(한 번 훑기)으로 찾습니다.
+#   1) 오토마톤으로 별칭 후보 위치를 모두 찾고 (앞 글자가 문자/숫자면 단어 중간이라 제외)
+#   2) 후보 뒤에 장[:절[-절]] 이 이어지는 것만 참조로 인정합니다.
+# 같은 위치에서 시작하는 별칭은 가장 긴 것을 우선합니다. (요한1서 > 요한 > 요)
+# 입력창 해석(parse_reference)과 태그 없는 문서의 일괄 색인에 같이 씁니다.
+
+MAX_CHAPTER = 150
+MAX_VERSE = 176
+
+# 별칭 뒤: [.] 장 ( [:장편] 절 [절] [-~ 절 [절]] | [장편] )  (시편은 "23편 1절" 처럼 "편"으로 셈)
+_REF_TAIL = re.compile(
+    r"\.?[ \t]*(\d{1,3})"
+    r"(?:[ \t]*(?:[:：]|장|편)[ \t]*(\d{1,3})(?:[ \t]*절)?"
+    r"(?:[ \t]*[-~–][ \t]*(\d{1,3})(?![\d:])(?:[ \t]*절)?)?"
+    r"|(?:[ \t]*[장편])?)"
+    r"(?!\d)"
+)
+_SPACE = re.compile(r"\s+")
+
+
+class BibleReference(NamedTuple):
+    start: int  # 본문에서 참조 시작 위치 (책 이름 첫 글자)
+    end: int  # 참조 끝 위치
+    book: str  # 표준 책 코드 (예: "Joh")
+    book_id: int  # 1~66
+    chapter: int
+    verse_from: Optional[int]  # 장만 있으면 None
+    verse_to: Optional[int]  # 범위가 아니면 None
+
+    def verse_input(self) -> str:
+        """검색 입력창 형식의 절 문자열 ("16", "28-30", 장만 있으면 "0")"""
+        if self.verse_from is None:
+            return "0"
+        if self.verse_to is not None:
+            return f"{self.verse_from}-{self.verse_to}"
+        return str(self.verse_from)
+
+
+def _fold_alias(alias: str) -> str:
+    return _SPACE.sub("", alias).lower()
+
+
+class ReferenceRecognizer:
+    """책 별칭 Aho–Corasick 오토마톤 + 장/절 꼬리 해석기"""
+
+    def __init__(self, bible_alias_flat: Dict[str, str], bible_raw_map: Dict[str, List[str]]):
+        book_ids = {std: i + 1 for i, std in enumerate(bible_raw_map)}
+        aliases: Dict[str, str] = {}
+        for alias, std in bible_alias_flat.items():
+            folded = _fold_alias(alias)
+            if not folded or std not in book_ids:
+                continue
+            # 대소문자 변형끼리 다른 책을 가리키면 소문자 키의 매핑을 따름 (parse_reference 와 같은 규칙)
+            std = bible_alias_flat.get(folded, std)
+            aliases[folded] = std
+            # "1cor" → "1 cor" 처럼 숫자 뒤 공백도 허용
+            if folded[0].isdigit() and len(folded) > 1 and not folded[1].isdigit():
+                aliases.setdefault(f"{folded[0]} {folded[1:]}", std)
+
+        self._book_ids = book_ids
+        self._aliases = aliases
+        self._alphabet = frozenset("".join(aliases))
+
+        # 상태 0 = 루트. goto[state][문자] -> 상태, out[state] = (별칭 길이, 표준 코드)
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Optional[Tuple[int, str]]] = [None]
+        for alias, std in aliases.items():
+            state = 0
+            for ch in alias:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(None)
+                state = nxt
+            out[state] = (len(alias), std)
+
+        # 실패 링크와 출력 링크 (실패 경로에서 가장 가까운 별칭 끝 상태)
+        fail = [0] * len(goto)
+        out_link = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                f = goto[f].get(ch, 0)
+                fail[nxt] = f if f != nxt else 0
+                out_link[nxt] = f if out[f] is not None else out_link[f]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        self._out_link = out_link
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+    def book_id(self, std: str) -> Optional[int]:
+        return self._book_ids.get(std)
+
+    def _alias_hits(self, text: str, folded: str) -> List[Tuple[int, int, str]]:
+        """단어 경계에서 시작하는 별칭 후보 [(시작, 끝, 표준 코드), ...] (시작 위치 순, 같은 시작이면 긴 것 먼저)"""
+        goto, fail, out, out_link = self._goto, self._fail, self._out, self._out_link
+        alphabet = self._alphabet
+        hits: List[Tuple[int, int, str]] = []
+        state = 0
+        for i, ch in enumerate(folded):
+            if ch not in alphabet:
+                state = 0
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not state:
+                continue
+            end = i + 1
+            s = state if out[state] is not None else out_link[state]
+            while s:
+                length, std = out[s]
+                start = end - length
+                if start == 0 or not text[start - 1].isalnum():
+                    hits.append((start, end, std))
+                s = out_link[s]
+        hits.sort(key=lambda h: (h[0], h[0] - h[1]))
+        return hits
+
+    def _tail(self, text: str, hit: Tuple[int, int, str], chapter_only: bool) -> Optional[BibleReference]:
+        start, end, std = hit
+        # 별칭 바로 뒤가 글자면 더 긴 단어의 일부 (예: "Joseph" 의 "jos")
+        if end < len(text) and text[end].isalpha() and text[end] != "장":
+            return None
+        m = _REF_TAIL.match(text, end)
+        if not m:
+            return None
+        chapter = int(m.group(1))
+        verse_from = int(m.group(2)) if m.group(2) else None
+        verse_to = int(m.group(3)) if m.group(3) else None
+        if not 1 <= chapter <= MAX_CHAPTER:
+            return None
+        if verse_from is None:
+            if not chapter_only:
+                return None
+        elif verse_from > MAX_VERSE:
+            return None
+        if verse_to is not None and not verse_from < verse_to <= MAX_VERSE:
+            verse_to = None
+        # 뒤쪽 공백/구두점은 참조 범위에 넣지 않음
+        ref_end = m.end()
+        while ref_end > end and text[ref_end - 1] in " \t.":
+            ref_end -= 1
+        return BibleReference(start, ref_end, std, self._book_ids[std], chapter, verse_from, verse_to)
+
+    def finditer(self, text: str, chapter_only: bool = True) -> Iterator[BibleReference]:
+        """본문의 성경 참조를 위치 순서대로 (겹치지 않게) 반환. chapter_only=False 면 절이 있는 참조만"""
+        if not text:
+            return
+        folded = text.lower()
+        if len(folded) != len(text):
+            # 소문자 변환으로 길이가 바뀌는 문자(İ 등)가 있으면 글자별로 변환해 위치를 맞춤
+            folded = "".join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+        cursor = 0
+        for hit in self._alias_hits(text, folded):
+            if hit[0] < cursor:
+                continue
+            ref = self._tail(text, hit, chapter_only)
+            if ref is not None:
+                cursor = ref.end
+                yield ref
+
+    def findall(self, text: str, chapter_only: bool = True) -> List[BibleReference]:
+        return list(self.finditer(text, chapter_only))
+
+    def leading_book(self, text: str) -> Optional[str]:
+        """입력 맨 앞의 책 이름을 표준 코드로 (예: "롬8:28" → "Rom", "1 Cor" → "1Co")"""
+        text = text.strip()
+        folded = text.lower()
+        if len(folded) != len(text):
+            return None
+        for start, end, std in self._alias_hits(text, folded):
+            if start > 0:
+                break
+            if end == len(text) or not text[end].isalpha() or text[end] == "장":
+                return std
+        return None
+
+    def parse(self, text: str) -> Optional[BibleReference]:
+        """입력 전체가 하나의 참조("요 3:16", "1Cor 13")이면 그 참조, 아니면 None"""
+        text = text.strip()
+        for ref in self.finditer(text):
+            if ref.start == 0 and not text[ref.end :].strip():
+                return ref
+            break
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_reference_recognizer() -> ReferenceRecognizer:
+    """get_ultimate_bible_map 기반 인식기 (프로세스당 한 번 생성)"""
+    bible_alias_flat, bible_raw_map = get_ultimate_bible_map()
+    return ReferenceRecognizer(bible_alias_flat, bible_raw_map)
+
+
+def find_bible_references(text: str, chapter_only: bool = True) -> List[BibleReference]:
+    """본문에서 자유 형식 성경 참조를 모두 찾습니다."""
+    return get_reference_recognizer().findall(text, chapter_only)
@@ -1,24 +1,22 @@
-import re
 import streamlit as st
 
+from core.rtf_text import strip_rtf_html
+from core.verse_keys import book_id
+
 
 @st.cache_data(show_spinner=False)
 def decode_rtf(raw):
     """Decode RTF text into plain text."""
+    return decode_rtf_text(raw)
+
+
+def decode_rtf_text(raw):
+    """Uncached body of decode_rtf (for bulk indexing, where memoizing every row would only bloat memory)."""
     if not raw:
         return ""
     try:
         raw = raw.decode("utf-8") if isinstance(raw, bytes) else str(raw)
-
-        def repl(m):
-            try:
-                return chr(int(m.group(1)))
-            except Exception:
-                return m.group(0)
-
-        text = re.sub(r"\\u(-?\d+)\??", repl, raw)
-        text = re.sub(r"\{\\.*?\}|\\([a-z]{1,10})(-?\d+)? ?|<.*?>", "", text)
-        return re.sub(r"\s+", " ", text.replace("}", "").replace("{", "")).strip()
+        return strip_rtf_html(raw)
     except Exception:
         return str(raw)
 
@@ -210,19 +208,6 @@ def get_ultimate_bible_map():
 # === 새로 추가: 성경 모듈 ID 변환 ===
 def get_book_id_from_code(book_code):
     """
-    표준 책 코드 (Gen, Exo 등) 를 성경 모듈 DB 의 book_id 로 변환
+    표준 책 코드 (Gen, Exo 등) 를 성경 모듈 DB 의 book_id 로 변환 (core.verse_keys 의 책 순서표, O(1))
     """
-    book_order = [
-        "Gen", "Exo", "Lev", "Num", "Deu", "Jos", "Jud", "Rut",
-        "1Sa", "2Sa", "1Ki", "2Ki", "1Ch", "2Ch", "Ezr", "Neh", "Est",
-        "Job", "Psa", "Pro", "Ecc", "Sng", "Isa", "Jer", "Lam", "Eze",
-        "Dan", "Hos", "Joe", "Amo", "Oba", "Jon", "Mic", "Nah", "Hab",
-        "Zep", "Hag", "Zec", "Mal",
-        "Mat", "Mar", "Luk", "Joh", "Act", "Rom", "1Co", "2Co", "Gal",
-        "Eph", "Phi", "Col", "1Th", "2Th", "1Ti", "2Ti", "Tit", "Phm",
-        "Heb", "Jam", "1Pe", "2Pe", "1Jo", "2Jo", "3Jo", "Jude", "Rev"
-    ]
-    try:
-        return book_order.index(book_code) + 1
-    except ValueError:
-        return None
+    return book_id(book_code)
@@ -0,0 +1,71 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from core.chapter_cache import get_bible_chapter
+from core.search_engine import scan_bible_module_files
+
+# ========== 여러 역본 동시 조회 (역본 대조) ==========
+# 예전에는 (역본, 절) 마다 load_bible_verse_from_module 를 불러
+# 10개 역본 x 15절 = 150번 연결/조회를 차례로 했습니다.
+# 이제 역본마다 장 전체를 쿼리 1번으로 읽고(core.chapter_cache), 역본들은 스레드 풀에서 동시에 조회합니다.
+# - 연결은 core.db_pool 의 공용 읽기 전용 연결을 빌려 씁니다. (파일마다 잠금이 따로라 역본끼리 막히지 않음)
+# - sqlite3 는 쿼리 중 GIL 을 놓으므로 스레드만으로도 I/O 와 조회가 겹칩니다.
+# - 결과는 입력한 파일 순서를 유지하고, 해당 절이 하나도 없는 역본은 뺍니다.
+
+MAX_VERSION_THREADS = 8
+
+
+class BibleVersion(NamedTuple):
+    path: str
+    name: str  # 파일 이름 (화면 표시용)
+    verses: Dict[int, str]  # 절 -> 평문 본문
+
+
+def load_bible_range_from_module(path: str, book_id: int, chap: int, verses: List[int]) -> Dict[int, str]:
+    """성경 모듈 하나에서 한 장의 여러 절을 가져옵니다. (장 단위 캐시 사용) 반환: {절: 평문 본문}"""
+    wanted = [int(v) for v in verses]
+    if not wanted or not os.path.exists(path):
+        return {}
+    chapter = get_bible_chapter(path, book_id, chap)
+    return {v: chapter[v] for v in wanted if v in chapter}
+
+
+def fetch_parallel_versions(
+    files: List[str],
+    book_id: int,
+    chap: int,
+    verses: List[int],
+    max_workers: Optional[int] = None,
+) -> List[BibleVersion]:
+    """여러 성경 모듈에서 같은 절 범위를 동시에 조회합니다. (파일 순서 유지, 빈 역본 제외)"""
+    if not files or not verses:
+        return []
+    workers = max(1, min(len(files), max_workers or MAX_VERSION_THREADS))
+    if workers == 1:
+        loaded = [load_bible_range_from_module(p, book_id, chap, verses) for p in files]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            loaded = list(pool.map(lambda p: load_bible_range_from_module(p, book_id, chap, verses), files))
+    return [BibleVersion(p, os.path.basename(p), texts) for p, texts in zip(files, loaded) if texts]
+
+
+def align_versions(versions: List[BibleVersion], verses: List[int]) -> List[Tuple[int, List[Tuple[str, str]]]]:
+    """절마다 역본별 본문을 나란히 묶습니다. 반환: [(절, [(역본 이름, 본문), ...]), ...]"""
+    aligned = []
+    for verse in verses:
+        row = [(v.name, v.verses[verse]) for v in versions if verse in v.verses]
+        if row:
+            aligned.append((verse, row))
+    return aligned
+
+
+def get_parallel_versions(
+    book_id: int,
+    chap: int,
+    verses: List[int],
+    selected_folders: Optional[List[str]] = None,
+) -> List[Tuple[int, List[Tuple[str, str]]]]:
+    """설치된 모든 역본에서 절 범위를 읽어 절별로 정렬해 반환합니다."""
+    files = sorted(scan_bible_module_files(selected_folders or ["."]), key=lambda p: os.path.basename(p).lower())
+    return align_versions(fetch_parallel_versions(files, book_id, chap, verses), verses)
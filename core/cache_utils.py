@@ -0,0 +1,27 @@
+import os
+from typing import Optional, Tuple
+
+# 앱 폴더(main.py 가 있는 곳) 아래의 숨김 폴더에 영구 캐시를 보관합니다.
+# - 숨김 폴더라 사이드바 폴더 목록과 전수 조사 대상에서 제외됩니다.
+# - 캐시 DB 확장자는 .db 를 사용합니다. (.sqlite3 등은 주석 모듈로 인식되므로 피함)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(APP_DIR, ".bibleai_cache")
+
+
+def get_cache_path(name: str) -> str:
+    """캐시 폴더 안의 파일 경로를 반환합니다. (폴더가 없으면 생성)"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, name)
+
+
+def file_signature(path: str) -> Optional[Tuple[str, int, int]]:
+    """
+    파일의 (절대경로, mtime_ns, size) 를 반환합니다.
+    캐시 키로 사용하며, 파일이 없거나 접근할 수 없으면 None 을 반환합니다.
+    """
+    try:
+        abs_path = os.path.abspath(path)
+        st_info = os.stat(abs_path)
+    except OSError:
+        return None
+    return abs_path, st_info.st_mtime_ns, st_info.st_size
@@ -0,0 +1,177 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Set, Tuple
+
+from core.bible_binary import get_bible_binary
+from core.bible_utils import decode_rtf_text
+from core.cache_utils import file_signature
+from core.db_pool import pooled_connection
+from core.module_schema import get_module_schema
+
+# ========== 성경 본문 장 단위 캐시 ==========
+# 성경 본문은 대개 이웃한 절을 이어 읽으므로, 절 하나씩 조회/디코딩하지 않고
+# 모듈마다 장 전체를 쿼리 1번으로 읽어 디코딩한 뒤 장 단위로 메모리에 보관합니다.
+#   - 키: (모듈 경로, mtime, size, 책, 장)  → 모듈 파일이 바뀌면 자연히 새로 읽음
+#   - 메모리: 최근 사용 순(LRU)으로 글자 수 상한까지만 보관 (configure_chapter_cache 로 조정)
+#   - 미리 읽기: 장을 조회하면 다음 장을 백그라운드 스레드에서 미리 읽어 둠
+#   - core.bible_binary 로 변환해 둔 모듈은 SQLite 대신 mmap 바이너리에서 읽음
+# 반환하는 {절: 본문} 사전은 캐시와 공유하므로 호출 측에서 고치지 않습니다.
+
+DEFAULT_MEMORY_LIMIT = 16 * 1024 * 1024  # 글자 수 기준
+PREFETCH_THREADS = 2
+# 빈 장(없는 장)도 캐시하므로 항목마다 이만큼 크기를 더해 개수가 끝없이 늘지 않게 함
+_ENTRY_OVERHEAD = 64
+
+# 형식별 장 조회 SQL. 파라미터: (book_id, chap) / 결과 행: (절, 본문)
+_CHAPTER_SQL = {
+    ".mybible": "SELECT verse, text FROM verses WHERE book=? AND chapter=?",
+    ".twm": "SELECT vi, data FROM bible WHERE bi=? AND ci=?",
+    ".cdb": "SELECT verse, btext FROM Bible WHERE book=? AND chapter=?",
+}
+
+ChapterKey = Tuple[str, int, int, int, int]
+
+
+def _chapter_sql(path: str) -> Optional[str]:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in _CHAPTER_SQL:
+        return _CHAPTER_SQL[ext]
+    if ext in (".sqlite3", ".sqlite"):
+        schema = get_module_schema(path, "bible_sqlite")
+        if schema:
+            return schema.sql
+    return None
+
+
+def load_bible_chapter(path: str, book_id: int, chap: int) -> Dict[int, str]:
+    """성경 모듈에서 한 장 전체를 쿼리 1번으로 읽어 디코딩합니다. (캐시 없음) 반환: {절: 평문 본문}"""
+    # 변환해 둔 바이너리가 최신이면 SQLite/디코딩 없이 mmap 에서 바로 읽음
+    binary = get_bible_binary(path)
+    if binary is not None:
+        return binary.chapter(int(book_id), int(chap))
+    sql = _chapter_sql(path)
+    if sql is None:
+        return {}
+    try:
+        with pooled_connection(path) as conn:
+            rows = conn.execute(sql, (book_id, chap)).fetchall()
+    except sqlite3.Error:
+        return {}
+
+    texts: Dict[int, str] = {}
+    for verse, raw in rows:
+        try:
+            verse = int(verse)
+        except (TypeError, ValueError):
+            continue
+        if verse not in texts and raw:
+            content = decode_rtf_text(raw).strip()
+            if content:
+                texts[verse] = content
+    return dict(sorted(texts.items()))
+
+
+class ChapterCache:
+    """모듈별 장 본문 LRU 캐시 + 다음 장 미리 읽기"""
+
+    def __init__(self, memory_limit: int = DEFAULT_MEMORY_LIMIT, prefetch: bool = True):
+        self.memory_limit = memory_limit
+        self.prefetch = prefetch
+        self._chapters: "OrderedDict[ChapterKey, Tuple[int, Dict[int, str]]]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self._pending: Set[ChapterKey] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self._chapters)
+
+    def memory_usage(self) -> int:
+        """보관 중인 본문 글자 수 (항목별 여유분 포함)"""
+        return self._chars
+
+    def _lookup(self, key: ChapterKey) -> Optional[Dict[int, str]]:
+        with self._lock:
+            entry = self._chapters.get(key)
+            if entry is None:
+                return None
+            self._chapters.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key: ChapterKey, texts: Dict[int, str]) -> None:
+        size = sum(len(t) for t in texts.values()) + _ENTRY_OVERHEAD
+        with self._lock:
+            old = self._chapters.pop(key, None)
+            if old is not None:
+                self._chars -= old[0]
+            self._chapters[key] = (size, texts)
+            self._chars += size
+            while self._chars > self.memory_limit and len(self._chapters) > 1:
+                _, (old_size, _) = self._chapters.popitem(last=False)
+                self._chars -= old_size
+
+    def _load(self, key: ChapterKey) -> Dict[int, str]:
+        texts = load_bible_chapter(key[0], key[3], key[4])
+        self._store(key, texts)
+        return texts
+
+    def get(self, path: str, book_id: int, chap: int, prefetch: Optional[bool] = None) -> Dict[int, str]:
+        """장 전체 {절: 본문}. 없으면 빈 사전. prefetch 가 켜져 있으면 다음 장을 미리 읽음"""
+        sig = file_signature(path)
+        if sig is None:
+            return {}
+        key = (sig[0], sig[1], sig[2], int(book_id), int(chap))
+        texts = self._lookup(key)
+        if texts is None:
+            texts = self._load(key)
+        if texts and (self.prefetch if prefetch is None else prefetch):
+            self._schedule((sig[0], sig[1], sig[2], int(book_id), int(chap) + 1))
+        return texts
+
+    def _schedule(self, key: ChapterKey) -> None:
+        with self._lock:
+            if key in self._chapters or key in self._pending:
+                return
+            self._pending.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=PREFETCH_THREADS, thread_name_prefix="chapter-prefetch")
+            executor = self._executor
+        try:
+            executor.submit(self._prefetch, key)
+        except RuntimeError:
+            # 인터프리터 종료 중에는 미리 읽기를 건너뜀
+            with self._lock:
+                self._pending.discard(key)
+
+    def _prefetch(self, key: ChapterKey) -> None:
+        try:
+            self._load(key)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._chapters.clear()
+            self._chars = 0
+
+
+_default_cache = ChapterCache()
+
+
+def configure_chapter_cache(memory_limit: Optional[int] = None, prefetch: Optional[bool] = None) -> None:
+    """공용 장 캐시의 글자 수 상한 / 다음 장 미리 읽기 여부를 바꿉니다."""
+    if memory_limit is not None:
+        _default_cache.memory_limit = memory_limit
+    if prefetch is not None:
+        _default_cache.prefetch = prefetch
+
+
+def get_bible_chapter(path: str, book_id: int, chap: int, prefetch: Optional[bool] = None) -> Dict[int, str]:
+    """공용 캐시에서 성경 모듈의 장 전체 {절: 본문} 을 가져옵니다."""
+    return _default_cache.get(path, book_id, chap, prefetch)
@@ -0,0 +1,436 @@
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from core.bible_utils import decode_rtf_text
+from core.cache_utils import file_signature, get_cache_path
+from core.commentary_utils import clean_rtf_html
+from core.db_pool import pooled_connection
+from core.module_schema import get_module_schema
+from core.parallel_scan import map_files_parallel
+
+# ========== 주석 모듈 전문 검색 색인 (SQLite FTS5) ==========
+# 모든 주석 모듈(.cmti, .cmtx, .mybible, .twm, .cdb, .sqlite3)의 본문을 디코딩해
+# FTS5 (trigram 토크나이저) 색인에 저장합니다.
+# - trigram 은 공백 없는 한글 어절 안의 부분 문자열도 찾을 수 있고, 대소문자를 구분하지 않습니다.
+# - 본문은 RTF/HTML 을 벗긴 평문으로 저장하므로 인코딩된 주석도 검색됩니다.
+# - 모듈 파일의 (mtime, size) 가 바뀐 경우에만 다시 색인합니다.
+# - 색인은 백그라운드 스레드에서 만들고, 그 사이에도 이미 색인된 모듈은 검색할 수 있습니다.
+# - 책 번호는 앱의 다른 주석 로더와 같이 1~66 기준입니다.
+# - trigram 토크나이저는 SQLite 3.34 이상에서만 쓸 수 있습니다. 그보다 오래된 SQLite(또는 FTS5 없는 빌드)에서는
+#   entries_fts 를 일반 테이블로 만들고 모든 검색어를 LIKE 로 찾습니다. (느리지만 결과는 같음)
+
+COMMENTARY_FTS_DB = "commentary_fts.db"
+
+# trigram 토크나이저는 3글자 미만 검색어를 MATCH 로 찾을 수 없어 LIKE 로 처리합니다.
+MIN_MATCH_TERM_LEN = 3
+# 색인 형식 (PRAGMA user_version). SQLite 가 바뀌어 형식이 달라지면 색인을 다시 만듭니다.
+_FORMAT_TRIGRAM = 1
+_FORMAT_LIKE = 2
+SNIPPET_CHARS = 80
+
+# (책, 장, 시작 절, 끝 절, 평문)
+EntryRow = Tuple[int, int, int, int, str]
+
+
+class CommentaryHit(NamedTuple):
+    path: str
+    module: str
+    book: int
+    chapter: int
+    verse_from: int
+    verse_to: int
+    snippet: str
+    score: float  # MATCH 검색이면 bm25 (작을수록 관련도 높음), LIKE 만 쓴 경우 0.0
+
+
+@lru_cache(maxsize=1)
+def trigram_supported() -> bool:
+    """이 SQLite 빌드가 FTS5 trigram 토크나이저를 지원하는지 (프로세스당 한 번 확인)"""
+    try:
+        with sqlite3.connect(":memory:") as probe:
+            probe.execute("CREATE VIRTUAL TABLE probe USING fts5(text, tokenize='trigram')")
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def _connect_fts() -> sqlite3.Connection:
+    conn = sqlite3.connect(get_cache_path(COMMENTARY_FTS_DB), timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    fmt = _FORMAT_TRIGRAM if trigram_supported() else _FORMAT_LIKE
+    if conn.execute("PRAGMA user_version").fetchone()[0] != fmt:
+        conn.executescript(
+            f"""
+            DROP TABLE IF EXISTS entries_fts;
+            DROP TABLE IF EXISTS entries;
+            DROP TABLE IF EXISTS modules;
+            PRAGMA user_version={fmt};
+            """
+        )
+    if fmt == _FORMAT_TRIGRAM:
+        text_table = "CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(text, tokenize='trigram');"
+    else:
+        text_table = "CREATE TABLE IF NOT EXISTS entries_fts (id INTEGER PRIMARY KEY, text TEXT NOT NULL);"
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS modules (
+            id INTEGER PRIMARY KEY,
+            path TEXT UNIQUE NOT NULL,
+            name TEXT NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            entry_count INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY,
+            module_id INTEGER NOT NULL,
+            book INTEGER NOT NULL,
+            chapter INTEGER NOT NULL,
+            verse_from INTEGER NOT NULL,
+            verse_to INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_module ON entries (module_id);
+        """
+        + text_table
+    )
+    return conn
+
+
+# ========== 모듈별 본문 추출 (프로세스 풀 워커) ==========
+
+def _rows_from_query(cur: sqlite3.Cursor, sql: str, decoder: Callable[[str], str]) -> List[EntryRow]:
+    rows: List[EntryRow] = []
+    try:
+        cur.execute(sql)
+    except sqlite3.Error:
+        return rows
+    for book, chap, v_from, v_to, content in cur.fetchall():
+        if not content or book is None:
+            continue
+        text = decoder(content).strip()
+        if text:
+            rows.append((int(book), int(chap or 0), int(v_from or 0), int(v_to or v_from or 0), text))
+    return rows
+
+
+def _esword_rows(cur: sqlite3.Cursor, verse_table: str, chapter_table: str, book_table: str) -> List[EntryRow]:
+    """절 주석 + 장 서론(절 0) + 책 서론(장 0, 절 0)"""
+    return (
+        _rows_from_query(
+            cur, f"SELECT Book, ChapterBegin, VerseBegin, VerseEnd, Comments FROM {verse_table}", clean_rtf_html
+        )
+        + _rows_from_query(cur, f"SELECT Book, Chapter, 0, 0, Comments FROM {chapter_table}", clean_rtf_html)
+        + _rows_from_query(cur, f"SELECT Book, 0, 0, 0, Comments FROM {book_table}", clean_rtf_html)
+    )
+
+
+def _twm_rows(cur: sqlite3.Cursor) -> List[EntryRow]:
+    """TheWord: 같은 topic 이 여러 절에 연결되어 있어도 첫 연결 절로 한 번만 색인"""
+    return _rows_from_query(
+        cur,
+        """
+        SELECT r.bi, r.ci, r.fvi, r.tvi, c.data
+        FROM (SELECT topic_id, bi, ci, fvi, tvi, MIN(bi * 1000000 + ci * 1000 + fvi) FROM bible_refs GROUP BY topic_id) r
+        JOIN content c ON c.topic_id = r.topic_id
+        """,
+        decode_rtf_text,
+    )
+
+
+def _schema_rows(cur: sqlite3.Cursor, path: str, loader: str) -> List[EntryRow]:
+    schema = get_module_schema(path, loader)
+    if schema is None:
+        return []
+    cols = schema.columns
+    if loader == "commentaries_sqlite":
+        sql = (
+            f"SELECT book_number, {cols['chapter_from']}, {cols['verse_from']}, {cols['verse_to']}, text "
+            f"FROM commentaries"
+        )
+    else:
+        sql = (
+            f"SELECT CAST({cols['book']} AS INTEGER), CAST({cols['chapter']} AS INTEGER), "
+            f"CAST({cols['verse_from']} AS INTEGER), CAST({cols['verse_to']} AS INTEGER), {cols['text']} "
+            f"FROM {schema.table}"
+        )
+    return _rows_from_query(cur, sql, decode_rtf_text)
+
+
+def compute_module_entries(path: str) -> List[EntryRow]:
+    """
+    주석 모듈 하나의 전체 본문을 (책, 장, 시작 절, 끝 절, 평문) 목록으로 추출합니다.
+    형식 판별은 core.commentary_utils.load_commentaries_for_path_range 와 같습니다.
+    """
+    lower = path.lower()
+    with pooled_connection(path) as conn:
+        cur = conn.cursor()
+        if lower.endswith(".cmti"):
+            return _esword_rows(cur, "VerseCommentary", "ChapterCommentary", "BookCommentary")
+        if lower.endswith(".cmtx"):
+            return _esword_rows(cur, "Verses", "Chapters", "Books")
+        if lower.endswith("commentaries.sqlite3"):
+            return _schema_rows(cur, path, "commentaries_sqlite")
+        if lower.endswith(".mybible"):
+            return _rows_from_query(
+                cur, "SELECT book, chapter, fromverse, toverse, data FROM commentary", decode_rtf_text
+            )
+        if lower.endswith(".twm"):
+            return _twm_rows(cur)
+        if lower.endswith(".cdb"):
+            return _rows_from_query(cur, "SELECT book, chapter, verse, verse, btext FROM Bible", decode_rtf_text)
+        if lower.endswith(".sqlite3") or lower.endswith(".sqlite") or ".sqlite3" in lower:
+            return _schema_rows(cur, path, "generic_commentary")
+    return []
+
+
+# ========== 색인 갱신 ==========
+
+def _store_module_entries(conn: sqlite3.Connection, sig: Tuple[str, int, int], rows: List[EntryRow]) -> None:
+    abs_path, mtime_ns, size = sig
+    name = os.path.basename(abs_path)
+    old = conn.execute("SELECT id FROM modules WHERE path=?", (abs_path,)).fetchone()
+    if old:
+        module_id = old[0]
+        conn.execute("DELETE FROM entries_fts WHERE rowid IN (SELECT id FROM entries WHERE module_id=?)", (module_id,))
+        conn.execute("DELETE FROM entries WHERE module_id=?", (module_id,))
+        conn.execute(
+            "UPDATE modules SET mtime_ns=?, size=?, entry_count=? WHERE id=?",
+            (mtime_ns, size, len(rows), module_id),
+        )
+    else:
+        module_id = conn.execute(
+            "INSERT INTO modules (path, name, mtime_ns, size, entry_count) VALUES (?, ?, ?, ?, ?)",
+            (abs_path, name, mtime_ns, size, len(rows)),
+        ).lastrowid
+
+    next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM entries").fetchone()[0]
+    ids = range(next_id, next_id + len(rows))
+    conn.executemany(
+        "INSERT INTO entries (id, module_id, book, chapter, verse_from, verse_to) VALUES (?, ?, ?, ?, ?, ?)",
+        [(i, module_id, book, chap, vf, vt) for i, (book, chap, vf, vt, _) in zip(ids, rows)],
+    )
+    conn.executemany(
+        "INSERT INTO entries_fts (rowid, text) VALUES (?, ?)",
+        [(i, text) for i, (*_, text) in zip(ids, rows)],
+    )
+
+
+def _delete_module(conn: sqlite3.Connection, module_id: int) -> None:
+    conn.execute("DELETE FROM entries_fts WHERE rowid IN (SELECT id FROM entries WHERE module_id=?)", (module_id,))
+    conn.execute("DELETE FROM entries WHERE module_id=?", (module_id,))
+    conn.execute("DELETE FROM modules WHERE id=?", (module_id,))
+
+
+# 이번 프로세스에서 추출에 실패한 모듈의 시그니처. 파일이 바뀌기 전까지 자동 갱신에서 다시 시도하지 않음
+_failed_sigs: Dict[str, Tuple[int, int]] = {}
+
+
+def _stale_modules(conn: sqlite3.Connection, files: Iterable[str]) -> Dict[str, Tuple[str, int, int]]:
+    """색인에 없거나 (mtime, size) 가 바뀐 모듈 {절대 경로: 시그니처}"""
+    known = {
+        path: (mtime_ns, size)
+        for path, mtime_ns, size in conn.execute("SELECT path, mtime_ns, size FROM modules")
+    }
+    stale: Dict[str, Tuple[str, int, int]] = {}
+    for path in files:
+        sig = file_signature(path)
+        if sig is not None and known.get(sig[0]) != (sig[1], sig[2]):
+            stale[sig[0]] = sig
+    return stale
+
+
+def refresh_commentary_index(
+    files: Iterable[str],
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+) -> int:
+    """
+    주석 모듈 목록 중 새로 생겼거나 수정된 모듈만 다시 색인합니다.
+    모듈마다 커밋하므로 갱신 도중에도 끝난 모듈은 바로 검색됩니다.
+    추출에 실패한 모듈은 저장하지 않으므로 다음 갱신 때 다시 시도합니다.
+    반환: 다시 색인한 모듈 수
+    """
+    conn = _connect_fts()
+    try:
+        sigs = _stale_modules(conn, files)
+        stale = list(sigs)
+
+        for done, (_, path, rows) in enumerate(map_files_parallel(compute_module_entries, stale)):
+            if rows is None:
+                _failed_sigs[path] = sigs[path][1:]
+            else:
+                _failed_sigs.pop(path, None)
+                _store_module_entries(conn, sigs[path], rows)
+                conn.commit()
+            if progress_callback:
+                progress_callback(done + 1, len(stale), path)
+
+        # 디스크에서 사라진 모듈 정리
+        for module_id, path in conn.execute("SELECT id, path FROM modules").fetchall():
+            if not os.path.exists(path):
+                _delete_module(conn, module_id)
+        conn.commit()
+        return len(stale)
+    finally:
+        conn.close()
+
+
+# ========== 백그라운드 갱신 ==========
+
+_build_lock = threading.Lock()
+_build_status = {"running": False, "done": 0, "total": 0, "error": None}
+
+
+def _background_refresh(files: List[str]) -> None:
+    def _progress(done: int, total: int, _path: str) -> None:
+        _build_status.update(done=done, total=total)
+
+    try:
+        refresh_commentary_index(files, _progress)
+        _build_status["error"] = None
+    except Exception as e:
+        _build_status["error"] = str(e)
+    finally:
+        _build_status["running"] = False
+        _build_lock.release()
+
+
+def needs_refresh(files: Iterable[str]) -> bool:
+    """새로 생겼거나 바뀐 모듈이 있는지 (이번 프로세스에서 실패한 뒤 그대로인 모듈은 제외)"""
+    conn = _connect_fts()
+    try:
+        stale = _stale_modules(conn, files)
+    finally:
+        conn.close()
+    return any(_failed_sigs.get(path) != sig[1:] for path, sig in stale.items())
+
+
+def start_background_refresh(files: Iterable[str]) -> bool:
+    """
+    색인 갱신을 데몬 스레드에서 시작합니다.
+    이미 갱신 중이거나 다시 색인할 모듈이 없으면 아무것도 하지 않고 False 를 반환합니다.
+    """
+    files = list(files)
+    if _build_status["running"] or not needs_refresh(files):
+        return False
+    if not _build_lock.acquire(blocking=False):
+        return False
+    _build_status.update(running=True, done=0, total=0)
+    try:
+        threading.Thread(target=_background_refresh, args=(files,), daemon=True).start()
+    except Exception:
+        _build_status["running"] = False
+        _build_lock.release()
+        raise
+    return True
+
+
+def get_build_status() -> Dict[str, object]:
+    """{"running": bool, "done": int, "total": int, "error": str | None}"""
+    return dict(_build_status)
+
+
+# ========== 검색 ==========
+
+def _parse_query(query: str) -> Tuple[List[str], List[str]]:
+    """공백으로 나눈 검색어 (+필수 / -제외 표기 지원) -> (포함어, 제외어)"""
+    include: List[str] = []
+    exclude: List[str] = []
+    for term in query.split():
+        if term.startswith("-") and len(term) > 1:
+            exclude.append(term[1:])
+        else:
+            term = term.lstrip("+")
+            if term:
+                include.append(term)
+    return include, exclude
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _text_snippet(text: str, terms: List[str]) -> str:
+    lower = text.lower()
+    pos = min((p for p in (lower.find(t.lower()) for t in terms) if p >= 0), default=0)
+    start = max(0, pos - SNIPPET_CHARS)
+    end = min(len(text), pos + SNIPPET_CHARS * 2)
+    return ("…" if start > 0 else "") + text[start:end] + ("…" if end < len(text) else "")
+
+
+def search_commentary_index(
+    query: str,
+    files: Optional[Iterable[str]] = None,
+    limit: int = 50,
+) -> List[CommentaryHit]:
+    """
+    색인된 주석 본문을 검색합니다.
+    - 3글자 이상 포함어는 FTS5 MATCH 로 찾고 bm25 순으로 정렬
+    - 3글자 미만 포함어 / 제외어는 LIKE 조건으로 처리 (trigram 미지원 SQLite 에서는 모든 포함어를 LIKE 로)
+    files 를 주면 해당 모듈만 검색합니다.
+    """
+    include, exclude = _parse_query(query)
+    if not include:
+        return []
+
+    min_len = MIN_MATCH_TERM_LEN if trigram_supported() else float("inf")
+    match_terms = [t for t in include if len(t) >= min_len]
+    like_terms = [t for t in include if len(t) < min_len]
+
+    conds: List[str] = []
+    params: List[object] = []
+    if match_terms:
+        conds.append("entries_fts MATCH ?")
+        params.append(" ".join(_fts_phrase(t) for t in match_terms))
+    for t in like_terms:
+        conds.append("f.text LIKE ? ESCAPE '\\'")
+        params.append(_like_pattern(t))
+    for t in exclude:
+        conds.append("f.text NOT LIKE ? ESCAPE '\\'")
+        params.append(_like_pattern(t))
+
+    if files is not None:
+        paths = [os.path.abspath(p) for p in files]
+        if not paths:
+            return []
+        conds.append(f"m.path IN ({','.join('?' * len(paths))})")
+        params.extend(paths)
+
+    if match_terms:
+        select_extra = f"snippet(entries_fts, 0, '**', '**', '…', {SNIPPET_CHARS // 2}), bm25(entries_fts)"
+        order = "bm25(entries_fts)"
+    else:
+        select_extra = "f.text, 0.0"
+        order = "m.name, e.book, e.chapter, e.verse_from"
+
+    sql = f"""
+        SELECT m.path, m.name, e.book, e.chapter, e.verse_from, e.verse_to, {select_extra}
+        FROM entries_fts f
+        JOIN entries e ON e.id = f.rowid
+        JOIN modules m ON m.id = e.module_id
+        WHERE {' AND '.join(conds)}
+        ORDER BY {order}
+        LIMIT ?
+    """
+    params.append(int(limit))
+
+    conn = _connect_fts()
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    except sqlite3.Error:
+        return []
+    finally:
+        conn.close()
+
+    hits: List[CommentaryHit] = []
+    for path, name, book, chap, vf, vt, text, score in rows:
+        snippet = text if match_terms else _text_snippet(text, like_terms)
+        hits.append(CommentaryHit(path, name, book, chap, vf, vt, snippet, float(score)))
+    return hits
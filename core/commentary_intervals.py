@@ -0,0 +1,153 @@
+import sqlite3
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from core.cache_utils import file_signature
+from core.db_pool import pooled_connection
+from core.verse_keys import CHAPTER_STRIDE, verse_key
+
+# ========== e-Sword 절 주석 구간 색인 ==========
+# e-Sword .cmti/.cmtx 의 절 주석은 (ChapterBegin, VerseBegin) ~ (ChapterEnd, VerseEnd) 구간입니다.
+# 예전 조회식 "? BETWEEN ChapterBegin AND ChapterEnd AND VerseBegin <= ? AND VerseEnd >= ?" 는
+#   - 장을 넘는 구간(예: 3:30 ~ 4:5)에서 4:3 을 찾지 못하고 (VerseBegin 30 > 3)
+#   - 모듈 파일에 맞는 색인이 없어 매번 테이블 전체를 훑었습니다.
+# 모듈마다 한 번 구간 경계만 읽어 (책, 장, 절) 을 절 키(core.verse_keys) 하나로 펴고,
+# 시작 번호로 정렬한 배열 + 끝 번호 최댓값 세그먼트 트리로 겹치는 구간을 O(log n + 결과 수) 에 찾습니다.
+# 본문(Comments)은 찾은 행만 rowid 로 읽습니다.
+# 모듈 파일이 바뀌면 (mtime, size) 로 감지해 다시 만듭니다.
+
+class IntervalIndex:
+    """[시작, 끝] 정수 구간 집합의 겹침 조회 색인 (정적, 읽기 전용)"""
+
+    def __init__(self, intervals: List[Tuple[int, int, int]]):
+        # intervals: [(시작, 끝, 값), ...]
+        intervals = sorted(intervals)
+        self.starts = array("q", (s for s, _, _ in intervals))
+        self.ends = array("q", (e for _, e, _ in intervals))
+        self.values = array("q", (v for _, _, v in intervals))
+        # 잎이 정렬 순서의 끝 번호인 완전 이진 트리, 안쪽 노드는 자식들의 최댓값
+        size = 1
+        while size < max(1, len(intervals)):
+            size *= 2
+        self._size = size
+        tree = array("q", [-1]) * (2 * size)
+        tree[size : size + len(intervals)] = self.ends
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._max_end = tree
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlapping(self, lo: int, hi: int) -> List[int]:
+        """[lo, hi] 와 겹치는 구간의 정렬 위치 목록 (시작 <= hi 이고 끝 >= lo)"""
+        limit = bisect_right(self.starts, hi)
+        if limit == 0:
+            return []
+        found: List[int] = []
+        tree, size = self._max_end, self._size
+        # (노드, 노드가 덮는 잎 범위 [left, right))
+        stack = [(1, 0, size)]
+        while stack:
+            node, left, right = stack.pop()
+            if left >= limit or tree[node] < lo:
+                continue
+            if node >= size:
+                found.append(left)
+                continue
+            mid = (left + right) // 2
+            stack.append((2 * node + 1, mid, right))
+            stack.append((2 * node, left, mid))
+        return found
+
+
+# ========== 모듈별 색인 (프로세스 공용, 모듈당 1회 생성) ==========
+
+_indexes: Dict[Tuple[str, str], Tuple[Tuple[int, int], Optional[IntervalIndex]]] = {}
+_indexes_lock = threading.Lock()
+
+
+def _as_int(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _build_esword_index(path: str, verse_table: str) -> Optional[IntervalIndex]:
+    intervals: List[Tuple[int, int, int]] = []
+    try:
+        with pooled_connection(path) as conn:
+            rows = conn.execute(
+                f"SELECT rowid, Book, ChapterBegin, VerseBegin, ChapterEnd, VerseEnd FROM {verse_table}"
+            ).fetchall()
+    except sqlite3.Error:
+        return None
+    for rowid, book, c_begin, v_begin, c_end, v_end in rows:
+        book = _as_int(book, -1)
+        c_begin = _as_int(c_begin, -1)
+        if book < 0 or c_begin < 0:
+            continue
+        # 장/절은 자리 넘침이 없도록 0~999 로 제한하고, 끝이 비었거나 시작보다 앞이면 시작 절 하나로 봄
+        c_begin = min(c_begin, CHAPTER_STRIDE - 1)
+        v_begin = min(max(_as_int(v_begin, 0), 0), CHAPTER_STRIDE - 1)
+        c_end = min(max(_as_int(c_end, c_begin), 0), CHAPTER_STRIDE - 1)
+        v_end = min(max(_as_int(v_end, v_begin), 0), CHAPTER_STRIDE - 1)
+        start = verse_key(book, c_begin, v_begin)
+        end = verse_key(book, c_end, v_end)
+        intervals.append((start, max(start, end), rowid))
+    return IntervalIndex(intervals)
+
+
+def get_esword_verse_index(path: str, verse_table: str) -> Optional[IntervalIndex]:
+    """e-Sword 모듈의 절 주석 구간 색인 (값은 rowid). 모듈 파일이 바뀌었을 때만 다시 만듭니다."""
+    sig = file_signature(path)
+    if sig is None:
+        return None
+    key = (sig[0], verse_table)
+    with _indexes_lock:
+        cached = _indexes.get(key)
+    if cached is not None and cached[0] == sig[1:]:
+        return cached[1]
+    index = _build_esword_index(sig[0], verse_table)
+    with _indexes_lock:
+        _indexes[key] = (sig[1:], index)
+    return index
+
+
+def find_esword_verse_comments(
+    path: str,
+    verse_table: str,
+    book_id: int,
+    chap: int,
+    first_verse: int,
+    last_verse: int,
+) -> Optional[List[Tuple[int, int, str]]]:
+    """
+    (book_id, chap, first_verse ~ last_verse) 와 겹치는 절 주석을 모듈의 행 순서대로 반환합니다.
+    반환: [(시작 절 키, 끝 절 키, Comments), ...]. 색인을 만들 수 없는 모듈이면 None
+    """
+    index = get_esword_verse_index(path, verse_table)
+    if index is None:
+        return None
+    positions = index.overlapping(verse_key(book_id, chap, first_verse), verse_key(book_id, chap, last_verse))
+    if not positions:
+        return []
+    spans = {index.values[i]: (index.starts[i], index.ends[i]) for i in positions}
+    rowids = sorted(spans)
+    comments: Dict[int, str] = {}
+    try:
+        with pooled_connection(path) as conn:
+            # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for i in range(0, len(rowids), 500):
+                chunk = rowids[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for rowid, content in conn.execute(
+                    f"SELECT rowid, Comments FROM {verse_table} WHERE rowid IN ({placeholders})", chunk
+                ):
+                    comments[rowid] = content
+    except sqlite3.Error:
+        return None
+    return [(spans[r][0], spans[r][1], comments[r]) for r in rowids if comments.get(r)]
@@ -1,29 +1,17 @@
 import os
-import re
-import sqlite3
-from typing import List
+from typing import Dict, List, Tuple
 
 from core.bible_utils import decode_rtf
+from core.commentary_intervals import find_esword_verse_comments
+from core.db_pool import pooled_connection
+from core.module_schema import get_module_schema
+from core.rtf_text import strip_rtf_html
+from core.verse_keys import verse_key
 
 
 def clean_rtf_html(text):
-    """RTF/HTML 태그를 제거하여 순수 텍스트만 반환"""
-    if not text:
-        return ""
-    
-    # RTF 태그 제거
-    text = re.sub(r'\\u(-?\d+)\??', lambda m: chr(int(m.group(1))) if int(m.group(1)) >= 0 else m.group(0), text)
-    text = re.sub(r'\{\\[^\}]*\}', '', text)  # RTF 제어 블록 제거
-    text = re.sub(r'\\[a-z]{1,10}(-?\d+)?\s?', '', text)  # RTF 제어어 제거
-    text = text.replace('{', '').replace('}', '')
-    
-    # HTML 태그 제거
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # 여러 공백을 하나로
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text.strip()
+    """RTF/HTML 태그를 제거하여 순수 텍스트만 반환 (core.rtf_text 단일 패스 변환)"""
+    return strip_rtf_html(text, multiline=True)
 
 
 def scan_commentary_files(selected_folders: List[str]) -> List[str]:
@@ -62,132 +50,194 @@ def load_commentaries_for_path(path: str, book_id: int, chap: int, vers: int) ->
     반환 형식은 기존 구현과 동일하게, 이미 파일명까지 포함된 문자열 리스트입니다.
     예시: "#### 📚 [파일명]\n본문..."
     """
+    return load_commentaries_for_path_range(path, book_id, chap, [vers]).get(vers, [])
+
+
+def load_commentaries_for_path_range(path: str, book_id: int, chap: int, verses: List[int]) -> Dict[int, List[str]]:
+    """
+    주석/성경 DB 파일 하나에서 여러 절의 주석을 한 번에 읽어옵니다.
+    연결 1회 + 형식별 범위 쿼리 1회(절 경계 BETWEEN)로 처리하고, 결과는 절별로 묶어 반환합니다.
+    반환: {절: ["#### 📚 [파일명]\n본문...", ...]}
+    """
+    verses = sorted(set(int(v) for v in verses))
     # 파일이 삭제되었거나 접근 불가한 경우 안전하게 건너뜁니다.
-    if not os.path.exists(path):
-        return []
+    if not verses or not os.path.exists(path):
+        return {v: [] for v in verses}
 
     lower = path.lower()
 
     # e-Sword .cmti 형식 (older format)
     if lower.endswith(".cmti"):
-        return _load_from_esword_cmti(path, book_id, chap, vers)
+        return _load_from_esword_cmti(path, book_id, chap, verses)
 
     # e-Sword .cmtx 형식 (newer format)
     if lower.endswith(".cmtx"):
-        return _load_from_esword_cmtx(path, book_id, chap, vers)
+        return _load_from_esword_cmtx(path, book_id, chap, verses)
 
     # commentaries.sqlite3 (전용 스키마 처리 + fallback 처리)
     if lower.endswith("commentaries.sqlite3"):
-        return _load_from_commentaries_sqlite(path, book_id, chap, vers)
+        return _load_from_commentaries_sqlite(path, book_id, chap, verses)
 
     # MyBible commentary 형식
     if lower.endswith(".mybible"):
-        return _load_from_mybible(path, book_id, chap, vers)
+        return _load_from_mybible(path, book_id, chap, verses)
 
     # TheWord(TWM) commentary 형식
     if lower.endswith(".twm"):
-        return _load_from_twm(path, book_id, chap, vers)
+        return _load_from_twm(path, book_id, chap, verses)
 
     # cdb 형식 (Bible table)
     if lower.endswith(".cdb"):
-        return _load_from_cdb(path, book_id, chap, vers)
+        return _load_from_cdb(path, book_id, chap, verses)
 
     # 일반 sqlite3 / sqlite 파일 (스키마 추론)
     if lower.endswith(".sqlite3") or lower.endswith(".sqlite") or ".sqlite3" in lower:
-        return _load_from_generic_sqlite(path, book_id, chap, vers)
+        return _load_from_generic_sqlite(path, book_id, chap, verses)
 
-    return []
+    return {v: [] for v in verses}
 
 
-def _load_from_esword_cmti(path: str, book_id: int, chap: int, vers: int) -> List[str]:
+def get_commentaries_for_verses(files: List[str], book_id: int, chap: int, verses: List[int]) -> Dict[int, List[str]]:
     """
-    e-Sword .cmti 형식 주석 로더
-    구조:
-    - BookCommentary (Book INT, Comments TEXT)
-    - ChapterCommentary (Book INT, Chapter INT, Comments TEXT)
-    - VerseCommentary (Book INT, ChapterBegin INT, ChapterEnd INT, VerseBegin INT, VerseEnd INT, Comments TEXT)
+    여러 주석 파일에서 한 장의 여러 절 주석을 일괄 조회합니다. (파일당 1회 왕복)
+    같은 절 안의 중복 결과는 제거하고, 파일 순서를 유지합니다.
+    반환: {절: [주석 문자열, ...]}
     """
-    results: List[str] = []
+    merged: Dict[int, List[str]] = {int(v): [] for v in verses}
+    seen: Dict[int, set] = {v: set() for v in merged}
+    for path in files:
+        for verse, items in load_commentaries_for_path_range(path, book_id, chap, list(merged)).items():
+            for item in items:
+                if item not in seen[verse]:
+                    seen[verse].add(item)
+                    merged[verse].append(item)
+    return merged
+
+
+def _append_row(results: Dict[int, List[str]], verses: List[int], v_from, v_to, entry: str) -> None:
+    """[v_from, v_to] 범위에 드는 요청 절마다 결과를 추가합니다."""
+    try:
+        lo, hi = int(v_from), int(v_to)
+    except (TypeError, ValueError):
+        return
+    for v in verses:
+        if lo <= v <= hi:
+            results[v].append(entry)
+
+
+def _esword_verse_rows(
+    cur, path: str, verse_table: str, book_id: int, chap: int, verses: List[int]
+) -> List[Tuple[int, int, str]]:
+    """요청 절 범위와 겹치는 e-Sword 절 주석 [(시작 절대 번호, 끝 절대 번호, Comments), ...]"""
+    rows = find_esword_verse_comments(path, verse_table, book_id, chap, verses[0], verses[-1])
+    if rows is not None:
+        return rows
+    # 구간 색인을 만들 수 없는 모듈 (rowid 없음 등): 같은 장 안의 구간만 예전 방식으로 조회
+    cur.execute(
+        f"""
+        SELECT VerseBegin, VerseEnd, Comments FROM {verse_table}
+        WHERE Book=?
+        AND ? BETWEEN ChapterBegin AND ChapterEnd
+        AND VerseBegin <= ? AND VerseEnd >= ?
+        """,
+        (book_id, chap, verses[-1], verses[0]),
+    )
+    return [
+        (verse_key(book_id, chap, int(v_from)), verse_key(book_id, chap, int(v_to)), content)
+        for v_from, v_to, content in cur.fetchall()
+        if content and v_from is not None and v_to is not None
+    ]
+
+
+def _load_from_esword(
+    path: str,
+    book_id: int,
+    chap: int,
+    verses: List[int],
+    verse_table: str,
+    chapter_table: str,
+    book_table: str,
+) -> Dict[int, List[str]]:
+    """e-Sword .cmti / .cmtx 공통 로더 (테이블 이름만 다름)"""
+    results: Dict[int, List[str]] = {v: [] for v in verses}
     filename = os.path.basename(path)
     name_without_ext = os.path.splitext(filename)[0]
 
     try:
-        conn = sqlite3.connect(path)
-        cur = conn.cursor()
+        with pooled_connection(path) as conn:
+            cur = conn.cursor()
 
-        # 1. Verse Commentary 검색
-        try:
-            cur.execute(
-                """
-                SELECT Comments FROM VerseCommentary
-                WHERE Book=? 
-                AND ? BETWEEN ChapterBegin AND ChapterEnd
-                AND ? BETWEEN VerseBegin AND VerseEnd
-                """,
-                (book_id, chap, vers),
-            )
-            rows = cur.fetchall()
-            for row in rows:
-                content = row[0]
-                if content:
+            # 1. 절 주석 검색 (모듈별 구간 색인으로 겹치는 행만 읽음, 장을 넘는 구간 포함)
+            try:
+                for start, end, content in _esword_verse_rows(cur, path, verse_table, book_id, chap, verses):
                     decoded = clean_rtf_html(content)
                     if decoded.strip():
-                        results.append(f"#### 📚 [{name_without_ext}]\n{decoded.strip()}")
-        except Exception:
-            pass
-
-        # 2. Chapter Commentary 검색 (vers가 0이거나 절 주석이 없을 때)
-        if vers == 0 or not results:
-            try:
-                cur.execute(
-                    """
-                    SELECT Comments FROM ChapterCommentary
-                    WHERE Book=? AND Chapter=?
-                    """,
-                    (book_id, chap),
-                )
-                rows = cur.fetchall()
-                for row in rows:
-                    content = row[0]
-                    if content:
-                        decoded = clean_rtf_html(content)
-                        if decoded.strip():
-                            results.append(f"#### 📚 [{name_without_ext} - 장 서론]\n{decoded.strip()}")
+                        entry = f"#### 📚 [{name_without_ext}]\n{decoded.strip()}"
+                        for v in verses:
+                            if start <= verse_key(book_id, chap, v) <= end:
+                                results[v].append(entry)
             except Exception:
                 pass
 
-        # 3. Book Commentary 검색 (chap가 0일 때)
-        if chap == 0:
-            try:
-                cur.execute(
-                    """
-                    SELECT Comments FROM BookCommentary
-                    WHERE Book=?
-                    """,
-                    (book_id,),
-                )
-                rows = cur.fetchall()
-                for row in rows:
-                    content = row[0]
-                    if content:
-                        decoded = clean_rtf_html(content)
-                        if decoded.strip():
-                            results.append(f"#### 📚 [{name_without_ext} - 책 서론]\n{decoded.strip()}")
-            except Exception:
-                pass
+            # 2. 장 주석 검색 (절이 0이거나 절 주석이 없는 절에만)
+            need_chapter = [v for v in verses if v == 0 or not results[v]]
+            if need_chapter:
+                try:
+                    cur.execute(
+                        f"""
+                        SELECT Comments FROM {chapter_table}
+                        WHERE Book=? AND Chapter=?
+                        """,
+                        (book_id, chap),
+                    )
+                    for (content,) in cur.fetchall():
+                        if content:
+                            decoded = clean_rtf_html(content)
+                            if decoded.strip():
+                                for v in need_chapter:
+                                    results[v].append(f"#### 📚 [{name_without_ext} - 장 서론]\n{decoded.strip()}")
+                except Exception:
+                    pass
+
+            # 3. 책 주석 검색 (chap가 0일 때)
+            if chap == 0:
+                try:
+                    cur.execute(
+                        f"""
+                        SELECT Comments FROM {book_table}
+                        WHERE Book=?
+                        """,
+                        (book_id,),
+                    )
+                    for (content,) in cur.fetchall():
+                        if content:
+                            decoded = clean_rtf_html(content)
+                            if decoded.strip():
+                                for v in verses:
+                                    results[v].append(f"#### 📚 [{name_without_ext} - 책 서론]\n{decoded.strip()}")
+                except Exception:
+                    pass
 
     except Exception:
         pass
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
     return results
 
 
-def _load_from_esword_cmtx(path: str, book_id: int, chap: int, vers: int) -> List[str]:
+def _load_from_esword_cmti(path: str, book_id: int, chap: int, verses: List[int]) -> Dict[int, List[str]]:
+    """
+    e-Sword .cmti 형식 주석 로더
+    구조:
+    - BookCommentary (Book INT, Comments TEXT)
+    - ChapterCommentary (Book INT, Chapter INT, Comments TEXT)
+    - VerseCommentary (Book INT, ChapterBegin INT, ChapterEnd INT, VerseBegin INT, VerseEnd INT, Comments TEXT)
+    """
+    return _load_from_esword(
+        path, book_id, chap, verses, "VerseCommentary", "ChapterCommentary", "BookCommentary"
+    )
+
+
+def _load_from_esword_cmtx(path: str, book_id: int, chap: int, verses: List[int]) -> Dict[int, List[str]]:
     """
     e-Sword .cmtx 형식 주석 로더
     구조:
@@ -195,357 +245,140 @@ def _load_from_esword_cmtx(path: str, book_id: int, chap: int, vers: int) -> Lis
     - Chapters (Book INT, Chapter INT, Comments TEXT)
     - Verses (Book INT, ChapterBegin INT, ChapterEnd INT, VerseBegin INT, VerseEnd INT, Comments TEXT)
     """
-    results: List[str] = []
-    filename = os.path.basename(path)
-    name_without_ext = os.path.splitext(filename)[0]
+    return _load_from_esword(path, book_id, chap, verses, "Verses", "Chapters", "Books")
 
-    try:
-        conn = sqlite3.connect(path)
-        cur = conn.cursor()
 
-        # 1. Verses Commentary 검색
-        try:
-            cur.execute(
-                """
-                SELECT Comments FROM Verses
-                WHERE Book=? 
-                AND ? BETWEEN ChapterBegin AND ChapterEnd
-                AND ? BETWEEN VerseBegin AND VerseEnd
-                """,
-                (book_id, chap, vers),
-            )
-            rows = cur.fetchall()
-            for row in rows:
-                content = row[0]
-                if content:
-                    decoded = clean_rtf_html(content)
-                    if decoded.strip():
-                        results.append(f"#### 📚 [{name_without_ext}]\n{decoded.strip()}")
-        except Exception:
-            pass
-
-        # 2. Chapters Commentary 검색 (vers가 0이거나 절 주석이 없을 때)
-        if vers == 0 or not results:
-            try:
-                cur.execute(
-                    """
-                    SELECT Comments FROM Chapters
-                    WHERE Book=? AND Chapter=?
-                    """,
-                    (book_id, chap),
-                )
-                rows = cur.fetchall()
-                for row in rows:
-                    content = row[0]
-                    if content:
-                        decoded = clean_rtf_html(content)
-                        if decoded.strip():
-                            results.append(f"#### 📚 [{name_without_ext} - 장 서론]\n{decoded.strip()}")
-            except Exception:
-                pass
+def _load_from_commentaries_sqlite(path: str, book_id: int, chap: int, verses: List[int]) -> Dict[int, List[str]]:
+    """commentaries.sqlite3 - 컬럼명 변형은 스키마 캐시에서 한 번만 추론하고 한 번만 조회"""
+    results: Dict[int, List[str]] = {v: [] for v in verses}
+    name_without_ext = os.path.splitext(os.path.basename(path))[0]
 
-        # 3. Books Commentary 검색 (chap가 0일 때)
-        if chap == 0:
-            try:
-                cur.execute(
-                    """
-                    SELECT Comments FROM Books
-                    WHERE Book=?
-                    """,
-                    (book_id,),
-                )
-                rows = cur.fetchall()
-                for row in rows:
-                    content = row[0]
-                    if content:
-                        decoded = clean_rtf_html(content)
-                        if decoded.strip():
-                            results.append(f"#### 📚 [{name_without_ext} - 책 서론]\n{decoded.strip()}")
-            except Exception:
-                pass
+    schema = get_module_schema(path, "commentaries_sqlite")
+    if schema is None:
+        return results
 
+    try:
+        with pooled_connection(path) as conn:
+            rows = conn.execute(schema.sql, (int(book_id), int(chap), verses[-1], verses[0])).fetchall()
+        for v_from, v_to, content in rows:
+            if content:
+                decoded = decode_rtf(content)
+                if decoded.strip():
+                    _append_row(results, verses, v_from, v_to, f"#### 📚 [{name_without_ext}]\n{decoded.strip()}")
     except Exception:
         pass
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
     return results
 
 
-def _load_from_commentaries_sqlite(path: str, book_id: int, chap: int, vers: int) -> List[str]:
-    results: List[str] = []
+def _load_from_mybible(path: str, book_id: int, chap: int, verses: List[int]) -> Dict[int, List[str]]:
+    results: Dict[int, List[str]] = {v: [] for v in verses}
     filename = os.path.basename(path)
     name_without_ext = os.path.splitext(filename)[0]
 
     try:
-        conn = sqlite3.connect(path)
-        cur = conn.cursor()
-
-        # 1차: 고정 스키마 commentaries 테이블
-        try:
+        with pooled_connection(path) as conn:
+            cur = conn.cursor()
             cur.execute(
                 """
-                SELECT text FROM commentaries
-                WHERE book_number=? AND ? BETWEEN chapter_number_from AND chapter_number_to
-                AND ? BETWEEN verse_number_from AND verse_number_to
+                SELECT fromverse, toverse, data FROM commentary
+                WHERE book=? AND chapter=? AND fromverse <= ? AND toverse >= ?
                 """,
-                (book_id, chap, vers),
+                (book_id, chap, verses[-1], verses[0]),
             )
-            rows = cur.fetchall()
-            for row in rows:
-                content = row[0]
+            for v_from, v_to, content in cur.fetchall():
                 if content:
                     decoded = decode_rtf(content)
                     if decoded.strip():
-                        results.append(f"#### 📚 [{name_without_ext}]\n{decoded.strip()}")
-        except Exception:
-            pass
-
-        # 2차: PRAGMA 기반으로 컬럼명을 유연하게 추론
-        try:
-            cur.execute("PRAGMA table_info(commentaries)")
-            cols = [c[1].lower() for c in cur.fetchall()]
-            c_from = "chapter_number_from" if "chapter_number_from" in cols else "chapter_number"
-            c_to = "chapter_number_to" if "chapter_number_to" in cols else c_from
-            v_from = "verse_number_from" if "verse_number_from" in cols else "verse_number"
-            v_to = "verse_number_to" if "verse_number_to" in cols else v_from
-            search_sql = f"""
-                SELECT text FROM commentaries
-                WHERE book_number = ?
-                AND ? BETWEEN {c_from} AND {c_to}
-                AND ? BETWEEN {v_from} AND {v_to}
-            """
-            cur.execute(search_sql, (int(book_id), int(chap), int(vers)))
-            rows = cur.fetchall()
-            for row in rows:
-                if row[0]:
-                    raw_data = row[0]
-                    decoded = decode_rtf(raw_data)
-                    if decoded.strip():
-                        results.append(f"#### 📚 [{filename}]\n{decoded.strip()}")
-        except Exception:
-            pass
+                        _append_row(results, verses, v_from, v_to, f"#### 📚 [{name_without_ext}]\n{decoded.strip()}")
     except Exception:
         pass
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
     return results
 
 
-def _load_from_mybible(path: str, book_id: int, chap: int, vers: int) -> List[str]:
-    results: List[str] = []
+def _load_from_twm(path: str, book_id: int, chap: int, verses: List[int]) -> Dict[int, List[str]]:
+    results: Dict[int, List[str]] = {v: [] for v in verses}
     filename = os.path.basename(path)
     name_without_ext = os.path.splitext(filename)[0]
 
     try:
-        conn = sqlite3.connect(path)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT data FROM commentary
-            WHERE book=? AND chapter=? AND ? BETWEEN fromverse AND toverse
-            """,
-            (book_id, chap, vers),
-        )
-        rows = cur.fetchall()
-        for row in rows:
-            content = row[0]
-            if content:
-                decoded = decode_rtf(content)
-                if decoded.strip():
-                    results.append(f"#### 📚 [{name_without_ext}]\n{decoded.strip()}")
+        with pooled_connection(path) as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT fvi, tvi, topic_id FROM bible_refs
+                WHERE bi=? AND ci=? AND fvi <= ? AND tvi >= ?
+                """,
+                (book_id, chap, verses[-1], verses[0]),
+            )
+            # 같은 topic 이 여러 절에 걸쳐 있어도 본문은 한 번만 읽고 디코딩합니다.
+            decoded_topics: Dict[int, List[str]] = {}
+            for v_from, v_to, topic_id in cur.fetchall():
+                if topic_id not in decoded_topics:
+                    entries = []
+                    cur.execute("SELECT data FROM content WHERE topic_id=?", (topic_id,))
+                    for (content,) in cur.fetchall():
+                        if content:
+                            decoded = decode_rtf(content)
+                            if decoded.strip():
+                                entries.append(f"#### 📚 [{name_without_ext}]\n{decoded.strip()}")
+                    decoded_topics[topic_id] = entries
+                for entry in decoded_topics[topic_id]:
+                    _append_row(results, verses, v_from, v_to, entry)
     except Exception:
         pass
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
     return results
 
 
-def _load_from_twm(path: str, book_id: int, chap: int, vers: int) -> List[str]:
-    results: List[str] = []
+def _load_from_cdb(path: str, book_id: int, chap: int, verses: List[int]) -> Dict[int, List[str]]:
+    results: Dict[int, List[str]] = {v: [] for v in verses}
     filename = os.path.basename(path)
     name_without_ext = os.path.splitext(filename)[0]
 
     try:
-        conn = sqlite3.connect(path)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT topic_id FROM bible_refs
-            WHERE bi=? AND ci=? AND ? BETWEEN fvi AND tvi
-            """,
-            (book_id, chap, vers),
-        )
-        rows = cur.fetchall()
-        for row in rows:
-            topic_id = row[0]
-            cur.execute("SELECT data FROM content WHERE topic_id=?", (topic_id,))
-            content_rows = cur.fetchall()
-            for content_row in content_rows:
-                content = content_row[0]
+        with pooled_connection(path) as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT verse, btext FROM Bible
+                WHERE book=? AND chapter=? AND verse BETWEEN ? AND ?
+                """,
+                (book_id, chap, verses[0], verses[-1]),
+            )
+            for verse, content in cur.fetchall():
                 if content:
                     decoded = decode_rtf(content)
                     if decoded.strip():
-                        results.append(f"#### 📚 [{name_without_ext}]\n{decoded.strip()}")
-    except Exception:
-        pass
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
-
-    return results
-
-
-def _load_from_cdb(path: str, book_id: int, chap: int, vers: int) -> List[str]:
-    results: List[str] = []
-    filename = os.path.basename(path)
-    name_without_ext = os.path.splitext(filename)[0]
-
-    try:
-        conn = sqlite3.connect(path)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT btext FROM Bible
-            WHERE book=? AND chapter=? AND verse=?
-            """,
-            (book_id, chap, vers),
-        )
-        rows = cur.fetchall()
-        for row in rows:
-            content = row[0]
-            if content:
-                decoded = decode_rtf(content)
-                if decoded.strip():
-                    results.append(f"#### 📚 [{name_without_ext}]\n{decoded.strip()}")
+                        _append_row(results, verses, verse, verse, f"#### 📚 [{name_without_ext}]\n{decoded.strip()}")
     except Exception:
         pass
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
     return results
 
 
-def _load_from_generic_sqlite(path: str, book_id: int, chap: int, vers: int) -> List[str]:
+def _load_from_generic_sqlite(path: str, book_id: int, chap: int, verses: List[int]) -> Dict[int, List[str]]:
     """
     commentaries.sqlite3 이외의 sqlite3 / sqlite 파일에 대해
-    테이블/컬럼명을 추론하여 주석/본문 텍스트를 추출합니다.
+    테이블/컬럼명을 추론하여 주석/본문 텍스트를 추출합니다. (추론 결과는 파일별로 캐시)
     """
-    results: List[str] = []
+    results: Dict[int, List[str]] = {v: [] for v in verses}
     filename = os.path.basename(path)
 
-    try:
-        conn = sqlite3.connect(path)
-        cur = conn.cursor()
-
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        all_tables = [row[0].lower() for row in cur.fetchall()]
-
-        potential_tables = [
-            "commentaries",
-            "commentary",
-            "texts",
-            "words",
-            "notes",
-            "content",
-            "bible",
-            "verses",
-            "scripture",
-        ]
-        target_table = None
-        for table_candidate in potential_tables:
-            if table_candidate in all_tables:
-                target_table = table_candidate
-                break
-
-        if target_table:
-            cur.execute(f"PRAGMA table_info({target_table});")
-            all_columns = [col[1].lower() for col in cur.fetchall()]
-            book_col = next(
-                (col for col in all_columns if col in ["book_number", "book", "book_id", "bk", "b"]), None
-            )
-            chapter_col = next(
-                (col for col in all_columns if col in ["chapter_number", "chapter", "ch", "c"]), None
-            )
-            verse_start_col = next(
-                (
-                    col
-                    for col in all_columns
-                    if col in ["verse_start", "verse", "vs", "v", "verse_number", "verse_num"]
-                ),
-                None,
-            )
-            verse_end_col = next(
-                (
-                    col
-                    for col in all_columns
-                    if col in ["verse_end", "to_verse", "toverse", "end_verse", "verse_to"]
-                ),
-                None,
-            )
-            text_col = next(
-                (
-                    col
-                    for col in all_columns
-                    if col in ["commentary", "text", "data", "content", "body", "notes", "comments", "content_text"]
-                ),
-                None,
-            )
+    schema = get_module_schema(path, "generic_commentary")
+    if schema is None:
+        return results
 
-            if book_col and chapter_col and verse_start_col and text_col:
-                try:
-                    if verse_end_col:
-                        cur.execute(
-                            f"""
-                            SELECT {text_col} FROM {target_table}
-                            WHERE CAST({book_col} AS INTEGER)=?
-                              AND CAST({chapter_col} AS INTEGER)=?
-                              AND ? BETWEEN CAST({verse_start_col} AS INTEGER) AND CAST({verse_end_col} AS INTEGER)
-                            """,
-                            (book_id, chap, vers),
-                        )
-                    else:
-                        cur.execute(
-                            f"""
-                            SELECT {text_col} FROM {target_table}
-                            WHERE CAST({book_col} AS INTEGER)=?
-                              AND CAST({chapter_col} AS INTEGER)=?
-                              AND CAST({verse_start_col} AS INTEGER)=?
-                            """,
-                            (book_id, chap, vers),
-                        )
-
-                    rows = cur.fetchall()
-                    for row in rows:
-                        content = row[0]
-                        if content:
-                            decoded = decode_rtf(content)
-                            if decoded.strip():
-                                results.append(f"#### 📚 [주석: {filename}]\n{decoded.strip()}")
-                except sqlite3.Error:
-                    pass
+    try:
+        with pooled_connection(path) as conn:
+            rows = conn.execute(schema.sql, (book_id, chap, verses[-1], verses[0])).fetchall()
+        for v_from, v_to, content in rows:
+            if content:
+                decoded = decode_rtf(content)
+                if decoded.strip():
+                    _append_row(results, verses, v_from, v_to, f"#### 📚 [주석: {filename}]\n{decoded.strip()}")
     except Exception:
         pass
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
     return results
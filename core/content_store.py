@@ -0,0 +1,219 @@
+import hashlib
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from core.cache_utils import get_cache_path
+
+# ========== 내용 주소 기반 본문 저장소 ==========
+# 세션 상태(전수 조사 결과, 바구니, 검색 결과)에 문서/주석 본문을 통째로 복사해 두면
+# 사용자(세션)가 늘 때마다 같은 본문이 여러 벌 메모리에 쌓입니다.
+# 본문은 프로세스 전체에서 한 번만 이 저장소에 넣고, 세션에는 해시 id 와 짧은 미리보기만 둡니다.
+#   - id: 본문 UTF-8 바이트의 blake2b 해시 (같은 본문은 항상 같은 id → 자동 중복 제거)
+#   - 메모리: 최근 사용 순(LRU)으로 글자 수 상한까지만 보관
+#   - 상한을 넘어 밀려난 본문은 캐시 폴더에 zlib 압축 파일로 내려 두었다가 필요할 때 다시 읽습니다.
+#     디스크에 다 쓰기 전까지는 _pending 에 남겨 두어, 그 사이의 get 도 본문을 돌려받습니다.
+#   - 디스크 보관소는 크기/나이 상한을 넘으면 오래 쓰지 않은 파일부터 지웁니다. (읽을 때 mtime 갱신)
+
+CONTENT_STORE_DIR = "content_store"
+DEFAULT_MEMORY_LIMIT = 32 * 1024 * 1024  # 글자 수 기준
+PREVIEW_CHARS = 200
+SPILL_LIMIT_BYTES = 256 * 1024 * 1024  # 디스크 보관소 압축 파일 크기 합계 상한
+SPILL_MAX_AGE = 30 * 24 * 3600  # 이 기간(초) 동안 읽지 않은 보관 파일은 삭제
+
+
+def content_id(text: str) -> str:
+    """본문의 저장소 id (blake2b 128비트 hex)"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ContentStore:
+    """해시 id 로 본문을 보관하는 LRU 메모리 캐시 + 디스크 보관소"""
+
+    def __init__(self, memory_limit: int = DEFAULT_MEMORY_LIMIT, spill_dir: Optional[str] = None):
+        self.memory_limit = memory_limit
+        self._spill_dir = spill_dir
+        self._mem: "OrderedDict[str, str]" = OrderedDict()
+        self._mem_chars = 0
+        # 메모리에서 밀려났지만 아직 디스크에 다 쓰지 않은 본문
+        self._pending: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        # 마지막 정리 이후 디스크에 쓴 바이트 수 (None 이면 아직 한 번도 정리하지 않음)
+        self._spilled_since_prune: Optional[int] = None
+
+    def _spill_path(self, cid: str) -> str:
+        if self._spill_dir is None:
+            self._spill_dir = get_cache_path(CONTENT_STORE_DIR)
+        os.makedirs(self._spill_dir, exist_ok=True)
+        # 한 폴더에 파일이 너무 많아지지 않도록 앞 두 글자로 나눔
+        sub = os.path.join(self._spill_dir, cid[:2])
+        os.makedirs(sub, exist_ok=True)
+        return os.path.join(sub, cid)
+
+    def _spill(self, cid: str, text: str) -> bool:
+        """메모리에서 밀려나는 본문을 디스크에 기록 (이미 있으면 사용 시각만 갱신). 반환: 성공 여부"""
+        path = self._spill_path(cid)
+        if os.path.exists(path):
+            _touch(path)
+            return True
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        data = zlib.compress(text.encode("utf-8"))
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+        self._after_spill(len(data))
+        return True
+
+    def _after_spill(self, size: int) -> None:
+        """처음 쓸 때와, 상한의 1/8 만큼 더 쓸 때마다 보관소를 정리"""
+        with self._lock:
+            if self._spilled_since_prune is not None:
+                self._spilled_since_prune += size
+                if self._spilled_since_prune < SPILL_LIMIT_BYTES // 8:
+                    return
+            self._spilled_since_prune = 0
+        prune_spill_dir(self._spill_dir)
+
+    def _flush(self, evicted: List[Tuple[str, str]]) -> None:
+        """밀려난 본문을 디스크에 쓰고 _pending 에서 뺌. 쓰지 못한 본문은 메모리로 되돌림 (잠금 밖에서 호출)"""
+        for old_id, old_text in evicted:
+            ok = self._spill(old_id, old_text)
+            with self._lock:
+                if self._pending.get(old_id) is old_text:
+                    del self._pending[old_id]
+                    if not ok and old_id not in self._mem:
+                        self._mem[old_id] = old_text
+                        self._mem_chars += len(old_text)
+
+    def _load_spilled(self, cid: str) -> Optional[str]:
+        path = self._spill_path(cid)
+        try:
+            with open(path, "rb") as f:
+                text = zlib.decompress(f.read()).decode("utf-8")
+        except (OSError, zlib.error, UnicodeDecodeError):
+            return None
+        _touch(path)
+        return text
+
+    def _remember(self, cid: str, text: str) -> List[Tuple[str, str]]:
+        """
+        메모리 LRU 에 넣고 상한을 넘은 만큼 오래된 본문을 밀어냄 (잠금 안에서 호출)
+        밀려난 본문은 디스크에 다 쓸 때까지 _pending 에 남겨 두고, 호출 측이 _flush 로 씁니다.
+        """
+        if cid in self._mem:
+            self._mem.move_to_end(cid)
+            return []
+        self._mem[cid] = text
+        self._mem_chars += len(text)
+        evicted = []
+        while self._mem_chars > self.memory_limit and len(self._mem) > 1:
+            old_id, old_text = self._mem.popitem(last=False)
+            self._mem_chars -= len(old_text)
+            self._pending[old_id] = old_text
+            evicted.append((old_id, old_text))
+        return evicted
+
+    def put(self, text: str) -> str:
+        """본문을 저장하고 id 를 반환"""
+        cid = content_id(text)
+        with self._lock:
+            evicted = self._remember(cid, text)
+        self._flush(evicted)
+        return cid
+
+    def get(self, cid: str) -> Optional[str]:
+        """id 의 본문 (메모리 → 디스크에 쓰는 중 → 디스크 순). 없으면 None"""
+        with self._lock:
+            text = self._mem.get(cid)
+            if text is not None:
+                self._mem.move_to_end(cid)
+                return text
+            # 디스크에 쓰는 중인 본문은 그대로 돌려줌 (곧 디스크에서 읽을 수 있음)
+            text = self._pending.get(cid)
+            if text is not None:
+                return text
+        text = self._load_spilled(cid)
+        if text is None:
+            return None
+        with self._lock:
+            evicted = self._remember(cid, text)
+        self._flush(evicted)
+        return text
+
+    def memory_usage(self) -> int:
+        """메모리에 올라 있는 본문 글자 수 합계"""
+        with self._lock:
+            return self._mem_chars
+
+
+def _touch(path: str) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune_spill_dir(
+    spill_dir: Optional[str] = None,
+    max_bytes: int = SPILL_LIMIT_BYTES,
+    max_age: float = SPILL_MAX_AGE,
+) -> int:
+    """
+    디스크 보관소에서 max_age 초 넘게 쓰지 않은 파일을 지우고,
+    남은 크기가 max_bytes 를 넘으면 오래 쓰지 않은 파일부터 지웁니다. 반환: 지운 파일 수
+    """
+    spill_dir = spill_dir or get_cache_path(CONTENT_STORE_DIR)
+    entries = []
+    for root, _dirs, names in os.walk(spill_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    cutoff = time.time() - max_age
+    removed = 0
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        if path.endswith(".tmp") and mtime >= cutoff:
+            continue  # 다른 스레드가 쓰는 중일 수 있는 임시 파일
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+_default_store = ContentStore()
+
+
+def put_content(text: str) -> str:
+    """프로세스 공용 저장소에 본문을 넣고 id 를 반환"""
+    return _default_store.put(text)
+
+
+def get_content(cid: str) -> Optional[str]:
+    """프로세스 공용 저장소에서 본문을 꺼냄"""
+    return _default_store.get(cid)
+
+
+def make_preview(text: str, limit: int = PREVIEW_CHARS) -> str:
+    """세션에 둘 짧은 미리보기"""
+    return text if len(text) <= limit else text[:limit] + "..."
@@ -0,0 +1,133 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+# ========== 모듈 DB 읽기 전용 연결 풀 ==========
+# 주석/성경/사전 모듈(.cmti, .cmtx, .mybible, .twm, .cdb, .sqlite3, .dct.twm)은
+# 앱에서 읽기만 하므로, 파일마다 연결을 한 번만 열어 재사용합니다.
+# - URI 읽기 전용 모드(mode=ro)로 열고, -wal 파일이 없으면 immutable=1 로 잠금 검사도 생략
+# - mmap_size / cache_size 를 키워 반복 조회 시 디스크 I/O 를 줄임
+# - 파일의 (mtime, size) 가 바뀌면 연결을 새로 엶
+# - 오래 쓰지 않은 연결, 최대 개수를 넘는 연결은 LRU 순서로 닫음
+# - Streamlit 은 세션마다 스레드가 다르므로, 연결마다 잠금을 두고 한 번에 한 스레드만 사용
+
+MAX_OPEN_CONNECTIONS = 64
+IDLE_TIMEOUT_SEC = 600
+MMAP_SIZE = 256 * 1024 * 1024
+CACHE_SIZE_KB = 16 * 1024
+
+
+class _PooledEntry:
+    __slots__ = ("conn", "sig", "lock", "last_used", "in_use")
+
+    def __init__(self, conn: sqlite3.Connection, sig: Tuple[int, int]):
+        self.conn = conn
+        self.sig = sig
+        self.lock = threading.RLock()
+        self.last_used = time.monotonic()
+        self.in_use = 0
+
+
+def _module_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st_info = os.stat(path)
+    except OSError:
+        return None
+    return st_info.st_mtime_ns, st_info.st_size
+
+
+def open_readonly_connection(path: str) -> sqlite3.Connection:
+    """모듈 DB 를 읽기 전용 URI 모드로 열고 조회용 PRAGMA 를 설정합니다."""
+    uri = Path(path).resolve().as_uri() + "?mode=ro"
+    # WAL 파일이 남아 있으면 immutable 로 열 경우 최신 내용이 빠질 수 있으므로 제외
+    if not os.path.exists(path + "-wal"):
+        uri += "&immutable=1"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    try:
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+    except sqlite3.Error:
+        pass
+    return conn
+
+
+class ModuleConnectionPool:
+    """경로별 읽기 전용 sqlite3 연결을 보관하는 LRU 풀"""
+
+    def __init__(self, max_open: int = MAX_OPEN_CONNECTIONS, idle_timeout: float = IDLE_TIMEOUT_SEC):
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self._entries: "OrderedDict[str, _PooledEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict_locked(self) -> None:
+        """유휴 시간 초과 / 개수 초과 연결을 오래된 순서로 닫습니다. (self._lock 보유 상태)"""
+        now = time.monotonic()
+        for key in list(self._entries):
+            entry = self._entries[key]
+            too_many = len(self._entries) > self.max_open
+            idle = now - entry.last_used > self.idle_timeout
+            if entry.in_use == 0 and (too_many or idle):
+                del self._entries[key]
+                entry.conn.close()
+
+    def _checkout(self, path: str) -> _PooledEntry:
+        key = os.path.abspath(path)
+        sig = _module_signature(key)
+        if sig is None:
+            raise sqlite3.OperationalError(f"unable to open database file: {path}")
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.sig != sig and entry.in_use == 0:
+                # 파일이 바뀐 경우 기존 연결 폐기
+                del self._entries[key]
+                entry.conn.close()
+                entry = None
+            if entry is None:
+                entry = _PooledEntry(open_readonly_connection(key), sig)
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            entry.in_use += 1
+            entry.last_used = time.monotonic()
+            self._evict_locked()
+        return entry
+
+    def _checkin(self, entry: _PooledEntry) -> None:
+        with self._lock:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+
+    @contextmanager
+    def connection(self, path: str) -> Iterator[sqlite3.Connection]:
+        """with pool.connection(path) as conn: 형태로 사용 (블록 동안 해당 연결 독점)"""
+        entry = self._checkout(path)
+        try:
+            with entry.lock:
+                yield entry.conn
+        finally:
+            self._checkin(entry)
+
+    def close_all(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.in_use == 0:
+                    entry.conn.close()
+            self._entries = OrderedDict((k, e) for k, e in self._entries.items() if e.in_use)
+
+
+_default_pool = ModuleConnectionPool()
+
+
+def pooled_connection(path: str):
+    """프로세스 공용 풀에서 모듈 DB 연결을 빌립니다."""
+    return _default_pool.connection(path)
+
+
+def close_pooled_connections() -> None:
+    _default_pool.close_all()
@@ -0,0 +1,151 @@
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Optional, Tuple
+
+import fitz  # PyMuPDF
+import ebooklib
+from bs4 import BeautifulSoup
+from docx import Document
+from ebooklib import epub
+
+from core.bible_utils import decode_rtf
+from core.cache_utils import file_signature, get_cache_path
+
+# ========== 문서 텍스트 추출 영구 캐시 ==========
+# Streamlit 재시작 시에도 PDF/DOCX/EPUB/HTML 을 다시 파싱하지 않도록
+# 추출된 텍스트를 (절대경로, mtime, size) 키로 SQLite 에 zlib 압축 저장합니다.
+# - 파일이 수정되면 mtime/size 가 달라지므로 자동으로 다시 추출합니다.
+# - .txt 는 읽기 자체가 빠르므로 캐시하지 않습니다.
+
+TEXT_CACHE_DB = "text_cache.db"
+_CACHED_EXTS = (".docx", ".pdf", ".rtf", ".epub", ".html", ".htm")
+SUPPORTED_EXTS = _CACHED_EXTS + (".txt",)
+
+_init_lock = threading.Lock()
+_initialized_path: Optional[str] = None
+
+
+def _connect_text_cache() -> sqlite3.Connection:
+    """텍스트 캐시 DB 연결 (최초 1회 테이블 생성)"""
+    global _initialized_path
+    db_path = get_cache_path(TEXT_CACHE_DB)
+    # 여러 프로세스(병렬 전수 조사)가 동시에 쓸 수 있으므로 timeout 을 넉넉히 줍니다.
+    conn = sqlite3.connect(db_path, timeout=30)
+    if _initialized_path != db_path:
+        with _init_lock:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS texts (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    data BLOB NOT NULL
+                )
+                """
+            )
+            conn.commit()
+            _initialized_path = db_path
+    return conn
+
+
+def _load_cached_text(sig: Tuple[str, int, int]) -> Optional[str]:
+    abs_path, mtime_ns, size = sig
+    try:
+        conn = _connect_text_cache()
+        try:
+            row = conn.execute(
+                "SELECT data FROM texts WHERE path=? AND mtime_ns=? AND size=?",
+                (abs_path, mtime_ns, size),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row:
+            return zlib.decompress(row[0]).decode("utf-8")
+    except Exception:
+        pass
+    return None
+
+
+def _store_cached_text(sig: Tuple[str, int, int], text: str) -> None:
+    abs_path, mtime_ns, size = sig
+    try:
+        data = zlib.compress(text.encode("utf-8"), 6)
+        conn = _connect_text_cache()
+        try:
+            # path 가 PRIMARY KEY 이므로 수정된 파일은 이전 버전을 덮어씁니다.
+            conn.execute(
+                "INSERT OR REPLACE INTO texts (path, mtime_ns, size, data) VALUES (?, ?, ?, ?)",
+                (abs_path, mtime_ns, size, data),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception:
+        # 캐시 저장 실패는 검색 결과에 영향을 주지 않으므로 무시합니다.
+        pass
+
+
+def extract_text(path: str) -> str:
+    """
+    파일 형식별 파서로 순수 텍스트를 추출합니다. (캐시 미사용)
+    지원하지 않는 형식은 빈 문자열을 반환하고, 파싱 오류는 예외로 전달합니다.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".docx":
+        doc = Document(path)
+        return "\n".join([p.text for p in doc.paragraphs])
+    elif ext == ".pdf":
+        parts = []
+        with fitz.open(path) as doc:
+            for page in doc:
+                parts.append(page.get_text())
+        return "".join(parts)
+    elif ext in [".txt", ".rtf"]:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            content = f.read()
+            return decode_rtf(content) if ext == ".rtf" else content
+    elif ext == ".epub":
+        book = epub.read_epub(path)
+        items = []
+        for item in book.get_items():
+            if item.get_type() == ebooklib.ITEM_DOCUMENT:
+                soup = BeautifulSoup(item.get_content(), "html.parser")
+                for link in soup.find_all("a"):
+                    link.unwrap()
+                items.append(soup.get_text())
+        return "\n".join(items)
+    elif ext in [".html", ".htm"]:
+        with open(path, "r", encoding="utf-8") as f:
+            return BeautifulSoup(f.read(), "html.parser").get_text()
+    return ""
+
+
+def read_file(path: str) -> str:
+    """
+    파일 텍스트를 반환합니다.
+    변경되지 않은 파일은 영구 캐시에서 바로 읽고, 새 파일/수정된 파일만 다시 추출합니다.
+    """
+    if not os.path.exists(path):
+        return ""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in SUPPORTED_EXTS:
+        return ""
+
+    sig = file_signature(path) if ext in _CACHED_EXTS else None
+    if sig is not None:
+        cached = _load_cached_text(sig)
+        if cached is not None:
+            return cached
+
+    try:
+        text = extract_text(path)
+    except Exception as e:
+        # 오류 메시지는 캐시하지 않습니다. (다음 실행에서 다시 시도)
+        return f"파일 읽기 오류 ({path}): {str(e)}"
+
+    if sig is not None:
+        _store_cached_text(sig, text)
+    return text
@@ -0,0 +1,178 @@
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.cache_utils import file_signature
+from core.db_pool import pooled_connection
+
+# ========== 사전 항목 키 자동완성 색인 ==========
+# 사전(.dct.twm) topics 의 인덱스 컬럼 값(스트롱 코드, 한글/원어 표제어 등)을
+# 사전마다 한 번만 읽어 메모리에 정렬된 배열로 보관합니다.
+#   - 접두어 검색: 정렬 배열에서 이분 탐색 (예: "G2" → G2, G20 … G26 … G2889)
+#   - 오타 검색: 한 글자 삭제 변형 색인 (삽입/삭제/치환/인접 글자 뒤바뀜 1회까지)
+# 대소문자/유니코드 정규화 형식 차이는 무시하고, 결과는 숫자를 값으로 비교한 자연 순서로 돌려줍니다.
+# 사전 파일이 바뀌면 (mtime, size) 로 감지해 다시 읽습니다.
+
+DEFAULT_SUGGESTIONS = 30
+# 접두어 범위가 이보다 크면 범위 전체를 정렬하지 않고 자연 순서 배열을 앞에서부터 훑습니다.
+_RANGE_SORT_LIMIT = 4096
+
+_DIGITS = re.compile(r"(\d+)")
+
+
+def fold_key(text: str) -> str:
+    """비교용 키 (앞뒤 공백 제거, NFC 정규화, 대소문자 무시)"""
+    return unicodedata.normalize("NFC", text.strip()).casefold()
+
+
+def _natural_key(folded: str) -> Tuple[Tuple[int, object], ...]:
+    """G2 < G20 < G26 < G200 처럼 숫자 부분을 값으로 비교하는 정렬 키"""
+    return tuple((0, int(part)) if part.isdigit() else (1, part) for part in _DIGITS.split(folded) if part)
+
+
+class LexiconKeyIndex:
+    """사전 키 목록의 접두어/오타 검색 색인"""
+
+    def __init__(self, keys: Iterable[str]):
+        folded: Dict[str, str] = {}
+        for key in keys:
+            if key is None:
+                continue
+            key = str(key).strip()
+            if key:
+                folded.setdefault(fold_key(key), key)
+
+        entries = sorted(folded.items())
+        self._folded: List[str] = [f for f, _ in entries]
+        self._keys: List[str] = [k for _, k in entries]
+        self._natural_order: List[int] = sorted(range(len(entries)), key=lambda i: _natural_key(self._folded[i]))
+        self._rank: List[int] = [0] * len(entries)
+        for rank, i in enumerate(self._natural_order):
+            self._rank[i] = rank
+        self._deletes: Optional[Dict[str, List[int]]] = None
+        self._deletes_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        folded = fold_key(key)
+        i = bisect_left(self._folded, folded)
+        return i < len(self._folded) and self._folded[i] == folded
+
+    def first(self, limit: int) -> List[str]:
+        """자연 순서로 앞쪽 키 (입력 전 예시용)"""
+        return [self._keys[i] for i in self._natural_order[:limit]]
+
+    def _prefix_range(self, folded: str) -> Tuple[int, int]:
+        lo = bisect_left(self._folded, folded)
+        # 접두어 뒤에 올 수 있는 가장 큰 문자를 붙여 범위 끝을 구함
+        hi = bisect_left(self._folded, folded + "\U0010ffff", lo)
+        return lo, hi
+
+    def prefix(self, text: str, limit: int = DEFAULT_SUGGESTIONS) -> List[str]:
+        """입력으로 시작하는 키 (입력과 같은 키가 있으면 맨 앞, 나머지는 자연 순서)"""
+        folded = fold_key(text)
+        if not folded:
+            return self.first(limit)
+        lo, hi = self._prefix_range(folded)
+        if lo < hi and self._folded[lo] == folded:
+            # 정렬 배열에서 접두어와 같은 키는 범위의 첫 칸
+            rest = self._range_keys(lo + 1, hi, limit - 1)
+            return [self._keys[lo]] + rest
+        return self._range_keys(lo, hi, limit)
+
+    def _range_keys(self, lo: int, hi: int, limit: int) -> List[str]:
+        """정렬 배열의 [lo, hi) 구간에서 자연 순서로 앞쪽 limit 개"""
+        if limit <= 0:
+            return []
+        if hi - lo <= _RANGE_SORT_LIMIT:
+            picked = heapq.nsmallest(limit, range(lo, hi), key=self._rank.__getitem__)
+        else:
+            picked = []
+            for i in self._natural_order:
+                if lo <= i < hi:
+                    picked.append(i)
+                    if len(picked) >= limit:
+                        break
+        return [self._keys[i] for i in picked]
+
+    def _delete_index(self) -> Dict[str, List[int]]:
+        """한 글자 삭제 변형 -> 키 번호 (첫 오타 검색 때 한 번 생성)"""
+        with self._deletes_lock:
+            if self._deletes is None:
+                deletes: Dict[str, List[int]] = {}
+                for i, folded in enumerate(self._folded):
+                    for variant in {folded[:j] + folded[j + 1:] for j in range(len(folded))}:
+                        deletes.setdefault(variant, []).append(i)
+                self._deletes = deletes
+            return self._deletes
+
+    def fuzzy(self, text: str, limit: int = DEFAULT_SUGGESTIONS) -> List[str]:
+        """한 글자 오타(삽입/삭제/치환/뒤바뀜)까지 허용해 찾은 키 (자연 순서)"""
+        folded = fold_key(text)
+        if len(folded) < 2:
+            return []
+        deletes = self._delete_index()
+        candidates = set()
+        # 입력에서 한 글자 뺀 것이 키인 경우 (입력에 글자가 하나 더 들어감)
+        variants = {folded[:j] + folded[j + 1:] for j in range(len(folded))}
+        for variant in variants:
+            i = bisect_left(self._folded, variant)
+            if i < len(self._folded) and self._folded[i] == variant:
+                candidates.add(i)
+        # 키에서 한 글자 뺀 것이 입력 (글자 누락) / 양쪽에서 한 글자씩 뺀 것이 같음 (치환, 뒤바뀜)
+        for variant in variants | {folded}:
+            candidates.update(deletes.get(variant, ()))
+        return [self._keys[i] for i in heapq.nsmallest(limit, candidates, key=self._rank.__getitem__)]
+
+    def complete(self, text: str, limit: int = DEFAULT_SUGGESTIONS) -> List[str]:
+        """접두어 결과를 먼저, 부족하면 오타 허용 결과로 채운 자동완성 목록"""
+        results = self.prefix(text, limit)
+        if len(results) < limit:
+            seen = set(results)
+            for key in self.fuzzy(text, limit):
+                if key not in seen:
+                    results.append(key)
+                    if len(results) >= limit:
+                        break
+        return results
+
+
+# ========== 사전별 색인 (프로세스 공용, 사전당 1회 로드) ==========
+
+_indexes: Dict[Tuple[str, str], Tuple[Tuple[int, int], LexiconKeyIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_lexicon_key_index(db_path: str, index_column: str) -> Optional[LexiconKeyIndex]:
+    """사전의 키 색인. 사전 파일이 바뀌었을 때만 다시 읽습니다. (읽을 수 없으면 None)"""
+    sig = file_signature(db_path)
+    if sig is None or not index_column:
+        return None
+    cache_key = (sig[0], index_column)
+    with _indexes_lock:
+        cached = _indexes.get(cache_key)
+    if cached is not None and cached[0] == sig[1:]:
+        return cached[1]
+
+    try:
+        with pooled_connection(sig[0]) as conn:
+            keys = [row[0] for row in conn.execute(f"SELECT {index_column} FROM topics")]
+    except Exception:
+        return None
+    index = LexiconKeyIndex(keys)
+    with _indexes_lock:
+        _indexes[cache_key] = (sig[1:], index)
+    return index
+
+
+def suggest_lexicon_keys(
+    db_path: str, index_column: str, text: str, limit: int = DEFAULT_SUGGESTIONS
+) -> List[str]:
+    """사전 키 자동완성 (접두어 + 오타 허용)"""
+    index = get_lexicon_key_index(db_path, index_column)
+    return index.complete(text, limit) if index is not None else []
@@ -0,0 +1,550 @@
+import hashlib
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from core.bible_utils import decode_rtf_text
+from core.cache_utils import file_signature, get_cache_path
+from core.db_pool import open_readonly_connection, pooled_connection
+
+# ========== 사전(.dct.twm) 항목 디코딩 ==========
+# 사전마다 저장 방식이 달라 아래 순서로 평문을 만듭니다.
+#   1. 바이블렉스 (bible.dct.twm): RTF 유니코드 10진수 -> decode_rtf
+#   2. Bullinger-App: 일반 텍스트
+#   3. Mickelson's Strong: zlib 압축 blob(data2) -> 압축해제 -> decode_rtf
+#   4. 70인역, 킹제임스스트롱, 한글스트롱: RTF 유니코드 10진수 -> decode_rtf
+#   5. CWSD 등 HTML 사전: BeautifulSoup 로 태그를 먼저 벗긴 뒤 decode_rtf
+# 이어서 latin-1/cp1252 로 깨진 원어 복구, 깨진 물음표/빈 줄 정리를 합니다.
+#
+# ========== 디코딩 결과 영구 캐시 ==========
+# 위 과정은 항목마다 JOIN + 압축해제 + HTML 파싱 + 정규식 여러 번이라 느리고,
+# st.cache_data 결과는 재시작하면 사라집니다.
+# 사전 파일마다 캐시 폴더에 디코딩된 평문 저장소(.db)를 두고, 키(topics 인덱스 컬럼 값)로 한 번에 읽습니다.
+#   - 조회할 때 없으면 그 자리에서 디코딩해 저장 (결과 없음도 저장)
+#   - build_lexicon_store() 로 사전 전체를 한꺼번에 채울 수 있음 (백그라운드 스레드 지원)
+#   - 사전 파일의 (mtime, size) 나 인덱스 컬럼, 저장 형식 버전이 바뀌면 저장소를 비우고 다시 채웁니다.
+# 화면용 HTML 은 평문의 줄바꿈을 <br> 로 바꾼 것뿐이라 평문만 저장하고 읽을 때 만듭니다.
+
+LEXICON_CACHE_DIR = "lexicon"
+LEXICON_STORE_VERSION = 1
+CHUNK_TOPICS = 2000  # 전체 디코딩 작업 단위 (topics id 개수)
+
+_ORIGINAL_CHARS = re.compile(r"[\u0370-\u03FF\u0590-\u05FF\uAC00-\uD7A3]")
+_BROKEN_LATIN = re.compile(r"[\xe0-\xff]{2,}")
+_HTML_TAG = re.compile(r"<[a-zA-Z/][^>]*>")
+_MARK_AFTER_ORIGINAL = re.compile(r"([\u0590-\u05FF\u0370-\u03FF\uAC00-\uD7A3])\?")
+
+
+def _raw_entry_text(raw_data, blob_data) -> str:
+    """content 행의 data / data2 를 문자열로 (zlib 압축 blob 우선)"""
+    if blob_data and isinstance(blob_data, bytes):
+        try:
+            return zlib.decompress(blob_data).decode("utf-8", errors="ignore")
+        except Exception:
+            try:
+                return blob_data.decode("utf-8", errors="ignore")
+            except Exception:
+                return str(blob_data)
+    if raw_data:
+        if isinstance(raw_data, bytes):
+            return raw_data.decode("utf-8", errors="ignore")
+        return str(raw_data)
+    return ""
+
+
+def decode_lexicon_entry(raw_data, blob_data=None) -> Optional[str]:
+    """사전 항목 하나를 평문으로 디코딩합니다. 내용이 없으면 None"""
+    content = _raw_entry_text(raw_data, blob_data)
+    if not content:
+        return None
+
+    # decode_rtf 전에 HTML 을 먼저 처리해야 <grk><trn> 등 태그가 제거됨
+    if _HTML_TAG.search(content):
+        try:
+            soup = BeautifulSoup(content, "html.parser")
+            for tag in soup(["script", "style"]):
+                tag.decompose()
+            for br in soup.find_all(["br", "p", "div", "li", "h1", "h2", "h3", "h4"]):
+                br.insert_before("\n")
+            # 비표준 태그(<grk><trn><a class=T> 등) 포함 모든 태그 제거
+            content = soup.get_text(separator="")
+        except Exception:
+            content = re.sub(r"<[^>]+>", "", content)
+
+    # RTF 유니코드 10진수(\u-숫자) 처리
+    plain_text = decode_rtf_text(content)
+
+    # latin-1/cp1252 인코딩 깨짐 복구 (Lxx 등) - 원어 글자가 늘어날 때만 채택
+    if _BROKEN_LATIN.search(plain_text):
+        try:
+            recovered = plain_text.encode("latin-1").decode("utf-8", errors="ignore")
+            if len(_ORIGINAL_CHARS.findall(recovered)) > len(_ORIGINAL_CHARS.findall(plain_text)):
+                plain_text = recovered
+        except Exception:
+            pass
+
+    # 공백 및 깨진 물음표 정리
+    plain_text = _MARK_AFTER_ORIGINAL.sub(r"\1", plain_text)
+    plain_text = re.sub(r"\n{3,}", "\n\n", plain_text)
+    return plain_text.strip()
+
+
+def lexicon_html(plain_text: str) -> str:
+    """해설창 표시용 HTML"""
+    return plain_text.replace("\n", "<br>")
+
+
+def _fetch_entry_row(cur: sqlite3.Cursor, search_term: str, index_column: str):
+    """키에 해당하는 (data, data2) 행. data2 컬럼이 없는 사전은 data 만"""
+    try:
+        cur.execute(
+            f"SELECT c.data, c.data2 FROM content c JOIN topics t ON c.topic_id = t.id "
+            f"WHERE t.{index_column} = ? ORDER BY t.id LIMIT 1",
+            (search_term,),
+        )
+        return cur.fetchone()
+    except sqlite3.Error:
+        cur.execute(
+            f"SELECT c.data FROM content c JOIN topics t ON c.topic_id = t.id "
+            f"WHERE t.{index_column} = ? ORDER BY t.id LIMIT 1",
+            (search_term,),
+        )
+        row = cur.fetchone()
+        return (row[0], None) if row else None
+
+
+def _iter_entry_rows(
+    cur: sqlite3.Cursor, index_column: str, first_id: int, last_id: int
+) -> Iterator[Tuple[object, object, object]]:
+    """topics id 구간의 (키, data, data2) 행 (id 순)"""
+    sql = (
+        f"SELECT t.{index_column}, c.data{{}} FROM topics t JOIN content c ON c.topic_id = t.id "
+        f"WHERE t.id BETWEEN ? AND ? ORDER BY t.id"
+    )
+    try:
+        cur.execute(sql.format(", c.data2"), (first_id, last_id))
+        yield from cur
+    except sqlite3.OperationalError:
+        cur.execute(sql.format(""), (first_id, last_id))
+        for key, data in cur:
+            yield key, data, None
+
+
+def detect_index_column(db_path: str) -> Optional[str]:
+    """사전 topics 테이블에서 검색 키로 쓸 컬럼명을 추정합니다."""
+    try:
+        with pooled_connection(db_path) as conn:
+            columns = [col[1] for col in conn.execute("PRAGMA table_info(topics)")]
+    except sqlite3.Error:
+        return None
+    # 일반적인 인덱스 컬럼명 우선순위, 없으면 첫 번째 컬럼
+    for col in ("subject", "topic", "key", "word", "entry", "term", "id"):
+        if col in columns:
+            return col
+    return columns[0] if columns else None
+
+
+def topic_id_chunks(db_path: str, chunk_size: int = CHUNK_TOPICS) -> List[Tuple[int, int]]:
+    """전체 디코딩 작업 단위: topics id 를 chunk_size 씩 나눈 (첫 id, 끝 id) 목록"""
+    with pooled_connection(db_path) as conn:
+        lo, hi = conn.execute("SELECT MIN(id), MAX(id) FROM topics").fetchone()
+    if lo is None:
+        return []
+    return [(start, min(start + chunk_size - 1, hi)) for start in range(lo, hi + 1, chunk_size)]
+
+
+def decode_lexicon_chunk(
+    db_path: str, index_column: str, first_id: int, last_id: int
+) -> Tuple[List[Tuple[str, Optional[bytes]]], int, float]:
+    """
+    topics id 구간의 항목을 디코딩합니다. (프로세스 풀 워커)
+    반환: ([(키, 압축 평문 또는 None)], 읽은 행 수, 걸린 시간(초))
+    같은 키가 여러 항목이면 lookup_lexicon 과 같이 id 가 가장 작은 항목만 남깁니다.
+    """
+    started = time.perf_counter()
+    entries: Dict[str, Optional[bytes]] = {}
+    rows = 0
+    # 전체 순회는 오래 걸리므로 화면 조회가 쓰는 공용 연결 대신 전용 연결을 사용
+    source = open_readonly_connection(db_path)
+    try:
+        for key, data, data2 in _iter_entry_rows(source.cursor(), index_column, first_id, last_id):
+            rows += 1
+            key = str(key).strip() if key is not None else ""
+            if not key or key in entries:
+                continue
+            try:
+                plain_text = decode_lexicon_entry(data, data2)
+            except Exception:
+                plain_text = None
+            entries[key] = _pack(plain_text)
+    finally:
+        source.close()
+    return list(entries.items()), rows, time.perf_counter() - started
+
+
+# ========== 디코딩 결과 저장소 ==========
+
+@lru_cache(maxsize=None)
+def lexicon_store_path(db_path: str) -> str:
+    """사전 파일별 저장소 경로 (캐시 폴더/lexicon/<이름>-<경로 해시>.db)"""
+    abs_path = os.path.abspath(db_path)
+    digest = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:12]
+    name = os.path.basename(abs_path).split(".")[0]
+    folder = get_cache_path(LEXICON_CACHE_DIR)
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, f"{name}-{digest}.db")
+
+
+def _store_meta(sig: Tuple[str, int, int], index_column: str) -> Dict[str, str]:
+    return {
+        "version": str(LEXICON_STORE_VERSION),
+        "source": sig[0],
+        "mtime_ns": str(sig[1]),
+        "size": str(sig[2]),
+        "index_column": index_column,
+    }
+
+
+_validated_stores: Dict[str, Tuple[Tuple[str, int, int], str]] = {}
+
+
+def _open_store(db_path: str, sig: Tuple[str, int, int], index_column: str) -> sqlite3.Connection:
+    """저장소 연결. 원본 사전/인덱스 컬럼/형식이 바뀌었으면 비우고 새 메타로 갱신"""
+    store_path = lexicon_store_path(db_path)
+    conn = sqlite3.connect(store_path, timeout=30)
+    # 이 프로세스에서 이미 확인한 저장소는 스키마/메타 확인을 건너뜀 (조회 1회 = 키 읽기 1회)
+    if _validated_stores.get(store_path) == (sig, index_column):
+        return conn
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, plain BLOB) WITHOUT ROWID;
+        """
+    )
+    expected = _store_meta(sig, index_column)
+    current = dict(conn.execute("SELECT key, value FROM meta"))
+    if any(current.get(k) != v for k, v in expected.items()):
+        with conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM meta")
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", expected.items())
+    _validated_stores[store_path] = (sig, index_column)
+    return conn
+
+
+def _pack(plain_text: Optional[str]) -> Optional[bytes]:
+    return zlib.compress(plain_text.encode("utf-8")) if plain_text else None
+
+
+def _unpack(blob: Optional[bytes]) -> Optional[str]:
+    return zlib.decompress(blob).decode("utf-8") if blob else None
+
+
+def lookup_lexicon(db_path: str, search_term: str, index_column: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    사전에서 키 하나를 찾아 (평문, HTML) 을 반환합니다. 없으면 (None, None)
+    저장소에 있으면 한 번의 키 조회로 끝나고, 없으면 원본 사전에서 디코딩한 뒤 저장합니다.
+    """
+    if not index_column:
+        return None, None
+    sig = file_signature(db_path)
+    if sig is None:
+        return None, None
+    key = search_term.strip()
+
+    try:
+        store = _open_store(db_path, sig, index_column)
+    except sqlite3.Error:
+        store = None
+
+    try:
+        if store is not None:
+            row = store.execute("SELECT plain FROM entries WHERE key=?", (key,)).fetchone()
+            if row is not None:
+                plain_text = _unpack(row[0])
+                return (plain_text, lexicon_html(plain_text)) if plain_text else (None, None)
+
+        try:
+            with pooled_connection(sig[0]) as conn:
+                entry = _fetch_entry_row(conn.cursor(), key, index_column)
+        except sqlite3.Error:
+            return None, None
+        plain_text = None
+        if entry:
+            try:
+                plain_text = decode_lexicon_entry(entry[0], entry[1] if len(entry) > 1 else None)
+            except Exception:
+                plain_text = None
+
+        # 결과 없음도 저장해 두어 같은 키를 다시 디코딩하지 않음
+        if store is not None:
+            try:
+                with store:
+                    store.execute("INSERT OR REPLACE INTO entries (key, plain) VALUES (?, ?)", (key, _pack(plain_text)))
+            except sqlite3.Error:
+                pass
+        return (plain_text, lexicon_html(plain_text)) if plain_text else (None, None)
+    finally:
+        if store is not None:
+            store.close()
+
+
+def _store_entries(store: sqlite3.Connection, entries: List[Tuple[str, Optional[bytes]]]) -> int:
+    """저장소에 항목 추가 (이미 있는 키는 유지). 반환: 새로 저장한 수"""
+    with store:
+        before = store.total_changes
+        store.executemany("INSERT OR IGNORE INTO entries (key, plain) VALUES (?, ?)", entries)
+        return store.total_changes - before
+
+
+def _mark_complete(store: sqlite3.Connection, stats: Dict[str, str]) -> None:
+    with store:
+        store.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [("complete", "1")] + list(stats.items())
+        )
+
+
+def is_lexicon_store_complete(db_path: str, index_column: str) -> bool:
+    """사전 전체 디코딩이 끝난 저장소인지 (사전 파일이 바뀌었으면 False)"""
+    sig = file_signature(db_path)
+    if sig is None or not index_column:
+        return False
+    store = _open_store(db_path, sig, index_column)
+    try:
+        return store.execute("SELECT 1 FROM meta WHERE key='complete'").fetchone() is not None
+    finally:
+        store.close()
+
+
+def build_lexicon_store(
+    db_path: str,
+    index_column: str,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    사전 전체 항목을 디코딩해 저장소를 채웁니다. (이 프로세스에서 순차 처리)
+    같은 키가 여러 항목이면 lookup_lexicon 과 같이 첫 항목을 사용합니다.
+    반환: 새로 저장한 항목 수 (이미 끝난 저장소면 0)
+    """
+    sig = file_signature(db_path)
+    if sig is None or not index_column:
+        return 0
+
+    store = _open_store(db_path, sig, index_column)
+    try:
+        if store.execute("SELECT 1 FROM meta WHERE key='complete'").fetchone():
+            return 0
+        chunks = topic_id_chunks(sig[0])
+        started = time.perf_counter()
+        added = 0
+        for done, (first_id, last_id) in enumerate(chunks, 1):
+            entries, _, _ = decode_lexicon_chunk(sig[0], index_column, first_id, last_id)
+            # 구간을 id 순서대로 저장하므로 INSERT OR IGNORE 로 첫 항목이 남음
+            added += _store_entries(store, entries)
+            if progress_callback:
+                progress_callback(done, len(chunks))
+        _mark_complete(store, {"build_seconds": f"{time.perf_counter() - started:.3f}"})
+        return added
+    finally:
+        store.close()
+
+
+# ========== 여러 사전 일괄 디코딩 (프로세스 풀) ==========
+# 사전마다 topics id 구간으로 작업을 나눠 모든 사전의 구간을 한 풀에 분배합니다.
+# 디코딩은 워커에서, 저장은 이 프로세스에서만 하며(저장소 쓰기 충돌 방지)
+# 같은 키는 첫 항목이 남도록 사전마다 구간 순서대로 저장합니다.
+
+
+class LexiconBuildStats(NamedTuple):
+    path: str
+    index_column: str
+    entries: int  # 저장소 전체 항목 수
+    added: int  # 이번에 새로 저장한 항목 수
+    rows: int  # 읽은 사전 행 수
+    decode_seconds: float  # 워커 디코딩 시간 합계
+    elapsed: float  # 작업 시작부터 이 사전이 끝날 때까지 (초)
+    store_bytes: int
+    skipped: bool  # 이미 완료된 저장소라 건너뜀
+
+
+def _run_chunk_tasks(
+    tasks: List[Tuple[str, str, int, int]], max_workers: int
+) -> Iterator[Tuple[int, Optional[Tuple[List[Tuple[str, Optional[bytes]]], int, float]]]]:
+    """decode_lexicon_chunk 를 끝나는 순서대로 (작업 번호, 결과) 로 반환. 풀을 쓸 수 없으면 순차 처리"""
+    pending = set(range(len(tasks)))
+    if max_workers > 1 and len(tasks) > 1:
+        try:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+                futures = {pool.submit(decode_lexicon_chunk, *tasks[i]): i for i in range(len(tasks))}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        res = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception:
+                        res = None
+                    pending.discard(i)
+                    yield i, res
+        except (BrokenProcessPool, OSError, RuntimeError):
+            pass
+    for i in sorted(pending):
+        try:
+            yield i, decode_lexicon_chunk(*tasks[i])
+        except Exception:
+            yield i, None
+
+
+def prewarm_lexicons(
+    dictionaries: Iterable[str],
+    max_workers: Optional[int] = None,
+    force: bool = False,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+) -> List[LexiconBuildStats]:
+    """
+    여러 사전의 모든 항목을 프로세스 풀로 디코딩해 사전별 저장소를 채웁니다.
+    이미 완료된 저장소는 건너뛰고(force=True 면 비우고 다시), 사전별 통계를 반환합니다.
+    progress_callback(끝난 작업 수, 전체 작업 수, 사전 경로)
+    """
+    started = time.perf_counter()
+    stats: Dict[str, LexiconBuildStats] = {}
+    stores: Dict[str, sqlite3.Connection] = {}
+    chunk_counts: Dict[str, int] = {}
+    tasks: List[Tuple[str, str, int, int]] = []
+    task_chunk_no: List[int] = []  # 작업이 그 사전의 몇 번째 구간인지
+
+    for path in dictionaries:
+        sig = file_signature(path)
+        index_column = detect_index_column(path) if sig else None
+        if sig is None or not index_column:
+            continue
+        path = sig[0]
+        store = _open_store(path, sig, index_column)
+        if force:
+            with store:
+                store.execute("DELETE FROM entries")
+                store.execute("DELETE FROM meta WHERE key='complete' OR key LIKE 'build_%'")
+        if store.execute("SELECT 1 FROM meta WHERE key='complete'").fetchone():
+            entries = store.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            store.close()
+            stats[path] = LexiconBuildStats(
+                path, index_column, entries, 0, 0, 0.0, 0.0, os.path.getsize(lexicon_store_path(path)), True
+            )
+            continue
+        chunks = topic_id_chunks(path)
+        stores[path] = store
+        chunk_counts[path] = len(chunks)
+        stats[path] = LexiconBuildStats(path, index_column, 0, 0, 0, 0.0, 0.0, 0, False)
+        for chunk_no, (first_id, last_id) in enumerate(chunks):
+            tasks.append((path, index_column, first_id, last_id))
+            task_chunk_no.append(chunk_no)
+
+    # 사전별로 구간 순서를 지키기 위한 대기열
+    next_chunk = {path: 0 for path in stores}
+    waiting: Dict[str, Dict[int, Tuple[List[Tuple[str, Optional[bytes]]], int, float]]] = {p: {} for p in stores}
+
+    failed = set()
+
+    def _finish(path: str) -> None:
+        store = stores.pop(path)
+        elapsed = time.perf_counter() - started
+        try:
+            entries = store.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            # 실패한 구간이 있으면 완료 표시를 하지 않아 다음 실행 때 다시 채움
+            if path not in failed:
+                _mark_complete(store, {"build_seconds": f"{elapsed:.3f}", "build_rows": str(stats[path].rows)})
+        finally:
+            store.close()
+        stats[path] = stats[path]._replace(
+            entries=entries, elapsed=elapsed, store_bytes=os.path.getsize(lexicon_store_path(path))
+        )
+
+    try:
+        for path in [p for p, count in chunk_counts.items() if count == 0]:
+            _finish(path)
+
+        workers = max_workers or max(1, os.cpu_count() or 1)
+        for done, (i, result) in enumerate(_run_chunk_tasks(tasks, workers), 1):
+            # 실패한 구간은 빈 결과로 넘기고, 해당 키는 화면 조회 때 다시 디코딩됨
+            path = tasks[i][0]
+            if result is None:
+                failed.add(path)
+            waiting[path][task_chunk_no[i]] = result or ([], 0, 0.0)
+            while next_chunk[path] in waiting[path]:
+                entries, rows, seconds = waiting[path].pop(next_chunk[path])
+                added = _store_entries(stores[path], entries)
+                prev = stats[path]
+                stats[path] = prev._replace(
+                    added=prev.added + added, rows=prev.rows + rows, decode_seconds=prev.decode_seconds + seconds
+                )
+                next_chunk[path] += 1
+            if next_chunk[path] == chunk_counts[path] and path in stores:
+                _finish(path)
+            if progress_callback:
+                progress_callback(done, len(tasks), path)
+    finally:
+        for store in stores.values():
+            store.close()
+    return list(stats.values())
+
+
+# ========== 백그라운드 전체 디코딩 ==========
+
+_build_lock = threading.Lock()
+_build_status: Dict[str, Dict[str, object]] = {}
+
+
+def _background_build(db_path: str, index_column: str) -> None:
+    status = _build_status[db_path]
+
+    def _progress(done: int, total: int) -> None:
+        status.update(done=done, total=total)
+
+    try:
+        build_lexicon_store(db_path, index_column, _progress)
+        status["error"] = None
+    except Exception as e:
+        status["error"] = str(e)
+    finally:
+        status["running"] = False
+
+
+def start_background_lexicon_build(db_path: str, index_column: str) -> bool:
+    """
+    사전 전체 디코딩을 데몬 스레드에서 시작합니다.
+    같은 사전을 이미 처리 중이거나 저장소가 이미 완료되었으면 아무것도 하지 않고 False 를 반환합니다.
+    """
+    status = _build_status.get(db_path)
+    if status and status["running"]:
+        return False
+    try:
+        if is_lexicon_store_complete(db_path, index_column):
+            return False
+    except sqlite3.Error:
+        # 저장소를 열 수 없으면 스레드에서 다시 시도하고 오류를 상태로 남김
+        pass
+    with _build_lock:
+        status = _build_status.get(db_path)
+        if status and status["running"]:
+            return False
+        _build_status[db_path] = {"running": True, "done": 0, "total": 0, "error": None}
+    threading.Thread(target=_background_build, args=(db_path, index_column), daemon=True).start()
+    return True
+
+
+def get_lexicon_build_status(db_path: str) -> Dict[str, object]:
+    """{"running": bool, "done": int, "total": int, "error": str | None} (시작한 적 없으면 running=False)"""
+    return dict(_build_status.get(db_path, {"running": False, "done": 0, "total": 0, "error": None}))
+
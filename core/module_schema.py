@@ -0,0 +1,170 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from core.db_pool import pooled_connection
+
+# ========== 모듈 DB 스키마 탐지 캐시 ==========
+# 스키마가 고정되지 않은 모듈(commentaries.sqlite3, 일반 .sqlite3/.sqlite 주석/성경)은
+# 예전에는 조회할 때마다 sqlite_master / PRAGMA table_info 를 다시 실행했습니다.
+# 이제 파일마다 한 번만 탐지해 (테이블, 컬럼 매핑, 조회 SQL) 을 기록하고,
+# 파일의 (mtime, size) 가 바뀌었을 때만 다시 탐지합니다.
+#
+# 주석 조회 SQL 은 모두 같은 규격을 따릅니다.
+#   파라미터: (book_id, chap, 마지막 절, 첫 절)
+#   결과 행 : (시작 절, 끝 절, 본문)
+# 성경 조회 SQL 은 장 전체를 읽습니다. (core.chapter_cache)
+#   파라미터: (book_id, chap) / 결과 행: (절, 본문)
+
+
+class ModuleSchema(NamedTuple):
+    loader: str  # "commentaries_sqlite" | "generic_commentary" | "bible_sqlite"
+    table: str
+    columns: Dict[str, str]  # 역할 -> 실제 컬럼명 (book, chapter, verse_from, verse_to, text ...)
+    sql: str
+
+
+_GENERIC_COMMENTARY_TABLES = [
+    "commentaries",
+    "commentary",
+    "texts",
+    "words",
+    "notes",
+    "content",
+    "bible",
+    "verses",
+    "scripture",
+]
+_BIBLE_TABLES = ["verses", "bible", "scripture", "texts"]
+
+_schema_cache: Dict[Tuple[str, str], Tuple[Tuple[int, int], Optional[ModuleSchema]]] = {}
+_schema_lock = threading.Lock()
+
+
+def _pick(columns: List[str], candidates: List[str]) -> Optional[str]:
+    return next((col for col in columns if col in candidates), None)
+
+
+def _list_tables(cur: sqlite3.Cursor) -> List[str]:
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table';")
+    return [row[0].lower() for row in cur.fetchall()]
+
+
+def _table_columns(cur: sqlite3.Cursor, table: str) -> List[str]:
+    cur.execute(f"PRAGMA table_info({table});")
+    return [col[1].lower() for col in cur.fetchall()]
+
+
+def _probe_commentaries_sqlite(cur: sqlite3.Cursor) -> Optional[ModuleSchema]:
+    """commentaries.sqlite3 (MyBible 주석 스키마) - 컬럼명 변형만 추론"""
+    cols = _table_columns(cur, "commentaries")
+    if not cols:
+        return None
+    c_from = "chapter_number_from" if "chapter_number_from" in cols else "chapter_number"
+    c_to = "chapter_number_to" if "chapter_number_to" in cols else c_from
+    v_from = "verse_number_from" if "verse_number_from" in cols else "verse_number"
+    v_to = "verse_number_to" if "verse_number_to" in cols else v_from
+    sql = f"""
+        SELECT {v_from}, {v_to}, text FROM commentaries
+        WHERE book_number = ?
+        AND ? BETWEEN {c_from} AND {c_to}
+        AND {v_from} <= ? AND {v_to} >= ?
+    """
+    columns = {"chapter_from": c_from, "chapter_to": c_to, "verse_from": v_from, "verse_to": v_to, "text": "text"}
+    return ModuleSchema("commentaries_sqlite", "commentaries", columns, sql)
+
+
+def _probe_generic_commentary(cur: sqlite3.Cursor) -> Optional[ModuleSchema]:
+    """일반 sqlite 주석 - 테이블/컬럼명 추론"""
+    all_tables = _list_tables(cur)
+    target_table = next((t for t in _GENERIC_COMMENTARY_TABLES if t in all_tables), None)
+    if not target_table:
+        return None
+
+    all_columns = _table_columns(cur, target_table)
+    book_col = _pick(all_columns, ["book_number", "book", "book_id", "bk", "b"])
+    chapter_col = _pick(all_columns, ["chapter_number", "chapter", "ch", "c"])
+    verse_start_col = _pick(all_columns, ["verse_start", "verse", "vs", "v", "verse_number", "verse_num"])
+    verse_end_col = _pick(all_columns, ["verse_end", "to_verse", "toverse", "end_verse", "verse_to"])
+    text_col = _pick(
+        all_columns, ["commentary", "text", "data", "content", "body", "notes", "comments", "content_text"]
+    )
+    if not (book_col and chapter_col and verse_start_col and text_col):
+        return None
+
+    # 끝 절 컬럼이 없으면 시작 절을 끝 절로 사용 (단일 절 주석)
+    verse_to_col = verse_end_col or verse_start_col
+    sql = f"""
+        SELECT CAST({verse_start_col} AS INTEGER), CAST({verse_to_col} AS INTEGER), {text_col}
+        FROM {target_table}
+        WHERE CAST({book_col} AS INTEGER)=?
+          AND CAST({chapter_col} AS INTEGER)=?
+          AND CAST({verse_start_col} AS INTEGER) <= ?
+          AND CAST({verse_to_col} AS INTEGER) >= ?
+    """
+    columns = {
+        "book": book_col,
+        "chapter": chapter_col,
+        "verse_from": verse_start_col,
+        "verse_to": verse_to_col,
+        "text": text_col,
+    }
+    return ModuleSchema("generic_commentary", target_table, columns, sql)
+
+
+def _probe_bible_sqlite(cur: sqlite3.Cursor) -> Optional[ModuleSchema]:
+    """일반 sqlite 성경 모듈 - 테이블/컬럼명 추론"""
+    tables = _list_tables(cur)
+    target_table = next((t for t in _BIBLE_TABLES if t in tables), None)
+    if not target_table:
+        return None
+
+    columns = _table_columns(cur, target_table)
+    book_col = _pick(columns, ["book", "book_id", "book_number"])
+    chap_col = _pick(columns, ["chapter", "ch"])
+    verse_col = _pick(columns, ["verse", "vs", "v"])
+    text_col = _pick(columns, ["text", "content", "btext", "data"])
+    if not (book_col and chap_col and verse_col and text_col):
+        return None
+
+    sql = f"SELECT {verse_col}, {text_col} FROM {target_table} WHERE {book_col}=? AND {chap_col}=?"
+    mapping = {"book": book_col, "chapter": chap_col, "verse": verse_col, "text": text_col}
+    return ModuleSchema("bible_sqlite", target_table, mapping, sql)
+
+
+_PROBES = {
+    "commentaries_sqlite": _probe_commentaries_sqlite,
+    "generic_commentary": _probe_generic_commentary,
+    "bible_sqlite": _probe_bible_sqlite,
+}
+
+
+def get_module_schema(path: str, loader: str) -> Optional[ModuleSchema]:
+    """
+    모듈 파일의 스키마 탐지 결과를 반환합니다. (파일당 1회, 파일이 바뀌면 재탐지)
+    loader: "commentaries_sqlite" | "generic_commentary" | "bible_sqlite"
+    인식할 수 없는 스키마는 None (이 결과도 캐시됩니다).
+    """
+    key = (os.path.abspath(path), loader)
+    try:
+        st_info = os.stat(key[0])
+    except OSError:
+        return None
+    sig = (st_info.st_mtime_ns, st_info.st_size)
+
+    with _schema_lock:
+        cached = _schema_cache.get(key)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+
+    schema: Optional[ModuleSchema] = None
+    try:
+        with pooled_connection(key[0]) as conn:
+            schema = _PROBES[loader](conn.cursor())
+    except sqlite3.Error:
+        schema = None
+
+    with _schema_lock:
+        _schema_cache[key] = (sig, schema)
+    return schema
@@ -0,0 +1,100 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from core.bible_utils import get_ultimate_bible_map
+from core.file_reader import read_file
+from core.search_engine import search_document
+
+# ========== 전수 조사 병렬 처리 ==========
+# PDF/EPUB 파싱과 태그 매칭은 CPU 작업이므로 파일 단위로 프로세스 풀에 분배합니다.
+# - 워커는 core 모듈만 import 합니다. (main.py 는 Streamlit 화면 코드라 import 불가)
+# - 추출 결과는 core.file_reader 의 영구 캐시에 함께 저장됩니다.
+# - Windows 와 동일하게 동작하도록 spawn 방식을 사용합니다.
+
+# 파일 수가 적으면 워커 기동 비용이 더 크므로 순차 처리합니다.
+MIN_FILES_FOR_POOL = 8
+
+_worker_maps = None
+
+
+def _get_bible_maps():
+    """워커 프로세스마다 성경 약어 매핑을 한 번만 생성합니다."""
+    global _worker_maps
+    if _worker_maps is None:
+        _worker_maps = get_ultimate_bible_map()
+    return _worker_maps
+
+
+def scan_one_file(path: str, user_book: str, chap: str, verse_input: str) -> str:
+    """파일 하나를 읽어 search_document 결과 문자열을 반환합니다."""
+    alias_flat, raw_map = _get_bible_maps()
+    text = read_file(path)
+    if not text:
+        return ""
+    return search_document(text, user_book, chap, verse_input, alias_flat, raw_map)
+
+
+def default_worker_count() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def map_files_parallel(
+    func: Callable[..., Any],
+    files: List[str],
+    *args: Any,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[int, str, Any]]:
+    """
+    func(path, *args) 를 파일마다 병렬 실행하고, 끝나는 순서대로 (원래 인덱스, 경로, 결과) 를 yield 합니다.
+    func 는 워커에서 import 가능한 core 모듈의 최상위 함수여야 합니다.
+
+    호출 측은 yield 될 때마다 진행률/결과를 갱신할 수 있고,
+    원래 순서가 필요하면 인덱스로 다시 정렬하면 됩니다.
+    프로세스 풀을 쓸 수 없는 환경에서는 남은 파일을 순차 처리로 이어갑니다.
+    실패한 파일의 결과는 None 입니다.
+    """
+    workers = max_workers or default_worker_count()
+    pending = set(range(len(files)))
+
+    if workers > 1 and len(files) >= MIN_FILES_FOR_POOL:
+        try:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                futures = {pool.submit(func, files[i], *args): i for i in range(len(files))}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        res = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception:
+                        res = None
+                    pending.discard(i)
+                    yield i, files[i], res
+        except (BrokenProcessPool, OSError, RuntimeError):
+            # 풀이 깨졌거나 생성할 수 없으면 아래 순차 처리로 이어서 진행
+            pass
+
+    for i in sorted(pending):
+        try:
+            res = func(files[i], *args)
+        except Exception:
+            res = None
+        yield i, files[i], res
+
+
+def scan_files_parallel(
+    files: List[str],
+    user_book: str,
+    chap: str,
+    verse_input: str,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[int, str, str]]:
+    """파일 목록을 병렬로 전수 조사합니다. (결과는 search_document 문자열)"""
+    for i, path, res in map_files_parallel(
+        scan_one_file, files, user_book, chap, verse_input, max_workers=max_workers
+    ):
+        yield i, path, res or ""
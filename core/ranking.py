@@ -0,0 +1,58 @@
+import math
+from typing import Dict, Iterable, NamedTuple, Optional
+
+# ========== 검색 결과 순위 (BM25F) ==========
+# 문서 본문을 다시 읽지 않고, 역색인에 저장된 값만으로 점수를 계산합니다.
+#   - 검색어 빈도(tf): 색인의 위치 목록 길이
+#   - 문서 길이: 색인 시 저장한 정규화 문서 길이
+#   - 문서 빈도(df), 문서 수, 평균 길이: 서재 전체 기준 (어느 폴더를 골랐든 순위가 같도록)
+# 필드는 본문과 제목(파일 이름) 두 가지이며, 제목에 나온 검색어에 가중치를 줍니다.
+# 긴 문서가 검색어를 많이 포함한다는 이유만으로 앞서지 않도록 길이 정규화(b)를 적용합니다.
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 3.0
+
+
+class CorpusStats(NamedTuple):
+    doc_count: int
+    avg_length: float
+    doc_freq: Dict[str, int]  # 검색어 -> 검색어가 들어 있는 문서 수
+
+
+def bm25_idf(doc_count: int, doc_freq: int) -> float:
+    """BM25 역문서빈도 (항상 0 이상이 되도록 1 을 더한 형태)"""
+    return math.log(1.0 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def bm25f_score(
+    terms: Iterable[str],
+    body_tf: Dict[str, int],
+    doc_length: int,
+    stats: CorpusStats,
+    title_tf: Optional[Dict[str, int]] = None,
+    k1: float = BM25_K1,
+    b: float = BM25_B,
+    title_weight: float = TITLE_WEIGHT,
+) -> float:
+    """
+    BM25F 점수. 필드별 빈도를 길이 정규화/가중치로 합친 뒤 검색어마다 포화 함수를 적용합니다.
+    제목 필드는 짧으므로 길이 정규화 없이 가중치만 곱합니다.
+    """
+    title_tf = title_tf or {}
+    avg_length = stats.avg_length or 1.0
+    length_norm = 1.0 - b + b * (doc_length / avg_length)
+
+    score = 0.0
+    for term in dict.fromkeys(terms):
+        tf = body_tf.get(term, 0) / length_norm + title_weight * title_tf.get(term, 0)
+        if tf <= 0:
+            continue
+        df = stats.doc_freq.get(term, 0)
+        score += bm25_idf(stats.doc_count, df) * tf * (k1 + 1.0) / (tf + k1)
+    return score
+
+
+def display_score(score: float) -> int:
+    """화면 표시용 점수 (주석 전문 색인의 bm25 점수와 같은 배율)"""
+    return int(round(score * 10))
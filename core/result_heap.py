@@ -0,0 +1,39 @@
+import heapq
+from itertools import count
+from typing import Any, Generic, List, Tuple, TypeVar
+
+# ========== 검색 결과 상위 k개 유지 ==========
+# 결과 전체를 리스트로 모아 정렬하는 대신, 점수 상위 k개만 최소 힙에 남깁니다.
+# 점수가 같으면 먼저 들어온 항목이 앞섭니다. (list.sort(reverse=True) 와 같은 순서)
+
+T = TypeVar("T")
+
+
+class TopK(Generic[T]):
+    """점수 상위 k개 항목만 보관하는 최소 힙"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._seq = count()
+
+    def push(self, score: float, item: T) -> bool:
+        """항목 추가. 상위 k개에 들지 못해 버려지면 False"""
+        if self.k <= 0:
+            return False
+        # 동점이면 나중에 들어온 항목이 먼저 밀려나도록 순번을 음수로 저장
+        entry = (score, -next(self._seq), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def items(self) -> List[T]:
+        """점수 내림차순 (동점은 입력 순서) 으로 정렬된 항목"""
+        return [item for _, _, item in sorted(self._heap, key=lambda e: (-e[0], -e[1]))]
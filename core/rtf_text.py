@@ -0,0 +1,76 @@
+import re
+
+# ========== RTF/HTML 평문 변환 (단일 패스) ==========
+# 주석/사전 모듈의 모든 행에 대해 호출되므로, 예전처럼 정규식 4~5 회 + replace 를
+# 차례로 돌리지 않고 미리 컴파일한 토큰 정규식 한 번으로 처리합니다.
+#   \uN?        → 유니코드 문자 (N 은 10진수, 뒤의 대체 문자 '?' 는 버림)
+#   {\ ... }    → RTF 제어 블록 (글꼴/색상표 등) 제거
+#   \word[N]    → RTF 제어어 제거 (구분 공백 1칸 포함)
+#   <...>       → HTML 태그 제거
+#   { }         → 남은 중괄호 제거
+# 토큰 사이의 본문은 그대로 두고, 마지막에 연속 공백을 한 칸으로 합칩니다.
+#
+# 정규식 split 은 토큰 자리에 \uN 의 코드값(다른 토큰이면 None)을 끼워 돌려주므로,
+# 토큰마다 파이썬 콜백을 부르지 않고 목록 한 번 치환 + join 으로 결과를 만듭니다.
+#
+# 기존 함수와 결과가 같도록 두 가지 패턴을 둡니다. (규칙 차이는 줄바꿈 처리뿐)
+#   - decode_rtf      : 제어 블록/HTML 태그가 한 줄 안에서만 인식됨
+#   - clean_rtf_html  : 제어 블록/HTML 태그가 여러 줄에 걸쳐도 인식, 제어어 뒤 구분 문자로 줄바꿈도 허용
+#                       예전에 제어 블록을 먼저 지운 뒤 제어어를 찾았으므로 (블록 앞뒤가 이어져 제어어가 됨)
+#                       제어 블록만 먼저 한 번 지우고 나머지를 토큰 정규식으로 처리합니다.
+# 음수 \u 값은 예전과 같이 제어어로 지워지고 대체 문자 '?' 만 남습니다.
+# 단, clean_rtf_html 규칙에서 HTML 태그 안에 제어어/중괄호가 있으면 결과가 다릅니다.
+#   예전에는 제어어와 중괄호를 모두 지운 뒤 태그를 찾아, 안이 비게 된 태그를 "<>" 로 남겼지만
+#   (예: "말씀<\b >" → "말씀<>", "b{가{><}\par >" → "b가><>")
+#   여기서는 한 번에 처리하므로 그런 태그도 지웁니다. ("말씀", "b가>")
+# 또 제어어 바로 뒤의 \uN 이 공백 문자(예: \u12)이면 예전에는 제어어 구분 문자로 함께 지워졌지만
+# 여기서는 공백 한 칸으로 남습니다.
+
+# 첫 글자(\, {, <, })로 갈래를 나눠 위치마다 시도하는 대안 수를 줄입니다.
+# {\uN? ...} 은 예전에 \uN 을 먼저 문자로 바꾼 뒤라 제어 블록으로 보지 않았으므로 제외합니다.
+_LINE_TOKEN = re.compile(
+    r"\\(?:u(\d+)\??|[a-z]{1,10}(?:-?\d+)? ?)"
+    r"|\{(?:\\(?!u\d)[^}\n]*\})?"
+    r"|<[^>\n]*>"
+    r"|\}"
+)
+_MULTILINE_BLOCK = re.compile(r"\{\\(?!u\d)[^}]*\}")
+_MULTILINE_TOKEN = re.compile(
+    r"\\(?:u(\d+)\??|[a-z]{1,10}(?:-?\d+)?\s?)"
+    r"|<[^>]+>"
+    r"|[{}]"
+)
+_MARKUP_CHARS = ("\\", "<", "{", "}")
+
+
+def _replace_token(m: "re.Match") -> str:
+    """느린 경로: 문자로 바꿀 수 없는 \\uN 이 있을 때 토큰별로 처리"""
+    code = m.group(1)
+    if code is None:
+        return ""
+    value = int(code)
+    if value <= 0x10FFFF:
+        return chr(value)
+    # 제어어처럼 지우고 대체 문자만 남김 (예전 동작)
+    return "?" if m.group(0).endswith("?") else ""
+
+
+def strip_rtf_html(text: str, multiline: bool = False) -> str:
+    """
+    RTF 제어어/블록, \\uN? 이스케이프, HTML 태그를 한 번에 처리해 평문으로 반환
+    multiline=True 이면 여러 줄에 걸친 제어 블록/태그도 제거합니다.
+    (clean_rtf_html 규칙. 예전 결과와 다른 경우는 파일 머리 주석 참고)
+    """
+    if not text:
+        return ""
+    if any(ch in text for ch in _MARKUP_CHARS):
+        if multiline and "{\\" in text:
+            text = _MULTILINE_BLOCK.sub("", text)
+        pattern = _MULTILINE_TOKEN if multiline else _LINE_TOKEN
+        parts = pattern.split(text)
+        try:
+            parts[1::2] = [chr(int(code)) if code else "" for code in parts[1::2]]
+            text = "".join(parts)
+        except (ValueError, OverflowError):
+            text = pattern.sub(_replace_token, text)
+    return " ".join(text.split())
@@ -1,9 +1,29 @@
 import re
 import os
-import sqlite3
-from typing import Dict, List, Optional, Tuple
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import streamlit as st
 
+from core.bible_refs import get_reference_recognizer
+from core.chapter_cache import get_bible_chapter
+from core.verse_keys import book_id, clamp_verses
+
+
+_BOOK_TOKEN_RE = re.compile(r"^([가-힣a-zA-Z0-9]+)")
+
+
+def resolve_book(user_book: str, bible_alias_flat: Dict[str, str]) -> Optional[str]:
+    """
+    입력한 책 이름을 표준 책 코드로 변환합니다. (실패 시 None)
+    첫 단어가 별칭과 정확히 같으면 그대로 쓰고, 아니면 참조 인식기로
+    맨 앞의 책 이름을 찾습니다. (예: "롬8:28", "1 Cor")
+    """
+    normalized_book = user_book.strip()
+    book_match = _BOOK_TOKEN_RE.match(normalized_book)
+    book_part = book_match.group(1) if book_match else normalized_book
+    return bible_alias_flat.get(book_part.lower()) or get_reference_recognizer().leading_book(normalized_book)
+
 
 def parse_reference(
     user_book: str,
@@ -21,22 +41,19 @@ def parse_reference(
         - "chapter_intro": verse_input == "0" and chap != "0"
         - "verse"        : 그 외 (일반 절 검색)
     """
-    normalized_book = user_book.strip()
-    book_match = re.match(r"^([가 - 힣 a-zA-Z0-9]+)", normalized_book)
-    if book_match:
-        book_part = book_match.group(1)
-        std = bible_alias_flat.get(book_part.lower())
-    else:
-        std = bible_alias_flat.get(normalized_book.lower())
-
+    std = resolve_book(user_book, bible_alias_flat)
     if not std:
         return None
 
-    # 절 범위 파싱 (예: "26-27")
+    # 절 범위 파싱 (예: "26-27"). 장의 절 수를 넘는 끝 절은 잘라냄 (예: "1-999")
     if "-" in verse_input:
         try:
             start, end = map(int, verse_input.split("-"))
-            verses = [str(v) for v in range(start, end + 1)]
+            numbers = range(start, end + 1)
+            book_num = book_id(std)
+            if book_num and chap.isdigit():
+                numbers = clamp_verses(book_num, int(chap), numbers) or numbers
+            verses = [str(v) for v in numbers]
         except Exception:
             verses = [verse_input]
     else:
@@ -54,42 +71,189 @@ def parse_reference(
 
 # ========== [개선된] 로고스 태그 인덱싱 캐시 기능 ==========
 # 핵심 개선:
-# 1. 유연한 패턴: (?i)@bible:([a-zA-Z 가 - 힣 0-9]+) 로 대소문자/한글 약어 모두 추출
+# 1. 유연한 패턴: @bible:책 장:절 을 대소문자/한글 약어 모두 추출
 # 2. 표준화: 추출된 raw_book 을 bible_alias_flat 으로 표준 코드 변환
 # 3. 통합 캐시: 표준 코드를 키로 사용하여 다양한 약어를 하나의 표준에 통합
+# 4. 책 이름은 숫자로 끝나지 않도록 제한 (예전 패턴은 "Joh 16:3" 을 "Joh 1" 6:3 으로 잘못 해석)
+# 5. 앞뒤 [[ ]] 괄호까지 태그 범위에 포함하여 본문에 괄호가 섞이지 않도록 함
+
+# 로고스 태그 토크나이저: 문서의 모든 @Bible: 표지를 한 번만 찾습니다. (import 시 컴파일)
+#   [[@Bible:Joh 6:26]]  - 절 표지
+#   [[@Bible:Joh 6]]     - 장 표지 (절 없음)
+#   @Bible:Joh 0:0 / 0:00 / 0 0 - 책 서론 표지
+LOGOS_MARKER_RE = re.compile(
+    r"(\[\[\s*)?@bible:\s*((?:[1-3]\s?)?[a-z가-힣]+)\s*(\d+)"
+    r"(?:\s*:\s*(\d+)|(?<=\b0)\s+(0)\b)?(\s*\]\])?",
+    re.IGNORECASE,
+)
+# 교차 참조 표기 ("... 0:0]] >> Joh 0:0]]") 는 서론 시작으로 보지 않습니다.
+_CROSSREF_FOLLOW_RE = re.compile(r"\s*>>")
+# 장 표지 서론의 끝: @Bible: 없이 "책 장:절]]" 로 끝나는 참조
+_BARE_REF_END_RE = re.compile(r"(?:(?:[1-3]\s?)?[A-Za-z가-힣]+\s*)?\d+:\d+\s*\]\]")
+
+
+class LogosMarker(NamedTuple):
+    start: int
+    end: int
+    book: str  # 표준 책 코드 (매핑에 없으면 원문)
+    chapter: int
+    verse: Optional[int]  # 장 표지는 None
+    bracketed: bool  # [[ 로 시작
+    closed: bool  # ]] 로 끝남
+    crossref: bool  # 뒤에 >> 교차 참조가 이어짐
+    verse_text: str  # 절 표기 그대로 ("16", "0", "00", 서론 표기 "0 0". 장 표지는 "")
+
+    @property
+    def colon_verse(self) -> bool:
+        """"장:절" 로 표기된 절 표지 ("0 0" 서론 표기와 장 표지는 아님)"""
+        return self.verse is not None and self.verse_text != "0 0"
+
+    @property
+    def chapter_zero(self) -> bool:
+        """N:0 장 서론 표지 ("0:00", "0 0" 은 아님)"""
+        return self.verse_text == "0"
+
+
+def normalize_tag_book(raw_book: str, bible_alias_flat: Dict[str, str]) -> str:
+    """태그의 책 이름을 표준 코드로 변환 (매핑에 없으면 원문 그대로 반환)"""
+    raw_book = raw_book.strip()
+    key = raw_book.replace(" ", "").lower()
+    return bible_alias_flat.get(key) or bible_alias_flat.get(raw_book.lower(), raw_book)
+
+
+def scan_logos_markers(text: str, bible_alias_flat: Dict[str, str]) -> List[LogosMarker]:
+    """문서 전체의 @Bible: 표지를 위치 순서대로 한 번 스캔합니다. (캐시 없음)"""
+    markers: List[LogosMarker] = []
+    for m in LOGOS_MARKER_RE.finditer(text):
+        verse = m.group(4) if m.group(4) is not None else m.group(5)
+        verse_text = m.group(4) if m.group(4) is not None else ("0 0" if m.group(5) is not None else "")
+        markers.append(
+            LogosMarker(
+                m.start(),
+                m.end(),
+                normalize_tag_book(m.group(2), bible_alias_flat),
+                int(m.group(3)),
+                int(verse) if verse is not None else None,
+                m.group(1) is not None,
+                m.group(6) is not None,
+                _CROSSREF_FOLLOW_RE.match(text, m.end()) is not None,
+                verse_text,
+            )
+        )
+    return markers
+
 
 @st.cache_data(show_spinner=False)
-def build_logos_tag_index(text: str, bible_alias_flat: Dict[str, str]) -> Dict[str, List[Tuple[int, int, str, str]]]:
+def build_logos_marker_list(text: str, bible_alias_flat: Dict[str, str]) -> List[LogosMarker]:
+    """scan_logos_markers 의 캐시 버전 (fetch_intro 와 절 인덱스가 공유)"""
+    return scan_logos_markers(text, bible_alias_flat)
+
+
+def scan_logos_verse_tags(text: str, bible_alias_flat: Dict[str, str]) -> List[Tuple[int, int, str, int, int]]:
     """
-    로고스 바이블 태그 전체를 한 번만 스캔하여 인덱스를 생성합니다.
+    문서 전체의 로고스 절 태그를 위치 순서대로 한 번 스캔합니다. (캐시 없음)
+    반환: [(태그 시작, 태그 끝, 표준 책 코드, 장, 절), ...]
+    """
+    return [
+        (m.start, m.end, m.book, m.chapter, m.verse)
+        for m in scan_logos_markers(text, bible_alias_flat)
+        if m.verse is not None
+    ]
 
-    개선된 점:
-    - 엄격한 매칭 대신 유연한 패턴 사용: (?i)@bible:([a-zA-Z 가 - 힣 0-9]+)
-    - 추출된 약어를 bible_alias_flat 으로 표준화
-    - 반환: {standard_book_code: [(start_pos, end_pos, chapter, verse), ...]}
+
+class BookTagIndex:
     """
-    index: Dict[str, List[Tuple[int, int, str, str]]] = {}
+    책 하나의 절 태그를 (장, 절, 위치) 순으로 정렬해 array 로 보관하는 인덱스입니다.
 
-    # 개선된 패턴: 대소문자 구분 없이 @bible: 다음에 오는 책 이름 추출 (한글/영문 모두 지원)
-    verse_pattern = r"(?i)@bible:([a-zA-Z가 - 힣 0-9]+)\s*(\d+):(\d+)"
+    - positions: (장, 절) -> 정렬 배열 안의 [lo, hi) 구간
+    - 같은 (장, 절) 태그가 여러 번 나오면 구간 안에서 위치(start) 순으로 정렬되어 있어
+      bisect 로 "특정 위치 이후의 첫 태그" 를 O(log n) 에 찾습니다.
+    """
 
-    for match in re.finditer(verse_pattern, text, re.IGNORECASE):
-        raw_book = match.group(1).strip()
-        chap = match.group(2)
-        verse = match.group(3)
+    __slots__ = ("starts", "ends", "positions")
+
+    def __init__(self, entries: List[Tuple[int, int, int, int]]):
+        # entries: [(장, 절, 태그 시작, 태그 끝), ...]
+        entries = sorted(entries)
+        self.starts = array("q", (e[2] for e in entries))
+        self.ends = array("q", (e[3] for e in entries))
+        self.positions: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        for i, (chap, verse, _, _) in enumerate(entries):
+            lo, _hi = self.positions.get((chap, verse), (i, i))
+            self.positions[(chap, verse)] = (lo, i + 1)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def find(self, chap: int, verse: int) -> Optional[Tuple[int, int]]:
+        """(장, 절) 의 첫 번째 태그 (start, end) 반환"""
+        span = self.positions.get((chap, verse))
+        if span is None:
+            return None
+        lo = span[0]
+        return self.starts[lo], self.ends[lo]
+
+    def first_start_after(self, chap: int, verse: int, pos: int) -> Optional[int]:
+        """(장, 절) 태그 중 pos 보다 뒤에 있는 첫 태그의 시작 위치"""
+        span = self.positions.get((chap, verse))
+        if span is None:
+            return None
+        i = bisect_right(self.starts, pos, span[0], span[1])
+        return self.starts[i] if i < span[1] else None
 
-        # 핵심: 추출된 약어를 표준 코드로 변환
-        std_book = bible_alias_flat.get(raw_book.lower(), raw_book)
 
-        # 표준 코드를 키로 사용 (다양한 약어가 하나의 표준에 통합됨)
-        key = std_book
+@st.cache_data(show_spinner=False)
+def build_logos_tag_index(text: str, bible_alias_flat: Dict[str, str]) -> Dict[str, BookTagIndex]:
+    """
+    로고스 바이블 태그 전체를 한 번만 스캔하여 인덱스를 생성합니다.
 
-        if key not in index:
-            index[key] = []
+    개선된 점:
+    - fetch_intro 와 같은 표지 토큰 목록 (build_logos_marker_list) 을 공유
+    - 추출된 약어를 bible_alias_flat 으로 표준화
+    - 반환: {standard_book_code: BookTagIndex}
+    """
+    entries: Dict[str, List[Tuple[int, int, int, int]]] = {}
 
-        index[key].append((match.start(), match.end(), chap, verse))
+    for m in build_logos_marker_list(text, bible_alias_flat):
+        if m.verse is None:
+            continue
+        # 표준 코드를 키로 사용 (다양한 약어가 하나의 표준에 통합됨)
+        entries.setdefault(m.book, []).append((m.chapter, m.verse, m.start, m.end))
+
+    return {book: BookTagIndex(items) for book, items in entries.items()}
+
+
+def _next_marker_start(
+    markers: List[LogosMarker],
+    i: int,
+    text_len: int,
+    closed_verse_only: bool = False,
+    bracketed_only: bool = False,
+) -> int:
+    """markers[i] 다음에 오는 (조건에 맞는) 표지의 시작 위치, 없으면 문서 끝"""
+    for j in range(i + 1, len(markers)):
+        m = markers[j]
+        if closed_verse_only and not (m.colon_verse and m.closed):
+            continue
+        if bracketed_only and not m.bracketed:
+            continue
+        return m.start
+    return text_len
 
-    return index
+
+def _content_before(text: str, markers: List[LogosMarker], i: int) -> str:
+    """
+    markers[i] 바로 앞의 서론 본문을 반환합니다.
+    앞에 닫힌 절 표지가 있으면 그 표지 뒤부터, 없으면 문서 처음부터 잘라냅니다.
+    """
+    target = markers[i]
+    for j in range(i - 1, -1, -1):
+        prev = markers[j]
+        if prev.colon_verse and prev.closed:
+            # 구간은 다음 절 표지(장 표지는 무시) 또는 대상 표지에서 끝납니다.
+            end = next((m.start for m in markers[j + 1 : i] if m.colon_verse), target.start)
+            return text[prev.end : end].strip()
+    return text[: target.start].strip()
 
 
 def fetch_intro(
@@ -102,171 +266,91 @@ def fetch_intro(
 ) -> Dict[str, str]:
     """
     책 서론 / 장 서론을 추출하는 로직을 담당합니다.
-    기존 search_engine 내부의 서론 관련 정규식 로직을 그대로 이동했습니다.
-    """
-    results_dict: Dict[str, str] = {}
 
-    # 책 서론 패턴
-    book_intro_patterns = [
-        r"(?:\[\[\s*@Bible:)([A-Za-z 가 - 힣\d]+)\s+(\d+)(?:\s*\]\])(.*?)(?=\[\[\s*@Bible:|[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)",
-        r"(?:\[\[@Bible:)([A-Za-z 가 - 힣\d]+)\s+(\d+)(?:\]\])(.*?)(?=\[\[@Bible:|[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)",
-        r"(?:\[\[\s*@Bible:)([A-Za-z 가 - 힣\d]+)\s+(\d+)(?:\s*\]\])(.*?)(?=\[\[\s*@Bible:|[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)",
-        r"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)([A-Za-z 가 - 힣\d]+)\s*0:0(?!\s*\]\]\s*>>\s*\1\s*0:0\s*\]\])(?:\s*\]\]|\]\]|:\d+|\b)(.*?)(?=(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)",
-        r"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)([A-Za-z 가 - 힣\d]+)\s*0:00(?!\s*\]\]\s*>>\s*\1\s*0:00\s*\]\])(?:\s*\]\]|\]\]|:\d+|\b)(.*?)(?=(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)",
-        r"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)([A-Za-z 가 - 힣\d]+)\s*0\s+0(?!\s*\]\]\s*>>\s*\1\s*0\s+0\s*\]\])(?:\s*\]\]|\]\]|:\d+|\b)(.*?)(?=(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)",
-    ]
+    [개선된 점]
+    - 문서마다 여러 개의 정규식을 DOTALL 로 반복 실행하던 방식 대신,
+      @Bible: 표지를 한 번만 토큰화 (build_logos_marker_list) 하고
+      표지 위치만으로 책 서론 / 장 서론 / 0:0 구간을 계산합니다.
+    - 모든 패턴은 import 시점에 한 번 컴파일됩니다.
+    """
+    markers = build_logos_marker_list(text, bible_alias_flat)
+    if not markers:
+        return {}
+
+    text_len = len(text)
+    chap_num = int(chap) if chap.isdigit() else None
+
+    # 결과 순서: 장 표지 서론 -> 0:0 책 서론 -> N:0 장 서론 -> 1:1 앞 서론
+    chapter_marker_results: Dict[str, str] = {}
+    chapter_zero_results: Dict[str, str] = {}
+
+    def add(target: Dict[str, str], key: str, content: str) -> None:
+        content = content.strip()
+        if content and key not in target:
+            target[key] = content
+
+    # 0:0 / N:0 서론 구간은 다음 닫힌 절 표지까지이고, 그 안에 있는 같은 표기의 표지는
+    # (책과 상관없이) 앞 구간에 포함된 본문으로 봅니다. (서론 구간이 겹치지 않음)
+    # 책 서론은 표기별로 "0:0" -> "0:00" -> "0 0" 순서로 우선합니다.
+    book_zero_results_by_form: Dict[str, Dict[str, str]] = {"0": {}, "00": {}, "0 0": {}}
+    book_zero_until: Dict[str, int] = {}
+    chapter_zero_until = -1
+
+    for i, m in enumerate(markers):
+        # verse_input != "0" 인 경우, 책/장 서론 표지 수집
+        if verse_input != "0":
+            # [[@Bible:책 N]] 형태의 장 표지: 다음 [[@Bible: 표지 또는 "책 장:절]]" 까지
+            if m.verse is None and m.bracketed and m.closed:
+                if m.book == std:
+                    end = _next_marker_start(markers, i, text_len, bracketed_only=True)
+                    bare = _BARE_REF_END_RE.search(text, m.end, end)
+                    if bare:
+                        end = bare.start()
+                    add(chapter_marker_results, f"#### [{std} {m.chapter} (장 서론)]", text[m.end : end])
+            # @Bible:책 0:0 형태의 책 서론 표지
+            elif m.chapter == 0 and m.verse_text in book_zero_results_by_form and not m.crossref:
+                if m.start >= book_zero_until.get(m.verse_text, -1):
+                    end = _next_marker_start(markers, i, text_len, closed_verse_only=True)
+                    book_zero_until[m.verse_text] = end
+                    if m.book == std:
+                        add(book_zero_results_by_form[m.verse_text], f"#### [{std} 0:0 (서론)]", text[m.end : end])
+
+        # @Bible:책 N:0 형태의 장 서론 표지
+        if m.chapter_zero and not m.crossref and m.start >= chapter_zero_until:
+            chapter_zero_until = _next_marker_start(markers, i, text_len, closed_verse_only=True)
+            if m.book == std and m.chapter == chap_num:
+                add(chapter_zero_results, f"#### [{std} {m.chapter}:0 (장 서론)]", text[m.end : chapter_zero_until])
 
-    # verse_input != "0" 인 경우, 책/장 서론 패턴 먼저 스캔
-    if verse_input != "0":
-        for pattern in book_intro_patterns:
-            matches = re.finditer(pattern, text, re.DOTALL | re.IGNORECASE)
-            for m in matches:
-                groups = m.groups()
-                if pattern in [book_intro_patterns[0], book_intro_patterns[1], book_intro_patterns[2]]:
-                    book, chapter, content = groups
-                    normalized_book = book.strip()
-                    std_book = bible_alias_flat.get(normalized_book)
-                    if std_book and std_book == std:
-                        content = content.strip()
-                        if content:
-                            key = f"#### [{std_book} {chapter} (장 서론)]"
-                            if key not in results_dict:
-                                results_dict[key] = content
-                else:
-                    book, content = groups[:2]
-                    normalized_book = book.strip()
-                    std_book = bible_alias_flat.get(normalized_book)
-                    if std_book and std_book == std:
-                        content = content.strip()
-                        if content:
-                            key = f"#### [{std_book} 0:0 (서론)]"
-                            if key not in results_dict:
-                                results_dict[key] = content
-
-    # 장 서론 패턴
-    chapter_intro_pattern = (
-        r"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)([A-Za-z 가 - 힣\d]+)\s*(\d+):0(?!\s*\]\]\s*>>\s*\1\s*\2:0\s*\]\])"
-        r"(?:\s*\]\]|\]\]|:\d+|\b)(.*?)(?=(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)"
-        r"[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)"
-    )
-    matches = re.finditer(chapter_intro_pattern, text, re.DOTALL | re.IGNORECASE)
-    for m in matches:
-        book, chapter, content = m.groups()
-        normalized_book = book.strip()
-        std_book = bible_alias_flat.get(normalized_book)
-        if std_book and std_book == std and chapter == chap:
-            content = content.strip()
-            if content:
-                key = f"#### [{std_book} {chapter}:0 (장 서론)]"
-                if key not in results_dict:
-                    results_dict[key] = content
+    results_dict: Dict[str, str] = {}
+    for partial in (chapter_marker_results, *book_zero_results_by_form.values(), chapter_zero_results):
+        for key, content in partial.items():
+            results_dict.setdefault(key, content)
 
-    # 책 서론 처리 (chap == "0")
+    # 책 서론 처리 (chap == "0"): 1:1 표지 앞부분
     if chap == "0":
-        intro_pattern = rf"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:){re.escape(std)}\s*1:1(?:\s*\]\]|\]\])"
-        match = re.search(intro_pattern, text, re.IGNORECASE)
-        if match:
-            intro_content = text[: match.start()].strip()
-            last_bible_ref = re.findall(
-                r"(?:\[\[\s*@Bible:|\[\[@Bible:|\[\[@Bible:|@Bible:)[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\]).*?"
-                r"(?=(?:\[\[\s*@Bible:|\[\[@Bible:|\[\[@Bible:|@Bible:)[A-Za-z 가 - 힣\d]+\s*\d+:\d+|$)",
-                text[: match.start()],
-                re.DOTALL | re.IGNORECASE,
-            )
-            if last_bible_ref:
-                last_match = re.search(
-                    r"(?:\[\[\s*@Bible:|\[\[@Bible:|\[\[@Bible:|@Bible:)"
-                    r"[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])",
-                    last_bible_ref[-1],
-                    re.IGNORECASE,
-                )
-                if last_match:
-                    intro_content = last_bible_ref[-1][last_match.end() :].strip()
-            else:
-                intro_content = text[: match.start()].strip()
-
-            if intro_content:
-                key = f"#### [{std} 0:0 (서론)]"
-                if key not in results_dict:
-                    results_dict[key] = intro_content
+        for i, m in enumerate(markers):
+            if m.book == std and m.chapter == 1 and m.verse == 1 and m.closed:
+                add(results_dict, f"#### [{std} 0:0 (서론)]", _content_before(text, markers, i))
+                break
 
     # 장 서론 처리 (chap != "0" 이고 verse_input == "0")
-    elif verse_input == "0":
-        all_names = [std] + bible_raw_map.get(std, [])
-        intro_start_pattern = f"(?:"
-        for i, name in enumerate(all_names):
-            if i > 0:
-                intro_start_pattern += "|"
-            intro_start_pattern += (
-                rf"\[\[\s*@Bible:{re.escape(name)}\s*{chap}\s*\]\]|"
-                rf"\[\[@Bible:{re.escape(name)}\s*{chap}\s*\]\]|"
-                rf"\[\[@Bible:{re.escape(name)}\s*{chap}\s*\]\]|"
-                rf"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:){re.escape(name)}\s*{chap}:0(?:\s*\]\]|\]\])"
-            )
-        intro_start_pattern += ")"
-
-        intro_end_pattern = f"(?:"
-        for i, name in enumerate(all_names):
-            if i > 0:
-                intro_end_pattern += "|"
-            intro_end_pattern += (
-                rf"\[\[\s*@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
-                rf"\[\[@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
-                rf"\[\[@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
-                rf"\[\[@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
-                rf"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:){re.escape(name)}\s*{chap}:1(?:\s*\]\]|\]\])"
-            )
-        intro_end_pattern += ")"
-
-        start_match = re.search(intro_start_pattern, text, re.IGNORECASE)
-        end_match = re.search(intro_end_pattern, text, re.IGNORECASE)
-
-        if start_match and end_match and start_match.start() < end_match.start():
-            intro_content = text[start_match.end() : end_match.start()].strip()
-            if intro_content:
-                key = f"#### [{std} {chap}:0 (장 서론)]"
-                if key not in results_dict:
-                    results_dict[key] = intro_content
-        else:
-            fallback_pattern = f"(?:"
-            for i, name in enumerate(all_names):
-                if i > 0:
-                    fallback_pattern += "|"
-                fallback_pattern += (
-                    rf"\[\[\s*@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
-                    rf"\[\[@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
-                    rf"\[\[@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
-                    rf"\[\[@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
-                    rf"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:){re.escape(name)}\s*{chap}:1(?:\s*\]\]|\]\])"
-                )
-            fallback_pattern += ")"
-
-            match = re.search(fallback_pattern, text, re.IGNORECASE)
-            if match:
-                intro_content = text[: match.start()].strip()
-                last_bible_ref = re.findall(
-                    r"(?:\[\[\s*@Bible:|\[\[@Bible:|\[\[@Bible:|@Bible:)"
-                    r"[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\]).*?"
-                    r"(?=(?:\[\[\s*@Bible:|\[\[@Bible:|\[\[@Bible:|@Bible:)[A-Za-z 가 - 힣\d]+\s*\d+:\d+|$)",
-                    text[: match.start()],
-                    re.DOTALL | re.IGNORECASE,
-                )
-                if last_bible_ref:
-                    last_match = re.search(
-                        r"(?:\[\[\s*@Bible:|\[\[@Bible:|\[\[@Bible:|@Bible:)"
-                        r"[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])",
-                        last_bible_ref[-1],
-                        re.IGNORECASE,
-                    )
-                    if last_match:
-                        intro_content = last_bible_ref[-1][last_match.end() :].strip()
-                else:
-                    intro_content = text[: match.start()].strip()
-
-                if intro_content:
-                    key = f"#### [{std} {chap}:0 (장 서론)]"
-                    if key not in results_dict:
-                        results_dict[key] = intro_content
+    elif verse_input == "0" and chap_num is not None:
+        start_marker = None
+        end_index = None
+        for i, m in enumerate(markers):
+            if m.book != std or m.chapter != chap_num or not m.closed:
+                continue
+            if start_marker is None and ((m.verse is None and m.bracketed) or m.chapter_zero):
+                start_marker = m
+            if end_index is None and m.verse == 1:
+                end_index = i
+            if start_marker is not None and end_index is not None:
+                break
+
+        if start_marker is not None and end_index is not None and start_marker.start < markers[end_index].start:
+            add(results_dict, f"#### [{std} {chap}:0 (장 서론)]", text[start_marker.end : markers[end_index].start])
+        elif end_index is not None:
+            add(results_dict, f"#### [{std} {chap}:0 (장 서론)]", _content_before(text, markers, end_index))
 
     return results_dict
 
@@ -287,7 +371,7 @@ def fetch_bible_text(
     - use_index=True: 캐시된 인덱스를 사용하여 빠르게 검색 (2 번 엔진의 장점)
     - 인덱스는 표준 코드로 통합되어 있어, 어떤 약어로 문서가 작성되었든 표준화되어 저장됨
     - 사용자 검색어도 표준 코드로 변환되므로, 어떤 약어로 검색해도 통합된 결과 반환
-    - [핵심] book_id 포함: 주석 모듈 연동을 위해 book_id 를 결과에 포함
+    - 절/다음 절 위치는 BookTagIndex 의 dict 와 bisect 로 찾아 범위 요청도 선형 시간
     """
     results_dict: Dict[str, str] = {}
 
@@ -296,44 +380,41 @@ def fetch_bible_text(
         # bible_alias_flat 을 전달하여 인덱스 생성 시 표준화 수행
         tag_index = build_logos_tag_index(text, bible_alias_flat)
 
+        # 사용자 입력이 이미 표준 코드 (std) 로 변환되어 있으므로
+        # 인덱스에서 표준 코드로 직접 검색
+        book_index = tag_index.get(std)
+        if book_index is None or not chap.isdigit():
+            return results_dict
+        chap_num = int(chap)
+
         for verse in verses:
-            # 사용자 입력이 이미 표준 코드 (std) 로 변환되어 있으므로
-            # 인덱스에서 표준 코드로 직접 검색
-            matched_positions = []
-            if std in tag_index:
-                # 인덱스에서 해당 장/절에 맞는 항목만 필터링
-                for start_pos, end_pos, indexed_chap, indexed_verse in tag_index[std]:
-                    if indexed_chap == chap and indexed_verse == verse:
-                        matched_positions.append((start_pos, end_pos))
-
-            if matched_positions:
-                # 첫 번째 매칭 위치 사용
-                start_pos, end_pos = matched_positions[0]
-
-                # 다음 절까지의 내용 추출
-                content_end = len(text)
-                next_verse_num = int(verse) + 1
-
-                # 다음 절의 위치 찾기
-                for start_pos_next, end_pos_next, indexed_chap, indexed_verse in tag_index.get(std, []):
-                    if indexed_chap == chap and indexed_verse == str(next_verse_num):
-                        if start_pos_next > end_pos:
-                            content_end = start_pos_next
-                            break
-
-                content = text[end_pos:content_end].strip()
-                if content:
-                    # [핵심 수정] book_id 포함 - 주석 모듈 연동을 위한 데이터 규격 통일
-                    from core.bible_utils import get_book_id_from_code
-                    book_id = get_book_id_from_code(std)
-                    
-                    result_key = f"#### [{std} {chap}:{verse}]"
-                    if result_key not in results_dict:
-                        results_dict[result_key] = content
+            if not str(verse).isdigit():
+                continue
+            verse_num = int(verse)
+
+            # 해당 장/절의 첫 번째 태그 위치 (dict 조회, O(1))
+            hit = book_index.find(chap_num, verse_num)
+            if hit is None:
+                continue
+            start_pos, end_pos = hit
+
+            # 다음 절 태그 중 현재 태그 뒤에 있는 첫 위치 (bisect, O(log n))
+            next_start = book_index.first_start_after(chap_num, verse_num + 1, end_pos)
+            content_end = next_start if next_start is not None else len(text)
+
+            content = text[end_pos:content_end].strip()
+            if content:
+                result_key = f"#### [{std} {chap}:{verse}]"
+                if result_key not in results_dict:
+                    results_dict[result_key] = content
 
         return results_dict
 
     # 기존 전수조사 방식 (fallback)
+    # 장/절은 정수로 비교합니다. (문자열 비교는 "06" 과 "6" 을 다른 절로 봄)
+    if not chap.isdigit():
+        return results_dict
+    chap_num = int(chap)
     all_verse_tags: List[Dict[str, object]] = []
     verse_pattern = (
         r"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)([A-Za-z 가 - 힣\d]+)\s*(\d+):(\d+)\s*(?:\]\]|\]\])"
@@ -353,8 +434,8 @@ def fetch_bible_text(
             all_verse_tags.append(
                 {
                     "book": std_book_found,
-                    "chapter": chap_found,
-                    "verse": verse_found,
+                    "chapter": int(chap_found),
+                    "verse": int(verse_found),
                     "start": match.start(),
                     "end": match.end(),
                 }
@@ -376,22 +457,22 @@ def fetch_bible_text(
                 all_verse_tags.append(
                     {
                         "book": std_book_found,
-                        "chapter": chap_found,
-                        "verse": verse_found,
+                        "chapter": int(chap_found),
+                        "verse": int(verse_found),
                         "start": match.start(),
                         "end": match.end(),
                     }
                 )
 
     all_verse_tags.sort(key=lambda x: x["start"])  # type: ignore[index]
-    requested_verses_set = set(str(v) for v in verses)
+    requested_verses_set = {int(v) for v in verses if str(v).isdigit()}
     processed_ranges: List[Tuple[int, int]] = []
 
     for i, tag_info in enumerate(all_verse_tags):
         if (
             tag_info["book"] == std
-            and tag_info["chapter"] == chap
-            and str(tag_info["verse"]) in requested_verses_set
+            and tag_info["chapter"] == chap_num
+            and tag_info["verse"] in requested_verses_set
         ):
             is_duplicate = False
             for start_range, end_range in processed_ranges:
@@ -409,12 +490,12 @@ def fetch_bible_text(
                 next_tag = all_verse_tags[j]
                 if (
                     next_tag["book"] == std
-                    and next_tag["chapter"] == chap
+                    and next_tag["chapter"] == chap_num
                     and next_tag["verse"] not in requested_verses_set
                 ):
                     content_end = int(next_tag["start"])
                     break
-                if next_tag["book"] == std and next_tag["chapter"] != chap:
+                if next_tag["book"] == std and next_tag["chapter"] != chap_num:
                     content_end = int(next_tag["start"])
                     break
                 if next_tag["book"] != std:
@@ -432,6 +513,55 @@ def fetch_bible_text(
     return results_dict
 
 
+def search_document(
+    text: str,
+    user_book: str,
+    chap: str,
+    verse_input: str,
+    bible_alias_flat: Dict[str, str],
+    bible_raw_map: Dict[str, List[str]],
+) -> str:
+    """
+    Bible 텍스트에서 서론/본문을 검색하는 라우터 함수입니다.
+    (main.py 의 search_engine 및 병렬 전수 조사 워커가 함께 사용)
+    - parse_reference: 입력 파싱 및 모드 결정
+    - fetch_intro: 책/장 서론 추출
+    - fetch_bible_text: 일반 절 본문 추출
+    """
+    parsed = parse_reference(user_book, chap, verse_input, bible_alias_flat, bible_raw_map)
+    if not parsed:
+        return ""
+
+    std, norm_chap, verses, mode = parsed
+    results_dict: Dict[str, str] = {}
+
+    # 서론(책/장) 처리
+    intro_results = fetch_intro(
+        text,
+        std,
+        norm_chap,
+        verse_input,
+        bible_alias_flat,
+        bible_raw_map,
+    )
+    results_dict.update(intro_results)
+
+    # 일반 절 본문 처리
+    if mode == "verse":
+        bible_results = fetch_bible_text(
+            text,
+            std,
+            norm_chap,
+            verses,
+            bible_alias_flat,
+            bible_raw_map,
+        )
+        results_dict.update(bible_results)
+
+    res_list = [f"{key}\n{content}" for key, content in results_dict.items()]
+    return "\n\n".join(res_list) if res_list else ""
+
+
 # ========== [NEW] 성경 모듈 DB 에서 직접 검색 ==========
 
 def scan_bible_module_files(selected_folders: List[str]) -> List[str]:
@@ -469,103 +599,14 @@ def scan_bible_module_files(selected_folders: List[str]) -> List[str]:
 def load_bible_verse_from_module(path: str, book_id: int, chap: int, vers: int) -> Optional[str]:
     """
     성경 모듈 DB 에서 특정 절 본문 추출
+    장 전체를 한 번에 읽어 캐시하므로 이웃한 절은 다시 조회하지 않습니다. (core.chapter_cache)
     """
     if not os.path.exists(path):
         return None
-
-    lower = path.lower()
-    filename = os.path.basename(path)
-
-    try:
-        conn = sqlite3.connect(path)
-        cur = conn.cursor()
-
-        # MyBible 형식
-        if lower.endswith(".mybible"):
-            try:
-                cur.execute(
-                    "SELECT text FROM verses WHERE book=? AND chapter=? AND verse=?",
-                    (book_id, chap, vers),
-                )
-                row = cur.fetchone()
-                if row and row[0]:
-                    from core.bible_utils import decode_rtf
-                    content = decode_rtf(row[0])
-                    return f"#### 📖 [{filename}]\n{content.strip()}"
-            except:
-                pass
-
-        # TheWord (TWM) 형식
-        elif lower.endswith(".twm"):
-            try:
-                cur.execute(
-                    "SELECT data FROM bible WHERE bi=? AND ci=? AND vi=?",
-                    (book_id, chap, vers),
-                )
-                row = cur.fetchone()
-                if row and row[0]:
-                    from core.bible_utils import decode_rtf
-                    content = decode_rtf(row[0])
-                    return f"#### 📖 [{filename}]\n{content.strip()}"
-            except:
-                pass
-
-        # Crossway (CDB) 형식
-        elif lower.endswith(".cdb"):
-            try:
-                cur.execute(
-                    "SELECT btext FROM Bible WHERE book=? AND chapter=? AND verse=?",
-                    (book_id, chap, vers),
-                )
-                row = cur.fetchone()
-                if row and row[0]:
-                    from core.bible_utils import decode_rtf
-                    content = decode_rtf(row[0])
-                    return f"#### 📖 [{filename}]\n{content.strip()}"
-            except:
-                pass
-
-        # 일반 sqlite3 파일 (스키마 추론)
-        elif lower.endswith(".sqlite3") or lower.endswith(".sqlite"):
-            try:
-                # 테이블 찾기
-                cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = [row[0].lower() for row in cur.fetchall()]
-
-                target_table = None
-                for table_name in ["verses", "bible", "scripture", "texts"]:
-                    if table_name in tables:
-                        target_table = table_name
-                        break
-
-                if target_table:
-                    # 컬럼 추론
-                    cur.execute(f"PRAGMA table_info({target_table})")
-                    columns = [col[1].lower() for col in cur.fetchall()]
-
-                    book_col = next((c for c in columns if c in ["book", "book_id", "book_number"]), None)
-                    chap_col = next((c for c in columns if c in ["chapter", "ch"]), None)
-                    verse_col = next((c for c in columns if c in ["verse", "vs", "v"]), None)
-                    text_col = next((c for c in columns if c in ["text", "content", "btext", "data"]), None)
-
-                    if book_col and chap_col and verse_col and text_col:
-                        cur.execute(
-                            f"SELECT {text_col} FROM {target_table} WHERE {book_col}=? AND {chap_col}=? AND {verse_col}=?",
-                            (book_id, chap, vers),
-                        )
-                        row = cur.fetchone()
-                        if row and row[0]:
-                            from core.bible_utils import decode_rtf
-                            content = decode_rtf(row[0])
-                            return f"#### 📖 [{filename}]\n{content.strip()}"
-            except:
-                pass
-
-        conn.close()
-    except:
-        pass
-
-    return None
+    content = get_bible_chapter(path, book_id, chap).get(int(vers))
+    if not content:
+        return None
+    return f"#### 📖 [{os.path.basename(path)}]\n{content}"
 
 
 # ========== [핵심 추가] 주석 모듈 연동 함수 ==========
@@ -583,5 +624,4 @@ def get_book_id_for_commentary(std_book: str) -> int:
     Returns:
         book_id: 성경 모듈 DB 에서 사용하는 숫자 ID (1-based)
     """
-    from core.bible_utils import get_book_id_from_code
-    return get_book_id_from_code(std_book)
+    return book_id(std_book)
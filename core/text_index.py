@@ -0,0 +1,551 @@
+import os
+import re
+import sqlite3
+import unicodedata
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from core.cache_utils import file_signature, get_cache_path
+from core.file_reader import SUPPORTED_EXTS, read_file
+from core.parallel_scan import map_files_parallel
+from core.ranking import CorpusStats, bm25f_score
+
+# ========== 서재 문서 역색인 (문자 bigram + 위치) ==========
+# 검색할 때마다 모든 문서를 읽어 find/count 하던 방식 대신,
+# 문서마다 한 번 (문자 2-gram -> 위치 목록) 역색인을 만들어 SQLite 에 저장합니다.
+# - 공백 없는 한글 어절 안의 부분 문자열도 찾을 수 있도록 단어가 아닌 문자 단위 bigram 을 씁니다.
+# - 색인 전 정규화 (normalize_with_offsets):
+#     소문자화, 공백/줄바꿈 연속은 공백 하나로, 폭 없는 문자 제거,
+#     한글 첫가끝 자모 조합(PDF 등에서 풀어 쓴 자모 -> 완성형),
+#     그리스어 악센트/숨표 제거와 어말 시그마(ς -> σ), 히브리어 니쿠드/칸틸레이션 부호 제거
+#   정규화로 글자 수가 달라진 문서는 (정규화 위치 -> 원문 위치) 표를 함께 저장합니다.
+# - 검색어의 위치는 bigram 위치 목록을 (p, p+1, p+2 ...) 로 이어 붙여 정확히 계산합니다.
+# - 파일의 (mtime, size) 가 바뀐 경우에만 다시 색인합니다.
+# - 포함/제외/어구 조건은 위치 목록 교집합으로, 근접 조건(기본 20자)은 모든 출현 위치에 대해 판정하고,
+#   일치한 파일만 열어 스니펫을 만듭니다.
+# - 순위 통계(문서 수, 길이 합계, 글자/bigram 별 문서 빈도)는 색인을 쓸 때 함께 갱신해 두므로
+#   검색할 때 위치 목록을 다시 풀지 않습니다. (3글자 이상 검색어의 문서 빈도는 구성 bigram 중 최솟값)
+
+TEXT_INDEX_DB = "text_index.db"
+# 정규화 규칙이나 테이블 구조가 바뀌면 올려서 기존 색인을 다시 만듭니다.
+TEXT_INDEX_VERSION = 3
+
+# 검색어 사이 기본 근접 거리 (글자 수). 검색어에 ~N 을 넣어 바꿀 수 있습니다.
+DEFAULT_PROXIMITY = 20
+
+# 문서 끝에 붙여 마지막 글자도 bigram (글자 + 종결 문자) 으로 색인되게 합니다.
+_END = "\0"
+# 1글자 검색어는 그 글자로 시작하는 모든 bigram 을 범위 조회합니다.
+_MAX_CHAR = "\U0010ffff"
+
+
+def _connect_text_index() -> sqlite3.Connection:
+    conn = sqlite3.connect(get_cache_path(TEXT_INDEX_DB), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != TEXT_INDEX_VERSION:
+        conn.executescript(
+            f"""
+            DROP TABLE IF EXISTS postings;
+            DROP TABLE IF EXISTS docs;
+            DROP TABLE IF EXISTS term_df;
+            DROP TABLE IF EXISTS corpus;
+            PRAGMA user_version={TEXT_INDEX_VERSION};
+            """
+        )
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS docs (
+            id INTEGER PRIMARY KEY,
+            path TEXT UNIQUE NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            offsets BLOB
+        );
+        CREATE TABLE IF NOT EXISTS postings (
+            gram TEXT NOT NULL,
+            doc_id INTEGER NOT NULL,
+            positions BLOB NOT NULL,
+            PRIMARY KEY (gram, doc_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (doc_id);
+        -- 글자(1글자) / bigram 별 문서 빈도
+        CREATE TABLE IF NOT EXISTS term_df (
+            term TEXT PRIMARY KEY,
+            df INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        -- 길이가 0 보다 큰 문서 수와 길이 합계 (한 행)
+        CREATE TABLE IF NOT EXISTS corpus (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            doc_count INTEGER NOT NULL,
+            total_length INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO corpus (id, doc_count, total_length) VALUES (0, 0, 0);
+        """
+    )
+    return conn
+
+
+# ========== 정규화 / 위치 목록 인코딩 ==========
+
+_ZERO_WIDTH = {0x00AD, 0x200B, 0x200C, 0x200D, 0x2060, 0xFEFF}
+
+
+class _FoldTable(dict):
+    """str.translate 용 글자별 정규화 표 (처음 나온 글자만 계산해 채움)"""
+
+    def __missing__(self, code: int) -> Optional[str]:
+        c = chr(code)
+        if code in _ZERO_WIDTH or unicodedata.category(c) == "Mn":
+            # 폭 없는 문자, 결합 부호 (히브리어 니쿠드/칸틸레이션, 분리된 악센트 등)
+            folded = None
+        elif c.isspace():
+            folded = " "
+        else:
+            folded = c.lower()
+            if len(folded) != 1:
+                # 'İ' 처럼 소문자화하면 길어지는 글자는 원래 글자를 유지
+                folded = c
+            if not ("\uac00" <= folded <= "\ud7a3"):
+                # 악센트가 합쳐진 글자는 기본 글자로 (ά -> α, é -> e). 한글 음절은 분해하지 않음
+                decomposed = unicodedata.normalize("NFD", folded)
+                if len(decomposed) > 1 and all(unicodedata.category(x) == "Mn" for x in decomposed[1:]):
+                    folded = decomposed[0]
+            if folded == "ς":
+                folded = "σ"
+        self[code] = folded
+        return folded
+
+
+_FOLD = _FoldTable()
+_JAMO_RE = re.compile("[\u1100-\u11ff]")
+
+
+def normalize_with_offsets(text: str) -> Tuple[str, Optional[List[int]]]:
+    """
+    색인/검색용 정규화 텍스트와 (정규화 위치 -> 원문 위치) 표를 반환합니다.
+    글자 수가 그대로인 경우(대부분의 문서)는 표 없이 None 을 반환합니다.
+    """
+    folded = text.translate(_FOLD)
+    if len(folded) == len(text) and "  " not in folded and not _JAMO_RE.search(text):
+        return folded, None
+
+    out: List[str] = []
+    offsets: List[int] = []
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        # 첫가끝 자모 (초성 + 중성 [+ 종성]) -> 완성형 음절
+        if "\u1100" <= c <= "\u1112" and i + 1 < n and "\u1161" <= text[i + 1] <= "\u1175":
+            lead, vowel, tail, step = ord(c) - 0x1100, ord(text[i + 1]) - 0x1161, 0, 2
+            if i + 2 < n and "\u11a8" <= text[i + 2] <= "\u11c2":
+                tail, step = ord(text[i + 2]) - 0x11A7, 3
+            out.append(chr(0xAC00 + (lead * 21 + vowel) * 28 + tail))
+            offsets.append(i)
+            i += step
+            continue
+        folded_char = _FOLD[ord(c)]
+        if folded_char is not None and not (folded_char == " " and out and out[-1] == " "):
+            out.append(folded_char)
+            offsets.append(i)
+        i += 1
+    return "".join(out), offsets
+
+
+def normalize_text(text: str) -> str:
+    """검색어 정규화 (색인과 같은 규칙)"""
+    return normalize_with_offsets(text)[0]
+
+
+def _encode_positions(positions: List[int]) -> bytes:
+    deltas = array("I", positions)
+    for i in range(len(deltas) - 1, 0, -1):
+        deltas[i] -= deltas[i - 1]
+    return zlib.compress(deltas.tobytes(), 1)
+
+
+def _decode_positions(blob: bytes) -> List[int]:
+    deltas = array("I")
+    deltas.frombytes(zlib.decompress(blob))
+    return list(accumulate(deltas))
+
+
+def build_postings(norm: str) -> Dict[str, List[int]]:
+    """정규화된 텍스트의 (bigram -> 위치 목록)"""
+    norm += _END
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for i in range(len(norm) - 1):
+        postings[norm[i : i + 2]].append(i)
+    return postings
+
+
+# (정규화 문서 길이, 인코딩된 위치 표 또는 None, {bigram: 인코딩된 위치 목록})
+DocPostings = Tuple[int, Optional[bytes], Dict[str, bytes]]
+
+
+def compute_doc_postings(path: str) -> Optional[DocPostings]:
+    """파일 하나의 색인 데이터 계산 (프로세스 풀 워커에서 실행). 읽기 실패면 None"""
+    text = read_file(path)
+    if text.startswith("파일 읽기 오류"):
+        return None
+    if not text:
+        return 0, None, {}
+    norm, offsets = normalize_with_offsets(text)
+    postings = build_postings(norm)
+    encoded_offsets = _encode_positions(offsets) if offsets is not None else None
+    return len(norm), encoded_offsets, {gram: _encode_positions(pos) for gram, pos in postings.items()}
+
+
+# ========== 색인 갱신 ==========
+
+def _df_terms(grams: Iterable[str]) -> Set[str]:
+    """문서의 bigram 목록 -> 문서 빈도를 셀 항목 (bigram + 첫 글자. 끝 표시 덕분에 모든 글자가 첫 글자로 나옴)"""
+    grams = set(grams)
+    return grams | {g[0] for g in grams}
+
+
+def _adjust_stats(conn: sqlite3.Connection, doc_id: int, sign: int) -> None:
+    """문서 하나의 bigram/글자 문서 빈도와 문서 수/길이 합계를 더하거나(+1) 뺌(-1)"""
+    length = conn.execute("SELECT length FROM docs WHERE id=?", (doc_id,)).fetchone()
+    if not length or length[0] <= 0:
+        return
+    grams = [g for (g,) in conn.execute("SELECT gram FROM postings WHERE doc_id=?", (doc_id,))]
+    conn.executemany(
+        "INSERT INTO term_df (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df",
+        [(term, sign) for term in _df_terms(grams)],
+    )
+    conn.execute(
+        "UPDATE corpus SET doc_count = doc_count + ?, total_length = total_length + ? WHERE id = 0",
+        (sign, sign * length[0]),
+    )
+
+
+def _store_doc_postings(
+    conn: sqlite3.Connection,
+    sig: Tuple[str, int, int],
+    result: DocPostings,
+) -> None:
+    abs_path, mtime_ns, size = sig
+    length, offsets, postings = result
+    old = conn.execute("SELECT id FROM docs WHERE path=?", (abs_path,)).fetchone()
+    if old:
+        doc_id = old[0]
+        _adjust_stats(conn, doc_id, -1)
+        conn.execute("DELETE FROM postings WHERE doc_id=?", (doc_id,))
+        conn.execute(
+            "UPDATE docs SET mtime_ns=?, size=?, length=?, offsets=? WHERE id=?",
+            (mtime_ns, size, length, offsets, doc_id),
+        )
+    else:
+        doc_id = conn.execute(
+            "INSERT INTO docs (path, mtime_ns, size, length, offsets) VALUES (?, ?, ?, ?, ?)",
+            (abs_path, mtime_ns, size, length, offsets),
+        ).lastrowid
+    conn.executemany(
+        "INSERT INTO postings (gram, doc_id, positions) VALUES (?, ?, ?)",
+        [(gram, doc_id, blob) for gram, blob in postings.items()],
+    )
+    _adjust_stats(conn, doc_id, +1)
+
+
+def refresh_text_index(
+    files: Iterable[str],
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+) -> int:
+    """
+    파일 목록 중 새로 생겼거나 수정된 파일만 다시 색인합니다.
+    반환: 다시 색인한 파일 수
+    """
+    conn = _connect_text_index()
+    try:
+        known = {
+            path: (mtime_ns, size) for path, mtime_ns, size in conn.execute("SELECT path, mtime_ns, size FROM docs")
+        }
+
+        stale: List[str] = []
+        sigs: Dict[str, Tuple[str, int, int]] = {}
+        for path in files:
+            if os.path.splitext(path)[1].lower() not in SUPPORTED_EXTS:
+                continue
+            sig = file_signature(path)
+            if sig is None:
+                continue
+            if known.get(sig[0]) != (sig[1], sig[2]):
+                stale.append(sig[0])
+                sigs[sig[0]] = sig
+
+        for done, (_, path, result) in enumerate(map_files_parallel(compute_doc_postings, stale)):
+            # 읽기/워커 실패(None)는 빈 문서로 저장하지 않고 두어 다음 갱신 때 다시 색인
+            if result is not None:
+                _store_doc_postings(conn, sigs[path], result)
+            if progress_callback:
+                progress_callback(done + 1, len(stale), path)
+
+        # 디스크에서 사라진 파일의 색인 정리
+        gone = [(did,) for did, path in conn.execute("SELECT id, path FROM docs") if not os.path.exists(path)]
+        if gone:
+            for (doc_id,) in gone:
+                _adjust_stats(conn, doc_id, -1)
+            conn.executemany("DELETE FROM postings WHERE doc_id=?", gone)
+            conn.executemany("DELETE FROM docs WHERE id=?", gone)
+        if stale or gone:
+            conn.execute("DELETE FROM term_df WHERE df <= 0")
+
+        conn.commit()
+        return len(stale)
+    finally:
+        conn.close()
+
+
+# ========== 검색어 위치 조회 ==========
+
+def _gram_postings(conn: sqlite3.Connection, gram: str, doc_ids: Set[int]) -> Dict[int, List[int]]:
+    rows = conn.execute("SELECT doc_id, positions FROM postings WHERE gram=?", (gram,)).fetchall()
+    return {doc_id: _decode_positions(blob) for doc_id, blob in rows if doc_id in doc_ids}
+
+
+def _char_postings(conn: sqlite3.Connection, char: str, doc_ids: Set[int]) -> Dict[int, List[int]]:
+    """1글자 검색어: 그 글자로 시작하는 모든 bigram 위치의 합집합"""
+    merged: Dict[int, Set[int]] = defaultdict(set)
+    rows = conn.execute(
+        "SELECT doc_id, positions FROM postings WHERE gram >= ? AND gram < ?", (char, char + _MAX_CHAR)
+    )
+    for doc_id, blob in rows:
+        if doc_id in doc_ids:
+            merged[doc_id].update(_decode_positions(blob))
+    return {doc_id: sorted(pos) for doc_id, pos in merged.items()}
+
+
+def term_positions(conn: sqlite3.Connection, term: str, doc_ids: Set[int]) -> Dict[int, List[int]]:
+    """
+    검색어(정규화된 문자열)가 나오는 모든 시작 위치를 문서별로 반환합니다.
+    bigram 들의 위치가 1칸씩 연속되는 지점만 남기므로 부분 문자열 일치와 같습니다.
+    """
+    if not term or not doc_ids:
+        return {}
+    if len(term) == 1:
+        return _char_postings(conn, term, doc_ids)
+
+    grams = [term[i : i + 2] for i in range(len(term) - 1)]
+    # 희귀한 bigram 부터 조회하여 후보 문서를 빨리 줄입니다.
+    by_gram: Dict[str, Dict[int, List[int]]] = {}
+    candidates = set(doc_ids)
+    for gram in sorted(set(grams), key=lambda g: _gram_doc_count(conn, g)):
+        by_gram[gram] = _gram_postings(conn, gram, candidates)
+        candidates &= by_gram[gram].keys()
+        if not candidates:
+            return {}
+
+    result: Dict[int, List[int]] = {}
+    for doc_id in candidates:
+        starts = set(by_gram[grams[0]][doc_id])
+        for offset, gram in enumerate(grams[1:], start=1):
+            starts &= {p - offset for p in by_gram[gram][doc_id]}
+            if not starts:
+                break
+        if starts:
+            result[doc_id] = sorted(starts)
+    return result
+
+
+def _gram_doc_count(conn: sqlite3.Connection, gram: str) -> int:
+    """글자/bigram 이 들어 있는 문서 수 (색인할 때 저장한 값)"""
+    row = conn.execute("SELECT df FROM term_df WHERE term=?", (gram,)).fetchone()
+    return row[0] if row else 0
+
+
+# ========== 조건 검색 ==========
+
+class SearchQuery(NamedTuple):
+    phrases: List[str]  # 따옴표로 묶인 어구 (모두 포함)
+    include: List[str]  # +필수 단어 (모두 포함)
+    exclude: List[str]  # -제외 단어 (하나라도 있으면 제외)
+    normal: List[str]  # 일반 검색어 (하나 이상 포함)
+    window: int = DEFAULT_PROXIMITY  # 검색어가 여럿일 때 서로 떨어질 수 있는 최대 글자 수
+
+    @property
+    def positive_terms(self) -> List[str]:
+        """위치를 계산할 검색어 (일반 + 필수 + 어구)"""
+        return self.normal + self.include + self.phrases
+
+
+class DocMatch(NamedTuple):
+    path: str
+    positions: Dict[str, List[int]]  # 검색어 -> 원문 기준 시작 위치 목록 (없으면 빈 목록)
+    hit: Optional[Tuple[int, int]]  # 원문 기준 대표 일치 구간 (시작, 끝). 검색어가 없으면 None
+    score: float  # BM25F 점수 (검색어가 없으면 0.0)
+
+
+def parse_search_query(query: str) -> SearchQuery:
+    """
+    검색어 파싱: "어구" / '어구', +필수, -제외, ~N (근접 거리), 일반 검색어
+    모든 검색어는 색인과 같은 규칙(normalize_text)으로 정규화됩니다.
+    """
+    phrases = re.findall(r'"([^"]+)"', query) + re.findall(r"'([^']+)'", query)
+    remaining = re.sub(r'"[^"]+"', "", query)
+    remaining = re.sub(r"'[^']+'", "", remaining)
+
+    include: List[str] = []
+    exclude: List[str] = []
+    normal: List[str] = []
+    window = DEFAULT_PROXIMITY
+    for word in remaining.split():
+        if re.fullmatch(r"~\d+", word):
+            window = int(word[1:])
+        elif word.startswith("+"):
+            include.append(normalize_text(word[1:]))
+        elif word.startswith("-"):
+            exclude.append(normalize_text(word[1:]))
+        else:
+            normal.append(normalize_text(word))
+    phrases = [normalize_text(p.strip()) for p in phrases]
+    return SearchQuery([p for p in phrases if p], include, exclude, normal, window)
+
+
+def find_proximity_hit(
+    positions: Dict[str, List[int]],
+    terms: List[str],
+    window: int,
+) -> Optional[Tuple[int, int]]:
+    """
+    모든 검색어가 한 출현 위치를 중심으로 window 글자 안에 함께 나오는 첫 구간을 찾습니다.
+    가장 드문 검색어의 모든 출현 위치를 기준으로 삼고, 나머지 검색어는 이분 탐색으로 확인합니다.
+    (첫 일치 위치 하나만 보던 방식과 달리 문서 뒤쪽의 일치도 찾습니다.)
+    반환: (시작, 끝) 위치 또는 None
+    """
+    terms = [t for t in dict.fromkeys(terms) if t]
+    if not terms or any(not positions.get(t) for t in terms):
+        return None
+    anchor = min(terms, key=lambda t: len(positions[t]))
+    others = [t for t in terms if t != anchor]
+
+    for p in positions[anchor]:
+        lo, hi = p - window, p + len(anchor) + window
+        start, end = p, p + len(anchor)
+        for term in others:
+            term_pos = positions[term]
+            # lo 이상인 첫 출현 위치가 구간 밖으로 나가면 그 뒤 위치도 모두 구간 밖
+            i = bisect_left(term_pos, lo)
+            if i == len(term_pos) or term_pos[i] + len(term) > hi:
+                break
+            start = min(start, term_pos[i])
+            end = max(end, term_pos[i] + len(term))
+        else:
+            return start, end
+    return None
+
+
+def _to_original(offsets: Optional[List[int]], pos: int) -> int:
+    if offsets is None or not offsets:
+        return pos
+    return offsets[min(pos, len(offsets) - 1)]
+
+
+def term_doc_freq(conn: sqlite3.Connection, term: str) -> int:
+    """
+    검색어가 들어 있는 문서 수. 1~2글자는 저장된 정확한 값,
+    3글자 이상은 구성 bigram 문서 수의 최솟값(상한 추정)입니다.
+    """
+    if len(term) <= 2:
+        return _gram_doc_count(conn, term)
+    return min(_gram_doc_count(conn, term[i : i + 2]) for i in range(len(term) - 1))
+
+
+def corpus_stats(conn: sqlite3.Connection, terms: List[str]) -> CorpusStats:
+    """서재 전체 기준 순위 통계 (문서 수, 평균 길이, 검색어별 문서 빈도). 색인에 저장된 값만 읽습니다."""
+    doc_count, total_length = conn.execute("SELECT doc_count, total_length FROM corpus WHERE id = 0").fetchone()
+    doc_freq = {term: term_doc_freq(conn, term) for term in terms}
+    avg_length = total_length / doc_count if doc_count else 0.0
+    return CorpusStats(doc_count, avg_length, doc_freq)
+
+
+def match_documents(files: Iterable[str], query: SearchQuery) -> List[DocMatch]:
+    """
+    색인으로 조건을 만족하는 문서를 찾습니다. (files 순서 유지)
+    - 제외어가 하나라도 있는 문서 제외, 어구/필수어는 모두, 일반 검색어는 하나 이상 포함
+    - 검색어가 둘 이상이면 모든 검색어가 query.window 글자 안에 함께 나오는 곳이 있어야 함
+    refresh_text_index 로 색인을 최신화한 뒤 호출해야 합니다.
+    """
+    conn = _connect_text_index()
+    try:
+        doc_paths = {path: doc_id for doc_id, path in conn.execute("SELECT id, path FROM docs")}
+        order: List[Tuple[str, int]] = []
+        for path in files:
+            doc_id = doc_paths.get(os.path.abspath(path))
+            if doc_id is not None:
+                order.append((path, doc_id))
+        docs = {doc_id for _, doc_id in order}
+
+        for term in query.exclude:
+            if term:
+                docs -= term_positions(conn, term, docs).keys()
+
+        positions: Dict[str, Dict[int, List[int]]] = {}
+        for term in query.phrases + query.include:
+            if not term:
+                continue
+            if term not in positions:
+                positions[term] = term_positions(conn, term, docs)
+            docs &= positions[term].keys()
+
+        if query.normal:
+            any_normal: Set[int] = set()
+            for term in query.normal:
+                if term not in positions:
+                    positions[term] = term_positions(conn, term, docs)
+                any_normal |= positions[term].keys()
+            docs &= any_normal
+
+        terms = [t for t in dict.fromkeys(query.positive_terms) if t]
+        hits: Dict[int, Optional[Tuple[int, int]]] = {}
+        for doc_id in docs:
+            doc_pos = {t: positions[t].get(doc_id, []) for t in terms}
+            if len(terms) > 1:
+                hit = find_proximity_hit(doc_pos, terms, query.window)
+                if hit is None:
+                    continue
+            elif terms:
+                hit = (doc_pos[terms[0]][0], doc_pos[terms[0]][0] + len(terms[0]))
+            else:
+                hit = None
+            hits[doc_id] = hit
+
+        offsets: Dict[int, Optional[List[int]]] = {}
+        lengths: Dict[int, int] = {}
+        if hits:
+            placeholders = ",".join("?" * len(hits))
+            for doc_id, length, blob in conn.execute(
+                f"SELECT id, length, offsets FROM docs WHERE id IN ({placeholders})", list(hits)
+            ):
+                lengths[doc_id] = length
+                if blob is not None:
+                    offsets[doc_id] = _decode_positions(blob)
+        stats = corpus_stats(conn, terms) if terms and hits else None
+    finally:
+        conn.close()
+
+    results: List[DocMatch] = []
+    for path, doc_id in order:
+        if doc_id not in hits:
+            continue
+        doc_offsets = offsets.get(doc_id)
+        orig_positions = {
+            t: [_to_original(doc_offsets, p) for p in positions.get(t, {}).get(doc_id, [])]
+            for t in query.positive_terms
+        }
+        hit = hits[doc_id]
+        if hit is not None:
+            hit = (_to_original(doc_offsets, hit[0]), _to_original(doc_offsets, hit[1] - 1) + 1)
+
+        score = 0.0
+        if stats is not None:
+            body_tf = {t: len(positions[t].get(doc_id, [])) for t in terms}
+            title = normalize_text(os.path.splitext(os.path.basename(path))[0])
+            title_tf = {t: title.count(t) for t in terms}
+            score = bm25f_score(terms, body_tf, lengths.get(doc_id, 0), stats, title_tf)
+        results.append(DocMatch(path, orig_positions, hit, score))
+    return results
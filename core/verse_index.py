@@ -0,0 +1,355 @@
+import os
+import sqlite3
+from bisect import bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.bible_refs import get_reference_recognizer
+from core.bible_utils import get_ultimate_bible_map
+from core.cache_utils import file_signature, get_cache_path
+from core.file_reader import SUPPORTED_EXTS, read_file
+from core.parallel_scan import map_files_parallel
+from core.search_engine import scan_logos_markers
+from core.verse_keys import BOOK_STRIDE, book_id, split_verse_key, verse_key
+
+# ========== 서재 전체 절 태그 인덱스 (영구 저장) ==========
+# 로고스 @Bible: 태그가 있는 모든 문서를 한 번 색인하여
+#   (표준 책 코드, 장, 절) -> [(파일, 본문 시작, 본문 끝), ...]
+# 을 SQLite 에 저장합니다.
+# - 절 검색 시 해당 절이 실제로 들어 있는 파일만 열면 됩니다. (candidate_files)
+#   로고스 태그 결과는 search_document 가 그 파일들에서 서론까지 포함해 다시 만들고,
+#   저장한 본문 범위는 본문 언급 결과(mention_results)에만 씁니다.
+# - 파일의 (mtime, size) 가 바뀐 경우에만 다시 색인합니다.
+# - 오프셋은 core.file_reader.read_file 로 추출한 텍스트 기준의 문자 위치입니다.
+#
+# 태그가 없는 설교/주석 문서(.txt/.docx/.pdf 등)도 절 검색에 걸리도록,
+# 본문에 쓰인 자연어 참조("요한복음 6장 26절", "요 6:26-29")를 core.bible_refs 로 찾아
+# 같은 표에 kind=KIND_MENTION 으로 저장합니다. 본문 범위는 참조가 들어 있는 문단입니다.
+# (로고스 태그 안의 책 이름/장절은 언급으로 중복 저장하지 않음)
+#
+# 장 표지([[@Bible:Joh 6]], 절 없음)도 kind=KIND_CHAPTER, 절 0 으로 저장합니다.
+# search_document 는 절 검색에서도 그 책의 장 표지/0:0/N:0 서론을 함께 돌려주므로,
+# 후보 파일을 고를 때 이 표지들이 있는 파일도 포함해야 결과가 빠지지 않습니다.
+#
+# 조회는 절 키(core.verse_keys, BBCCCVVV 정수) 열 vkey 하나로 합니다.
+# 책 전체는 키 범위 하나, 여러 절은 정수 IN 으로 찾습니다. (표준 책 코드가 아닌 태그는 vkey 가 NULL)
+
+VERSE_INDEX_DB = "verse_index.db"
+# 테이블 구조나 색인 규칙이 바뀌면 올려서 기존 색인을 다시 만듭니다.
+VERSE_INDEX_VERSION = 5
+
+KIND_TAG = 0  # 로고스 @Bible: 절 태그 (본문 = 다음 태그 전까지)
+KIND_MENTION = 1  # 본문 속 자연어 참조 (본문 = 참조가 든 문단)
+KIND_CHAPTER = 2  # 로고스 장 표지 (절 없음, 절 0 으로 저장. 본문 범위 없음)
+
+# 언급 문단이 길면 참조 앞뒤로 이 글자 수까지만 잘라 보여 줍니다.
+MENTION_CONTEXT = 400
+# "1-50절" 처럼 넓은 범위 언급은 앞쪽 이 절 수까지만 색인합니다.
+MAX_MENTION_VERSES = 30
+
+# (책, 장, 절, 태그 시작, 본문 시작, 본문 끝, 종류)
+TagRow = Tuple[str, int, int, int, int, int, int]
+
+
+def _connect_verse_index() -> sqlite3.Connection:
+    conn = sqlite3.connect(get_cache_path(VERSE_INDEX_DB), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != VERSE_INDEX_VERSION:
+        conn.executescript(
+            f"""
+            DROP TABLE IF EXISTS tags;
+            DROP TABLE IF EXISTS files;
+            PRAGMA user_version={VERSE_INDEX_VERSION};
+            """
+        )
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY,
+            path TEXT UNIQUE NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            tag_count INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS tags (
+            book TEXT NOT NULL,
+            chapter INTEGER NOT NULL,
+            verse INTEGER NOT NULL,
+            file_id INTEGER NOT NULL,
+            tag_start INTEGER NOT NULL,
+            body_start INTEGER NOT NULL,
+            body_end INTEGER NOT NULL,
+            kind INTEGER NOT NULL DEFAULT 0,
+            vkey INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS idx_tags_ref ON tags (vkey);
+        CREATE INDEX IF NOT EXISTS idx_tags_file ON tags (file_id);
+        """
+    )
+    return conn
+
+
+def index_text_tags(text: str, bible_alias_flat: Dict[str, str]) -> List[TagRow]:
+    """
+    문서 텍스트의 절 태그와 자연어 참조를 색인 행으로 변환합니다.
+    각 절 태그 본문은 태그 끝에서 다음 태그 시작(없으면 문서 끝)까지입니다.
+    장 표지는 본문 없이 위치만 저장합니다.
+    """
+    markers = scan_logos_markers(text, bible_alias_flat)
+    tags = [m for m in markers if m.verse is not None]
+    rows: List[TagRow] = []
+    for i, m in enumerate(tags):
+        body_end = tags[i + 1].start if i + 1 < len(tags) else len(text)
+        rows.append((m.book, m.chapter, m.verse, m.start, m.end, body_end, KIND_TAG))
+    for m in markers:
+        if m.verse is None:
+            rows.append((m.book, m.chapter, 0, m.start, m.end, m.end, KIND_CHAPTER))
+    rows.extend(index_text_mentions(text, [(m.start, m.end) for m in markers]))
+    return rows
+
+
+def _paragraph_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    """참조가 들어 있는 문단 (빈 줄 기준) 범위. 너무 길면 참조 앞뒤 MENTION_CONTEXT 자로 자름"""
+    lo = text.rfind("\n\n", 0, start)
+    lo = 0 if lo == -1 else lo + 2
+    hi = text.find("\n\n", end)
+    hi = len(text) if hi == -1 else hi
+    if start - lo > MENTION_CONTEXT:
+        lo = start - MENTION_CONTEXT
+        # 단어 중간에서 잘리지 않도록 다음 공백 뒤부터
+        space = text.find(" ", lo, start)
+        lo = space + 1 if space != -1 else lo
+    if hi - end > MENTION_CONTEXT:
+        hi = end + MENTION_CONTEXT
+        space = text.rfind(" ", end, hi)
+        hi = space if space != -1 else hi
+    return lo, hi
+
+
+def index_text_mentions(text: str, skip_spans: List[Tuple[int, int]]) -> List[TagRow]:
+    """
+    본문의 자연어 성경 참조(절까지 있는 것)를 색인 행으로 변환합니다.
+    skip_spans(위치 순 정렬) 안의 참조는 건너뜁니다. (로고스 태그 자체)
+    """
+    starts = [s for s, _ in skip_spans]
+    rows: List[TagRow] = []
+    for ref in get_reference_recognizer().finditer(text, chapter_only=False):
+        i = bisect_right(starts, ref.start) - 1
+        if i >= 0 and ref.start < skip_spans[i][1]:
+            continue
+        body_start, body_end = _paragraph_span(text, ref.start, ref.end)
+        last = ref.verse_to if ref.verse_to is not None else ref.verse_from
+        last = min(last, ref.verse_from + MAX_MENTION_VERSES - 1)
+        for verse in range(ref.verse_from, last + 1):
+            rows.append((ref.book, ref.chapter, verse, ref.start, body_start, body_end, KIND_MENTION))
+    return rows
+
+
+_worker_alias_flat: Optional[Dict[str, str]] = None
+
+
+def compute_file_tags(path: str) -> List[TagRow]:
+    """파일 하나의 색인 행 계산 (프로세스 풀 워커에서 실행)"""
+    global _worker_alias_flat
+    if _worker_alias_flat is None:
+        _worker_alias_flat = get_ultimate_bible_map()[0]
+    text = read_file(path)
+    if not text:
+        return []
+    if "@bible:" not in text.lower():
+        return index_text_mentions(text, [])
+    return index_text_tags(text, _worker_alias_flat)
+
+
+def _store_file_tags(conn: sqlite3.Connection, sig: Tuple[str, int, int], rows: List[TagRow]) -> None:
+    abs_path, mtime_ns, size = sig
+    old = conn.execute("SELECT id FROM files WHERE path=?", (abs_path,)).fetchone()
+    if old:
+        conn.execute("DELETE FROM tags WHERE file_id=?", (old[0],))
+        conn.execute(
+            "UPDATE files SET mtime_ns=?, size=?, tag_count=? WHERE id=?",
+            (mtime_ns, size, len(rows), old[0]),
+        )
+        file_id = old[0]
+    else:
+        cur = conn.execute(
+            "INSERT INTO files (path, mtime_ns, size, tag_count) VALUES (?, ?, ?, ?)",
+            (abs_path, mtime_ns, size, len(rows)),
+        )
+        file_id = cur.lastrowid
+    book_ids = {book: book_id(book) for book in {row[0] for row in rows}}
+    conn.executemany(
+        "INSERT INTO tags (book, chapter, verse, file_id, tag_start, body_start, body_end, kind, vkey) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (book, chap, verse, file_id, s, b, e, kind, verse_key(book_ids[book], chap, verse) if book_ids[book] else None)
+            for book, chap, verse, s, b, e, kind in rows
+        ],
+    )
+
+
+def refresh_verse_index(
+    files: Iterable[str],
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+) -> int:
+    """
+    파일 목록 중 새로 생겼거나 수정된 파일만 다시 색인합니다.
+    progress_callback(완료 수, 전체 수, 경로) 로 진행 상황을 알릴 수 있습니다.
+    반환: 다시 색인한 파일 수
+    """
+    conn = _connect_verse_index()
+    try:
+        known = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in conn.execute("SELECT path, mtime_ns, size FROM files")
+        }
+
+        stale: List[str] = []
+        sigs: Dict[str, Tuple[str, int, int]] = {}
+        for path in files:
+            if os.path.splitext(path)[1].lower() not in SUPPORTED_EXTS:
+                continue
+            sig = file_signature(path)
+            if sig is None:
+                continue
+            if known.get(sig[0]) != (sig[1], sig[2]):
+                stale.append(sig[0])
+                sigs[sig[0]] = sig
+
+        for done, (_, path, rows) in enumerate(map_files_parallel(compute_file_tags, stale)):
+            # 워커가 실패한 파일(None)은 "태그 없음"으로 저장하지 않고 두어 다음 갱신 때 다시 색인
+            if rows is not None:
+                _store_file_tags(conn, sigs[path], rows)
+            if progress_callback:
+                progress_callback(done + 1, len(stale), path)
+
+        # 디스크에서 사라진 파일의 색인 정리
+        gone = [(fid,) for fid, path in conn.execute("SELECT id, path FROM files") if not os.path.exists(path)]
+        if gone:
+            conn.executemany("DELETE FROM tags WHERE file_id=?", gone)
+            conn.executemany("DELETE FROM files WHERE id=?", gone)
+
+        conn.commit()
+        return len(stale)
+    finally:
+        conn.close()
+
+
+def _verse_keys(book_num: int, chap: str, verses: List[str]) -> List[int]:
+    """검색 입력(장, 절 문자열 목록) → 절 키 목록 (숫자가 아니면 뺌)"""
+    if not str(chap).isdigit():
+        return []
+    return [verse_key(book_num, int(chap), int(v)) for v in verses if str(v).isdigit()]
+
+
+def candidate_files(
+    files: Iterable[str],
+    book: str,
+    chap: str,
+    verses: List[str],
+    mode: str,
+) -> List[str]:
+    """
+    전수 조사 대상 파일 목록을 색인으로 좁힙니다. (원래 순서 유지)
+    - verse 모드: 요청한 절 태그가 하나라도 있는 파일
+                  + search_document 가 함께 돌려주는 서론 표지(책 0:0, 해당 장 N:0, 그 책의 장 표지)가 있는 파일
+    - 서론 모드 : 해당 책의 태그나 장 표지가 있는 파일
+    로고스 표지만 봅니다. 자연어 언급만 있는 파일은 mention_results 로 조회합니다.
+    refresh_verse_index 로 색인을 최신화한 뒤 호출해야 합니다.
+    """
+    book_num = book_id(book)
+    if not book_num:
+        return []
+    if mode == "verse":
+        keys = _verse_keys(book_num, chap, verses)
+        if not keys:
+            return []
+    conn = _connect_verse_index()
+    try:
+        # 책 전체 = 절 키 범위 [책 * BOOK_STRIDE, (책 + 1) * BOOK_STRIDE)
+        book_lo, book_hi = book_num * BOOK_STRIDE, (book_num + 1) * BOOK_STRIDE
+        if mode == "verse":
+            # 절 태그 + 책 서론(0:0) / 장 서론(N:0) 태그
+            tag_keys = [*keys, book_lo, verse_key(book_num, int(chap), 0)]
+            placeholders = ",".join("?" * len(tag_keys))
+            rows = conn.execute(
+                f"""
+                SELECT DISTINCT f.path FROM tags t JOIN files f ON f.id = t.file_id
+                WHERE (t.vkey IN ({placeholders}) AND t.kind=?)
+                   OR (t.vkey >= ? AND t.vkey < ? AND t.kind=?)
+                """,
+                (*tag_keys, KIND_TAG, book_lo, book_hi, KIND_CHAPTER),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT DISTINCT f.path FROM tags t JOIN files f ON f.id = t.file_id "
+                "WHERE t.vkey >= ? AND t.vkey < ? AND t.kind IN (?, ?)",
+                (book_lo, book_hi, KIND_TAG, KIND_CHAPTER),
+            ).fetchall()
+    finally:
+        conn.close()
+
+    hits = {path for (path,) in rows}
+    return [p for p in files if os.path.abspath(p) in hits]
+
+
+def mention_results(
+    files: Iterable[str],
+    book: str,
+    chap: str,
+    verses: List[str],
+) -> Dict[str, str]:
+    """
+    본문에 자연어로 해당 절을 언급한 파일별 결과 문자열 (search_document 와 같은 형식)
+    절마다 "#### [책 장:절 (본문 언급)]" 아래에 참조가 든 문단을 모읍니다. 같은 문단은 한 번만 넣습니다.
+    반환: {files 의 경로: 결과 문자열}
+    refresh_verse_index 로 색인을 최신화한 뒤 호출해야 합니다.
+    """
+    book_num = book_id(book)
+    keys = _verse_keys(book_num, chap, verses) if book_num else []
+    if not keys:
+        return {}
+    by_abs = {os.path.abspath(p): p for p in files}
+    if not by_abs:
+        return {}
+
+    conn = _connect_verse_index()
+    try:
+        placeholders = ",".join("?" * len(keys))
+        rows = conn.execute(
+            f"""
+            SELECT f.path, t.vkey, t.body_start, t.body_end FROM tags t JOIN files f ON f.id = t.file_id
+            WHERE t.vkey IN ({placeholders}) AND t.kind=?
+            ORDER BY f.path, t.vkey, t.tag_start
+            """,
+            (*keys, KIND_MENTION),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    passages: Dict[str, Dict[int, List[Tuple[int, int]]]] = {}
+    for path, key, start, end in rows:
+        if path not in by_abs:
+            continue
+        spans = passages.setdefault(path, {}).setdefault(split_verse_key(key)[2], [])
+        if (start, end) not in spans:
+            spans.append((start, end))
+
+    results: Dict[str, str] = {}
+    for path, by_verse in passages.items():
+        text = read_file(path)
+        seen = set()
+        parts = []
+        for verse, spans in by_verse.items():
+            bodies = []
+            for start, end in spans:
+                if (start, end) in seen:
+                    continue
+                seen.add((start, end))
+                body = text[start:end].strip()
+                if body:
+                    bodies.append(body)
+            if bodies:
+                parts.append(f"#### [{book} {chap}:{verse} (본문 언급)]\n" + "\n\n".join(bodies))
+        if parts:
+            results[by_abs[path]] = "\n\n".join(parts)
+    return results
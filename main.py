@@ -18,12 +18,8 @@
 import streamlit as st
 import ollama
 from groq import Groq
-import os, re, sqlite3, warnings, glob, zlib
-import fitz  # PyMuPDF
+import os, re, warnings, glob
 from docx import Document
-from bs4 import BeautifulSoup
-import ebooklib
-from ebooklib import epub
 from io import BytesIO
 import streamlit.components.v1 as components
 import platform
@@ -37,9 +33,28 @@ client = Groq(api_key="")  # ← 여기에 본인의 Groq API 키를 입력하
 from datetime import datetime
 from collections import defaultdict
 import json
+from core.bible_refs import get_reference_recognizer
 from core.bible_utils import decode_rtf, get_ultimate_bible_map
-from core.commentary_utils import load_commentaries_for_path, scan_commentary_files
-from core.search_engine import parse_reference, fetch_intro, fetch_bible_text
+from core.bible_versions import get_parallel_versions
+from core.commentary_fts import get_build_status, search_commentary_index, start_background_refresh
+from core.commentary_utils import get_commentaries_for_verses, scan_commentary_files
+from core.content_store import get_content, make_preview, put_content
+from core.db_pool import pooled_connection
+from core.file_reader import read_file as read_file_cached
+from core.lexicon_keys import get_lexicon_key_index
+from core.lexicon_utils import (
+    detect_index_column,
+    get_lexicon_build_status,
+    lookup_lexicon,
+    start_background_lexicon_build,
+)
+from core.parallel_scan import scan_files_parallel
+from core.ranking import display_score
+from core.result_heap import TopK
+from core.search_engine import parse_reference, resolve_book, search_document
+from core.text_index import match_documents, parse_search_query, refresh_text_index
+from core.verse_index import candidate_files, mention_results, refresh_verse_index
+from core.verse_keys import book_code, book_id, clamp_verses
 
 warnings.filterwarnings('ignore')
 
@@ -71,158 +86,25 @@ def detect_dictionary_index_column(db_path):
     """사전 DB의 인덱스 컬럼명을 자동 탐지합니다."""
     if not os.path.exists(db_path):
         return None
-    
-    try:
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        
-        # topics 테이블의 컬럼 구조 확인
-        cur.execute("PRAGMA table_info(topics)")
-        columns = [col[1] for col in cur.fetchall()]
-        conn.close()
-        
-        # 일반적인 인덱스 컬럼명 우선순위
-        priority_columns = ['subject', 'topic', 'key', 'word', 'entry', 'term', 'id']
-        
-        for col in priority_columns:
-            if col in columns:
-                return col
-        
-        # 우선순위에 없으면 첫 번째 컬럼 반환
-        return columns[0] if columns else None
-        
-    except Exception:
-        return None
-
-# --- [NEW] 사전에서 사용 가능한 인덱스 목록 가져오기 ---
-@st.cache_data(show_spinner=False)
-def get_dictionary_index_samples(db_path, index_column, limit=20):
-    """사전에서 인덱스 샘플을 가져옵니다."""
-    if not os.path.exists(db_path) or not index_column:
-        return []
-    
-    try:
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        cur.execute(f"SELECT DISTINCT {index_column} FROM topics LIMIT ?", (limit,))
-        samples = [row[0] for row in cur.fetchall() if row[0]]
-        conn.close()
-        return samples
-    except Exception:
-        return []
+    return detect_index_column(db_path)
 
 # ===================================================================
-# ★★★ 핵심 수정: 사전 검색 및 텍스트 정제 함수 (전면 재작성) ★★★
-# 수정 이유:
-#   - 기존 clean_lexicon_text_advanced()는 RTF \u 명령어를 삭제 후
-#     16진수로 재해석하는 이중 오류로 한글·헬라어·히브리어가 깨짐
-#   - BeautifulSoup str(soup) 변환 시 <br></p> 등 태그가 그대로 노출됨
-# 수정 방향:
-#   - core/bible_utils.py의 decode_rtf()를 핵심 디코딩에 사용 (10진수 \u 정확 처리)
-#   - HTML 태그는 BeautifulSoup .get_text()로 텍스트만 추출
-#   - zlib 압축 blob 지원 유지 (Mickelson's Strong 등)
+# ★★★ 핵심 수정: 사전 검색 및 텍스트 정제 함수 ★★★
+# 디코딩 과정(zlib 압축 blob, HTML 태그, RTF 유니코드 10진수, latin-1 깨짐 복구)은
+# core/lexicon_utils.py 에 있으며, 디코딩된 평문은 사전별 영구 저장소에 보관되어
+# 같은 키(예: G26)는 재시작 후에도 한 번의 키 조회로 읽힙니다.
 # ===================================================================
 
 @st.cache_data(show_spinner=False)
 def get_lexicon_enhanced(db_path, search_term, index_column):
     """
     통합 사전 검색 함수 - 한글, 헬라어, 히브리어, 영어 모두 정상 출력
-    1. 바이블렉스 (bible.dct.twm): RTF 유니코드 10진수 -> decode_rtf()
-    2. Bullinger-App: 일반 텍스트
-    3. Mickelson's Strong: zlib 압축 blob -> 압축해제 -> decode_rtf()
-    4. 70인역, 킹제임스스트롱, 한글스트롱: RTF 유니코드 10진수 -> decode_rtf()
+    반환: (평문, 해설창용 HTML) / 없으면 (None, None)
     """
     if not os.path.exists(db_path) or not index_column:
         return None, None
-
     try:
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-
-        # data, data2 모두 추출 시도
-        try:
-            query = f"SELECT c.data, c.data2 FROM content c JOIN topics t ON c.topic_id = t.id WHERE t.{index_column} = ? LIMIT 1"
-            cur.execute(query, (search_term.strip(),))
-            row = cur.fetchone()
-        except Exception:
-            # data2 컬럼 없는 사전은 data만 추출
-            try:
-                query = f"SELECT c.data FROM content c JOIN topics t ON c.topic_id = t.id WHERE t.{index_column} = ? LIMIT 1"
-                cur.execute(query, (search_term.strip(),))
-                r = cur.fetchone()
-                row = (r[0], None) if r else None
-            except Exception:
-                row = None
-        conn.close()
-
-        if not row:
-            return None, None
-
-        raw_data, blob_data = row[0], row[1] if len(row) > 1 else None
-        content = ""
-
-        # === 1단계: zlib 압축 blob 처리 (Mickelson's Strong 등) ===
-        if blob_data and isinstance(blob_data, bytes):
-            try:
-                decompressed = zlib.decompress(blob_data)
-                content = decompressed.decode('utf-8', errors='ignore')
-            except Exception:
-                try:
-                    content = blob_data.decode('utf-8', errors='ignore')
-                except Exception:
-                    content = str(blob_data)
-
-        # === 2단계: 일반 data 처리 ===
-        elif raw_data:
-            if isinstance(raw_data, bytes):
-                content = raw_data.decode('utf-8', errors='ignore')
-            else:
-                content = str(raw_data)
-
-        if not content:
-            return None, None
-
-        # === 3단계: HTML 우선 처리 (CWSD 등 HTML 포함 사전) ===
-        # decode_rtf() 전에 HTML을 먼저 처리해야 <grk><trn> 등 태그가 제거됨
-        # decode_rtf() 이후에는 HTML이 이스케이프되어 태그 인식 불가
-        if re.search(r'<[a-zA-Z/][^>]*>', content):
-            try:
-                soup = BeautifulSoup(content, 'html.parser')
-                for tag in soup(['script', 'style']):
-                    tag.decompose()
-                for br in soup.find_all(['br', 'p', 'div', 'li', 'h1', 'h2', 'h3', 'h4']):
-                    br.insert_before('\n')
-                # 비표준 태그(<grk><trn><a class=T> 등) 포함 모든 태그 제거
-                content = soup.get_text(separator='')
-            except Exception:
-                content = re.sub(r'<[^>]+>', '', content)
-
-        # === 4단계: 핵심 디코딩 - decode_rtf() 사용 ===
-        # RTF 유니코드 10진수(\u-숫자) 방식 정확 처리
-        # 한글·헬라어·히브리어 모두 올바르게 변환됨
-        plain_text = decode_rtf(content)
-
-        # === 5단계: latin-1/cp1252 인코딩 깨짐 복구 (Lxx 등) ===
-        if re.search(r'[\xe0-\xff]{2,}', plain_text):
-            try:
-                recovered = plain_text.encode('latin-1').decode('utf-8', errors='ignore')
-                before_count = len(re.findall(r'[\u0370-\u03FF\u0590-\u05FF\uAC00-\uD7A3]', plain_text))
-                after_count  = len(re.findall(r'[\u0370-\u03FF\u0590-\u05FF\uAC00-\uD7A3]', recovered))
-                if after_count > before_count:
-                    plain_text = recovered
-            except Exception:
-                pass
-
-        # === 6단계: 공백 및 깨진 물음표 정리 ===
-        plain_text = re.sub(r'([\u0590-\u05FF\u0370-\u03FF\uAC00-\uD7A3])\?', r'\1', plain_text)
-        plain_text = re.sub(r'\n{3,}', '\n\n', plain_text)
-        plain_text = plain_text.strip()
-
-        # === 7단계: HTML 표시용 변환 ===
-        html_content = plain_text.replace('\n', '<br>')
-
-        return plain_text, html_content
-
+        return lookup_lexicon(db_path, search_term, index_column)
     except Exception:
         return None, None
 
@@ -235,37 +117,6 @@ def get_lexicon_enhanced(db_path, search_term, index_column):
 
 # ========== [NEW] 6가지 개선사항 함수들 ==========
 
-# [NEW 1] 관련도 점수 계산 함수
-def calculate_relevance_score(content, search_query):
-    """검색어와 문서의 관련도 점수를 계산합니다."""
-    if not content or not search_query:
-        return 0
-
-    content_lower = content.lower()
-    query_lower = search_query.lower()
-
-    # 조건 검색 파싱
-    words = query_lower.split()
-    search_terms = [w[1:] if w.startswith(('+', '-')) else w for w in words if not w.startswith('-')]
-
-    score = 0
-    for term in search_terms:
-        # 출현 빈도 점수
-        count = content_lower.count(term)
-        score += count * 10
-
-        # 위치 점수 (앞부분에 나올수록 높은 점수)
-        first_pos = content_lower.find(term)
-        if first_pos != -1:
-            if first_pos < len(content) * 0.1:
-                score += 50
-            elif first_pos < len(content) * 0.3:
-                score += 30
-            elif first_pos < len(content) * 0.5:
-                score += 15
-
-    return score
-
 # [NEW 2] 검색 히스토리 관리 함수
 def save_search_history(query):
     """검색어를 히스토리에 저장"""
@@ -344,18 +195,28 @@ def search_bible_sqlite(query):
         return []
 
 # --- [NEW] 개선된 일반 파일 검색 기능 정의 ---
-def search_files_advanced(query, selected_folders=None, include_extensions=None):
+SEARCH_TOP_K = 200  # 파일 검색 결과 최대 건수 (관련도 상위)
+SEARCH_PAGE_SIZE = 10  # 에이전트 검색 결과 한 페이지에 표시할 건수
+
+
+def iter_search_files_advanced(query, selected_folders=None, include_extensions=None, top_k=SEARCH_TOP_K):
     """
     향상된 파일 검색 기능 v2.0
     - 조건 검색 지원: +필수단어, -제외단어
     - 어구 검색: 따옴표로 묶인 구문 정확히 검색 (예: "인간의 죄", '하나님의 사랑')
-    - 주제어 검색: 컨텍스트 기반 스니펫 추출 (검색어 간격 20자 이내)
+    - 주제어 검색: 컨텍스트 기반 스니펫 추출 (검색어 간격 20자 이내, ~N 으로 변경 가능)
+      문서 안의 모든 출현 위치를 대상으로 판정 (첫 일치 위치만 보지 않음)
+    - 한글 자모/공백·줄바꿈, 그리스어 악센트, 히브리어 모음 부호 차이는 무시
     - 다양한 파일 형식 지원
 
     Args:
-        query: 검색어 (예: "+사랑 -미움", "인간의 죄", "'하나님의 사랑'")
+        query: 검색어 (예: "+사랑 -미움", "인간의 죄", "'하나님의 사랑'", "은혜 믿음 ~50")
         selected_folders: 검색할 폴더 리스트
         include_extensions: 검색할 파일 확장자 리스트
+        top_k: 관련도 상위 몇 건까지 결과로 만들지 (색인 점수로 먼저 고른 뒤 해당 파일만 읽음)
+
+    결과는 관련도 순으로 하나씩 yield 되며, 전체 본문 대신 스니펫과 파일 경로('path')만 담습니다.
+    전체 본문이 필요할 때는 expand_search_result()로 그때 읽어 붙입니다.
     """
     if selected_folders is None:
         selected_folders = ["."]
@@ -363,41 +224,9 @@ def search_files_advanced(query, selected_folders=None, include_extensions=None)
     if include_extensions is None:
         include_extensions = ['.txt', '.rtf', '.docx', '.pdf', '.epub', '.html', '.htm']
 
-    # 어구 검색 파싱 (따옴표로 묶인 구문 추출)
-    phrase_terms = []  # 어구 검색어 (따옴표로 묶인 것)
-
-    # 쌍따옴표로 묶인 구문 추출
-    double_quote_phrases = re.findall(r'"([^"]+)"', query)
-    phrase_terms.extend(double_quote_phrases)
-
-    # 홑따옴표로 묶인 구문 추출
-    single_quote_phrases = re.findall(r"'([^']+)'", query)
-    phrase_terms.extend(single_quote_phrases)
-
-    # 따옴표로 묶인 부분을 제거한 나머지 쿼리
-    remaining_query = re.sub(r'"[^"]+"', '', query)
-    remaining_query = re.sub(r"'[^']+'", '', remaining_query)
-
-    # 조건 검색 파싱
-    include_terms = []  # +로 시작하는 필수 단어
-    exclude_terms = []  # -로 시작하는 제외 단어
-    normal_terms = []   # 일반 검색어
-
-    words = remaining_query.split()
-    for word in words:
-        if not word.strip():
-            continue
-        if word.startswith('+'):
-            include_terms.append(word[1:].lower())
-        elif word.startswith('-'):
-            exclude_terms.append(word[1:].lower())
-        else:
-            normal_terms.append(word.lower())
-
-    # 모든 검색어를 하나로 통합 (일반 검색어 + 필수 단어)
-    all_search_terms = normal_terms + include_terms + [p.lower() for p in phrase_terms]
-
-    results = []
+    # 어구("..." / '...'), +필수, -제외, ~N(근접 거리), 일반 검색어 파싱 (색인과 같은 규칙으로 정규화)
+    parsed = parse_search_query(query)
+    all_search_terms = parsed.positive_terms
 
     # 파일 수집
     files_to_search = []
@@ -410,150 +239,119 @@ def search_files_advanced(query, selected_folders=None, include_extensions=None)
                         if not file.startswith('.'):
                             files_to_search.append(os.path.join(root, file))
 
-    # 파일 검색 수행
-    for file_path in files_to_search:
+    # 역색인 갱신 (새로 생겼거나 수정된 파일만) 후, 조건 판정은 색인의 위치 목록으로 처리
+    refresh_text_index(files_to_search)
+
+    # [NEW 1] 관련도(BM25F) 상위 top_k 건만 남김 - 파일을 열기 전에 색인 점수로 선별
+    top = TopK(top_k)
+    for match in match_documents(files_to_search, parsed):
+        top.push(match.score, match)
+
+    # 선별된 파일만 열어 스니펫 생성 (관련도 순으로 하나씩 반환)
+    for match in top.items():
+        file_path = match.path
         try:
             content = read_file(file_path)
             if not content:
                 continue
 
-            content_lower = content.lower()
-
-            # 제외 단어 체크
-            should_skip = False
-            for exclude_term in exclude_terms:
-                if exclude_term in content_lower:
-                    should_skip = True
-                    break
+            # 결과 생성 - 컨텍스트 기반 스니펫 추출
+            # (근접 조건은 색인에서 모든 출현 위치에 대해 이미 판정됨, match.hit 는 원문 기준 일치 구간)
+            if match.hit is not None:
+                hit_start, hit_end = match.hit
 
-            if should_skip:
-                continue
+                # 앞뒤 200자씩 추출 (컨텍스트 포함)
+                start = max(0, hit_start - 200)
+                end = min(len(content), hit_end + 200)
+                snippet = content[start:end]
 
-            # 어구 검색 체크 (정확한 매칭)
-            if phrase_terms:
-                has_all_phrases = True
-                for phrase in phrase_terms:
-                    if phrase.lower() not in content_lower:
-                        has_all_phrases = False
-                        break
-
-                if not has_all_phrases:
-                    continue
-
-            # 필수 단어 체크 (모두 포함되어야 함)
-            has_all_required = True
-            for include_term in include_terms:
-                if include_term not in content_lower:
-                    has_all_required = False
-                    break
+                # 앞뒤 생략 표시
+                if start > 0:
+                    snippet = "..." + snippet
+                if end < len(content):
+                    snippet = snippet + "..."
 
-            if not has_all_required:
-                continue
+                # 매칭 개수 (색인의 위치 목록 기준)
+                match_count = sum(len(match.positions.get(term, [])) for term in all_search_terms)
 
-            # 일반 검색어 체크 (하나라도 포함되면 OK)
-            if normal_terms:
-                has_any_normal = False
-                for normal_term in normal_terms:
-                    if normal_term in content_lower:
-                        has_any_normal = True
-                        break
-
-                if not has_any_normal:
-                    continue
-
-            # 결과 생성 - 컨텍스트 기반 스니펫 추출 (20자 간격)
-            if all_search_terms or phrase_terms:
-                # 어구 검색 먼저 확인
-                first_match_pos = -1
-                matched_term = ""
-
-                # 어구 검색 우선
-                for phrase in phrase_terms:
-                    pos = content.lower().find(phrase.lower())
-                    if pos != -1:
-                        if first_match_pos == -1 or pos < first_match_pos:
-                            first_match_pos = pos
-                            matched_term = phrase
-
-                # 어구 검색에서 못 찾았으면 개별 검색어로
-                if first_match_pos == -1:
-                    for term in all_search_terms:
-                        pos = content_lower.find(term)
-                        if pos != -1:
-                            if first_match_pos == -1 or pos < first_match_pos:
-                                first_match_pos = pos
-                                matched_term = term
-
-                if first_match_pos != -1:
-                    # 검색어 간격 검증 (복합 검색어의 경우 20자 이내에 모두 있어야 함)
-                    if len(all_search_terms) > 1 or len(phrase_terms) > 0:
-                        # 20자 윈도우 내에서 모든 검색어 확인
-                        window_size = 20
-                        all_terms_to_check = all_search_terms + [p.lower() for p in phrase_terms]
-
-                        # 첫 검색어 기준으로 윈도우 설정
-                        window_start = max(0, first_match_pos - window_size)
-                        window_end = min(len(content), first_match_pos + len(matched_term) + window_size)
-                        window_content = content[window_start:window_end].lower()
-
-                        # 윈도우 내에 모든 검색어가 있는지 확인
-                        all_found_in_window = all(term in window_content for term in all_terms_to_check if term != matched_term)
-
-                        if not all_found_in_window and len(all_terms_to_check) > 1:
-                            # 검색어가 20자 이내에 없으면 스킵
-                            continue
-
-                    # 앞뒤 200자씩 추출 (컨텍스트 포함)
-                    start = max(0, first_match_pos - 200)
-                    end = min(len(content), first_match_pos + len(matched_term) + 200)
-                    snippet = content[start:end]
-
-                    # 앞뒤 생략 표시
-                    if start > 0:
-                        snippet = "..." + snippet
-                    if end < len(content):
-                        snippet = snippet + "..."
-
-                    # 모든 매칭 위치 찾기
-                    all_matches = []
-                    for term in all_search_terms:
-                        pos = 0
-                        while True:
-                            pos = content_lower.find(term, pos)
-                            if pos == -1:
-                                break
-                            all_matches.append(pos)
-                            pos += 1
-
-                    # 매칭 개수 표시
-                    match_count = len(all_matches)
-
-                    # [NEW 1] 관련도 점수 계산
-                    relevance_score = calculate_relevance_score(content, query)
-
-                    results.append({
-                        'file': os.path.basename(file_path),
-                        'content': f"[검색어 '{query}' - {match_count}건 발견]\n\n{snippet}\n\n--- 전체 내용 ---\n{content}",
-                        'relevance_score': relevance_score
-                    })
+                yield {
+                    'file': os.path.basename(file_path),
+                    'content': f"[검색어 '{query}' - {match_count}건 발견]\n\n{snippet}",
+                    'relevance_score': display_score(match.score),
+                    'path': file_path,
+                }
             else:
-                # 검색어 없이 조건만 있는 경우 (예: "-인내")
-                # [NEW 1] 관련도 점수 계산
-                relevance_score = calculate_relevance_score(content, query)
-
-                results.append({
+                # 검색어 없이 조건만 있는 경우 (예: "-인내") - 관련도 점수 없음, 앞부분만 미리보기
+                yield {
                     'file': os.path.basename(file_path),
-                    'content': content,
-                    'relevance_score': relevance_score
-                })
+                    'content': content[:300] + ("..." if len(content) > 300 else ""),
+                    'relevance_score': 0,
+                    'path': file_path,
+                    'preview_only': True,
+                }
 
         except Exception as e:
             continue
 
-    # [NEW 1] 관련도 점수로 정렬 (내림차순)
-    results.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
 
-    return results
+def search_files_advanced(query, selected_folders=None, include_extensions=None, top_k=SEARCH_TOP_K):
+    """iter_search_files_advanced 결과를 리스트로 반환 (관련도 내림차순, 최대 top_k 건)"""
+    return list(iter_search_files_advanced(query, selected_folders, include_extensions, top_k))
+
+
+# ========== 세션 항목 (본문은 공용 저장소에, 세션에는 id/미리보기만) ==========
+# 바구니/전수 조사 결과 항목: {'file', 'content_id', 'preview', ['header'], ['relevance_score']}
+#   - content_id: core.content_store 의 본문 id (같은 본문은 세션/사용자가 달라도 한 벌만 보관)
+#   - header: 파일 검색 결과의 스니펫 ("--- 전체 내용 ---" 앞에 붙는 부분)
+# 검색 결과처럼 짧은 스니펫만 가진 항목은 예전처럼 'content' 를 그대로 둡니다.
+
+def store_item(file, content, **extra):
+    """본문을 공용 저장소에 넣고, 세션에 둘 가벼운 항목을 만듭니다."""
+    return {'file': file, 'content_id': put_content(content), 'preview': make_preview(content), **extra}
+
+
+def item_content(item):
+    """항목의 전체 본문 (저장소에서 꺼냄)"""
+    if 'content_id' not in item:
+        return item.get('content', '')
+    body = get_content(item['content_id'])
+    if body is None:
+        # 저장소에서 사라진 경우 (캐시 폴더 삭제 등) 미리보기로 대신
+        body = item.get('preview', '')
+    header = item.get('header')
+    return f"{header}\n\n--- 전체 내용 ---\n{body}" if header else body
+
+
+def item_preview(item):
+    """카드/목록에 표시할 짧은 미리보기"""
+    if 'content_id' in item:
+        return item.get('preview', '')
+    return item.get('content', '')
+
+
+def expand_search_result(item):
+    """
+    검색 결과를 바구니에 담을 수 있는 저장소 항목으로 바꿉니다.
+    파일 검색 결과는 이 시점에 전체 본문을 읽어 저장소에 넣고, 스니펫은 header 로 둡니다.
+    (같은 파일을 여러 검색에서 담아도 본문은 한 벌만 보관)
+    이미 저장소 항목이면 그대로 반환합니다.
+    """
+    if 'content_id' in item:
+        return item
+    score = item.get('relevance_score', 0)
+    path = item.get('path')
+    if not path:
+        return store_item(item['file'], item.get('content', ''), relevance_score=score)
+    full_text = read_file(path)
+    if item.get('preview_only'):
+        return store_item(item['file'], full_text, relevance_score=score)
+    return {
+        'file': item['file'],
+        'content_id': put_content(full_text),
+        'header': item['content'],
+        'preview': make_preview(item['content']),
+        'relevance_score': score,
+    }
 
 # --- [1. 시스템 설정 및 세션 초기화] ---
 st.set_page_config(page_title="Ωραία Εκκλησία (Orea Ekklisia) '아름다운교회'", layout="wide")
@@ -584,6 +382,7 @@ def get_custom_prompt(context_data):
 위 기획안과 자료를 바탕으로 은혜로운 설교 초안을 작성하라.""".strip()
 
 THEWORD_DB = "bible.dct.twm" # 사전용 DB
+COMMENTARY_SEARCH_LIMIT = 50  # 키워드 검색 시 주석 색인 결과 최대 개수
 
 # [NEW 2, 3] 검색 히스토리와 바구니 그룹 초기화 추가
 keys = {
@@ -600,6 +399,9 @@ keys = {
     'ai_response': '',  # AI 응답 저장
     'last_user_input': '',  # 마지막 사용자 입력 저장
     'show_ai_response': False,  # AI 응답 표시 여부
+    'last_search_results': [],  # 에이전트 검색 결과 (스니펫 + 파일 경로만 보관)
+    'last_search_query': '',  # 에이전트 검색어
+    'search_page': 0,  # 에이전트 검색 결과 현재 페이지
 }
 
 for key, default in keys.items():
@@ -791,37 +593,8 @@ with st.sidebar:
 
 @st.cache_data(show_spinner=False)
 def read_file(path):
-    if not os.path.exists(path): return ""
-    ext = os.path.splitext(path)[1].lower()
-    try:
-        if ext == ".docx":
-            doc = Document(path)
-            return "\n".join([p.text for p in doc.paragraphs])
-        elif ext == ".pdf":
-            text = ""
-            with fitz.open(path) as doc:
-                for page in doc: text += page.get_text()
-            return text
-        elif ext in [".txt", ".rtf"]:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-                return decode_rtf(content) if ext == ".rtf" else content
-        elif ext == ".epub":
-            book = epub.read_epub(path)
-            items = []
-            for item in book.get_items():
-                if item.get_type() == ebooklib.ITEM_DOCUMENT:
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    for link in soup.find_all('a'):
-                        link.unwrap()
-                    items.append(soup.get_text())
-            return "\n".join(items)
-        elif ext in ['.html', '.htm']:
-            with open(path, 'r', encoding='utf-8') as f:
-                return BeautifulSoup(f.read(), 'html.parser').get_text()
-    except Exception as e:
-        return f"파일 읽기 오류 ({path}): {str(e)}"
-    return ""
+    # 실제 추출/영구 캐시는 core.file_reader 에서 처리 (재시작 후에도 재파싱 없음)
+    return read_file_cached(path)
 
 # --- [3. 성경 지명/약어 매핑] ---
 BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP = get_ultimate_bible_map()
@@ -830,102 +603,62 @@ BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP = get_ultimate_bible_map()
 def search_engine(text, user_book, chap, verse_input):
     """
     Bible 텍스트에서 서론/본문을 검색하는 라우터 함수입니다.
-    - parse_reference: 입력 파싱 및 모드 결정
-    - fetch_intro: 책/장 서론 추출
-    - fetch_bible_text: 일반 절 본문 추출
+    실제 로직은 core.search_engine.search_document 에 있습니다.
     """
-    parsed = parse_reference(user_book, chap, verse_input, BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP)
-    if not parsed:
-        return ""
-
-    std, norm_chap, verses, mode = parsed
-    results_dict = {}
-
-    # 서론(책/장) 처리
-    intro_results = fetch_intro(
-        text,
-        std,
-        norm_chap,
-        verse_input,
-        BIBLE_ALIAS_FLAT,
-        BIBLE_RAW_MAP,
-    )
-    results_dict.update(intro_results)
-
-    # 일반 절 본문 처리
-    if mode == "verse":
-        bible_results = fetch_bible_text(
-            text,
-            std,
-            norm_chap,
-            verses,
-            BIBLE_ALIAS_FLAT,
-            BIBLE_RAW_MAP,
-        )
-        results_dict.update(bible_results)
-
-    res_list = [f"{key}\n{content}" for key, content in results_dict.items()]
-    return "\n\n".join(res_list) if res_list else ""
-
-def get_external_commentaries(user_book, chap, vers, selected_folders=None):
+    return search_document(text, user_book, chap, verse_input, BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP)
+
+def resolve_book_id(user_book):
+    """사용자가 입력한 책 이름을 표준 book_id(1~66)로 변환합니다. (실패 시 None)"""
+    std_name = resolve_book(user_book, BIBLE_ALIAS_FLAT)
+    return book_id(std_name) if std_name else None
+
+def format_commentary_ref(hit):
+    """주석 색인 검색 결과의 (책, 장, 절) 을 '표준 책 코드 장:절' 로 표시합니다."""
+    book = book_code(hit.book) or str(hit.book)
+    if hit.chapter == 0:
+        return f"{book} 책 서론"
+    if hit.verse_from == 0:
+        return f"{book} {hit.chapter}장 서론"
+    if hit.verse_to and hit.verse_to != hit.verse_from:
+        return f"{book} {hit.chapter}:{hit.verse_from}-{hit.verse_to}"
+    return f"{book} {hit.chapter}:{hit.verse_from}"
+
+def get_external_commentaries_range(user_book, chap, verses, selected_folders=None):
     """
-    외부 주석/성경 DB 파일(.mybible, .twm, .sqlite3, .cdb 등)을 모두 스캔한 뒤,
-    각 파일 형식별 로더(core.commentary_utils)를 통해 주석을 통합합니다.
+    외부 주석/성경 DB 파일(.mybible, .twm, .sqlite3, .cdb 등)을 한 번 스캔한 뒤,
+    파일마다 연결 1회 + 범위 쿼리 1회로 여러 절의 주석을 일괄 조회합니다.
+    반환: {절 번호: 통합 주석 문자열}
     """
     if selected_folders is None:
         selected_folders = ["."]
 
-    # 1) 검색 대상 파일 수집 (동적 스캔)
+    # 1) 검색 대상 파일 수집 (동적 스캔, 범위 전체에 대해 1회)
     com_files = scan_commentary_files(selected_folders)
 
     # 2) 성경 책 이름을 표준 book_id로 변환
-    bible_std_list = list(BIBLE_RAW_MAP.keys())
-    try:
-        normalized_book = user_book.strip()
-        book_match = re.match(r"^([가-힣a-zA-Z0-9]+)", normalized_book)
-        if book_match:
-            book_part = book_match.group(1)
-            std_name = BIBLE_ALIAS_FLAT.get(book_part.lower())
-        else:
-            std_name = BIBLE_ALIAS_FLAT.get(normalized_book.lower())
-
-        std_name_upper = std_name.upper() if std_name else None
-        book_id = None
-        for i, book in enumerate(bible_std_list):
-            if book.upper() == std_name_upper:
-                book_id = i + 1
-                break
-
-        if book_id is None:
-            raise ValueError(f"Book not found in list: {std_name}")
-    except (ValueError, TypeError):
-        return ""
-
-    # 3) 파일별 로더를 호출해서 결과 통합
-    com_results = []
-    chap_int = int(chap)
-    vers_int = int(vers)
-
-    for path in com_files:
-        com_results.extend(load_commentaries_for_path(path, int(book_id), chap_int, vers_int))
-
-    # 4) 중복 제거
-    seen = set()
-    unique_com_results = []
-    for result in com_results:
-        if result not in seen:
-            seen.add(result)
-            unique_com_results.append(result)
-
-    return "\n\n".join(unique_com_results)
+    book_id = resolve_book_id(user_book)
+    if book_id is None:
+        return {}
+
+    # 3) 파일별 범위 로더 호출 (중복 제거 포함)
+    by_verse = get_commentaries_for_verses(com_files, int(book_id), int(chap), [int(v) for v in verses])
+    return {verse: "\n\n".join(items) for verse, items in by_verse.items()}
+
+def get_external_commentaries(user_book, chap, vers, selected_folders=None):
+    """
+    외부 주석/성경 DB 파일(.mybible, .twm, .sqlite3, .cdb 등)을 모두 스캔한 뒤,
+    각 파일 형식별 로더(core.commentary_utils)를 통해 주석을 통합합니다.
+    """
+    return get_external_commentaries_range(user_book, chap, [vers], selected_folders).get(int(vers), "")
 
 @st.cache_data(show_spinner=False)
 def get_lexicon(code):
     if not os.path.exists(THEWORD_DB): return None
     try:
-        conn = sqlite3.connect(THEWORD_DB); cur = conn.cursor()
-        cur.execute("SELECT c.data FROM content c JOIN topics t ON c.topic_id = t.id WHERE t.subject = ? LIMIT 1", (code.upper().strip(),))
-        row = cur.fetchone(); conn.close()
+        with pooled_connection(THEWORD_DB) as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT c.data FROM content c JOIN topics t ON c.topic_id = t.id WHERE t.subject = ? LIMIT 1", (code.upper().strip(),))
+            row = cur.fetchone()
         return decode_rtf(row[0]) if row else None
     except: return None
 
@@ -996,12 +729,18 @@ with st.sidebar:
             
             if index_column:
                 st.caption(f"🔍 검색 기준: {index_column}")
+
+                # 사전 전체를 백그라운드에서 미리 디코딩 (이미 끝난 사전은 스레드를 만들지 않음)
+                start_background_lexicon_build(dict_path, index_column)
+                lex_status = get_lexicon_build_status(dict_path)
+                if lex_status["running"] and lex_status["total"]:
+                    st.caption(f"⏳ 사전 미리 읽는 중... ({lex_status['done']}/{lex_status['total']})")
                 
-                # [NEW] 인덱스 샘플 가져오기
-                index_samples = get_dictionary_index_samples(dict_path, index_column, limit=20)
-                
-                if index_samples:
-                    st.caption(f"💡 예시: {', '.join(index_samples[:5])}")
+                # [NEW] 사전 키 자동완성 색인 (사전당 1회 로드, 접두어/오타 검색)
+                key_index = get_lexicon_key_index(dict_path, index_column)
+
+                if key_index is not None and len(key_index):
+                    st.caption(f"💡 예시: {', '.join(key_index.first(5))} (전체 {len(key_index):,}개)")
                 
                 # --- [수정] 사전 유형에 따른 초기값 설정 ---
                 is_bullinger = "bullinger" in selected_dict_name.lower()
@@ -1013,7 +752,18 @@ with st.sidebar:
                     value=default_val,
                     key="lexicon_search"
                 )
-                
+
+                # 입력한 접두어(예: G2 → G26, G2889)나 한 글자 오타에 맞는 항목을 골라 조회
+                suggestions = key_index.complete(search_term) if (search_term and key_index is not None) else []
+                if len(suggestions) > 1:
+                    search_term = st.selectbox(
+                        f"🔤 추천 항목 ({len(suggestions)}개)",
+                        suggestions,
+                        key=f"lexicon_suggest_{selected_dict_name}_{search_term}"
+                    )
+                elif suggestions:
+                    search_term = suggestions[0]
+
                 if search_term:
                     # [개선] 압축 해제 및 유니코드 복원이 포함된 함수 호출
                     plain_text, html_content = get_lexicon_enhanced(dict_path, search_term, index_column)
@@ -1072,13 +822,14 @@ with st.sidebar:
 
     if st.session_state.basket:
         if st.button("🤖 LLM 통합 질문 생성"):
-            context = "\n\n".join([i['content'] for i in st.session_state.basket])
+            context = "\n\n".join([item_content(i) for i in st.session_state.basket])
             st.session_state.v_content = f"당신은 세계적인 신학자이자 성경언어학자입니다. 다음에 제시된 내용에 근거하여 상세히 설명하시오.\n\n{context}"
 
         doc = Document()
         doc.add_heading("Bible Research Report", 0)
         for item in st.session_state.basket:
-            content_parts = item['content'].split('\n', 1)
+            item_text = item_content(item)
+            content_parts = item_text.split('\n', 1)
             if len(content_parts) >= 2:
                 title_line = content_parts[0].strip()
                 content_body = content_parts[1].strip()
@@ -1095,7 +846,7 @@ with st.sidebar:
                 doc.add_paragraph(content_body)
             else:
                 doc.add_heading(f"Source File: {item['file']}", level=0)
-                doc.add_paragraph(item['content'])
+                doc.add_paragraph(item_text)
         bio = BytesIO(); doc.save(bio)
         st.download_button("📝 연구보고서(.docx) 저장", data=bio.getvalue(), file_name="BibleAI_Report.docx", use_container_width=True)
 
@@ -1113,7 +864,7 @@ with col_l:
 
                 # 편집 가능한 텍스트 영역
                 basket_text = "\n\n" + "="*50 + "\n\n".join([
-                    f"📄 {item['file']}\n{'-'*50}\n{item['content']}"
+                    f"📄 {item['file']}\n{'-'*50}\n{item_content(item)}"
                     for item in st.session_state.basket
                 ])
 
@@ -1129,10 +880,9 @@ with col_l:
 
                 with col1:
                     if st.button("💾 편집 내용 저장", use_container_width=True, key="save_edit"):
-                        st.session_state.basket = [{
-                            'file': f"편집됨_{datetime.now().strftime('%H%M%S')}",
-                            'content': edited_text
-                        }]
+                        st.session_state.basket = [
+                            store_item(f"편집됨_{datetime.now().strftime('%H%M%S')}", edited_text)
+                        ]
                         st.success("✅ 편집 내용이 저장되었습니다!")
 
                 with col2:
@@ -1155,11 +905,12 @@ with col_l:
         c1, c2, c3 = st.columns([2,1,1])
         b_in, ch_in, vs_in = c1.text_input("성경", "요"), c2.text_input("장", "6"), c3.text_input("절", "26-27")
 
-        parsed_book, parsed_chap, parsed_vs = (None, None, None)
-        if parsed_book and parsed_chap and parsed_vs:
-            actual_book = parsed_book
-            actual_chap = parsed_chap
-            actual_vs = parsed_vs
+        # 성경 칸에 "요 3:16", "롬8:28-30", "1Cor 13" 처럼 참조 전체를 입력하면 장/절 칸보다 우선 (장만 있으면 절 칸 사용)
+        parsed_ref_input = get_reference_recognizer().parse(b_in)
+        if parsed_ref_input:
+            actual_book = parsed_ref_input.book
+            actual_chap = str(parsed_ref_input.chapter)
+            actual_vs = parsed_ref_input.verse_input() if parsed_ref_input.verse_from is not None else vs_in
         else:
             actual_book = b_in
             actual_chap = ch_in
@@ -1172,17 +923,49 @@ with col_l:
             prog = st.progress(0); stat = st.empty()
 
             normalized_book = actual_book.strip()
-            for i, p in enumerate(files):
+
+            # [색인] 서재 전체 절 태그 인덱스를 갱신하고, 해당 절이 있는 파일만 조사
+            def _index_progress(done, total, path):
+                stat.text(f"색인 갱신 중 ({done}/{total}): {os.path.basename(path)}")
+                prog.progress(done / total)
+
+            refresh_verse_index(files, _index_progress)
+            file_order = {p: n for n, p in enumerate(files)}
+            parsed_ref = parse_reference(normalized_book, actual_chap, actual_vs, BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP)
+            mentions = {}
+            if parsed_ref:
+                std_ref, chap_ref, verses_ref, mode_ref = parsed_ref
+                # 태그 없는 문서는 색인된 본문 언급 문단으로 결과를 만듦 (파일 다시 조사 안 함)
+                if mode_ref == "verse":
+                    mentions = mention_results(files, std_ref, chap_ref, verses_ref)
+                files = candidate_files(files, std_ref, chap_ref, verses_ref, mode_ref)
+            else:
+                files = []
+            prog.progress(0)
+
+            def _scan_item(p, res):
+                content_lines = res.split('\n', 1)
+                if len(content_lines) >= 2 and content_lines[0].startswith('#### ['):
+                    bible_ref = content_lines[0].replace('#### ', '')
+                    return store_item(os.path.basename(p), f"{bible_ref}\n{content_lines[1]}")
+                return store_item(os.path.basename(p), res)
+
+            # [병렬화] 파일별 추출/매칭을 프로세스 풀에 분배하고, 끝나는 순서대로 결과 반영
+            found = []
+            for done, (i, p, res) in enumerate(scan_files_parallel(files, normalized_book, actual_chap, actual_vs)):
                 stat.text(f"탐색 중: {os.path.basename(p)}")
-                res = search_engine(read_file(p), normalized_book, actual_chap, actual_vs)
                 if res:
-                    content_lines = res.split('\n', 1)
-                    if len(content_lines) >= 2 and content_lines[0].startswith('#### ['):
-                        bible_ref = content_lines[0].replace('#### ', '')
-                        st.session_state.scan_res.append({"file": os.path.basename(p), "content": f"{bible_ref}\n{content_lines[1]}"})
-                    else:
-                        st.session_state.scan_res.append({"file": os.path.basename(p), "content": res})
-                prog.progress((i+1)/len(files))
+                    item = _scan_item(p, res)
+                    found.append((file_order[p], item))
+                    st.session_state.scan_res.append(item)
+                    mentions.pop(p, None)
+                prog.progress((done+1)/len(files))
+            for p, res in mentions.items():
+                found.append((file_order[p], _scan_item(p, res)))
+            prog.progress(1.0)
+            # 완료 순서와 무관하게 파일 순서대로 정렬해 표시
+            found.sort(key=lambda x: x[0])
+            st.session_state.scan_res = [item for _, item in found]
 
             verses_to_search = []
             if "-" in actual_vs:
@@ -1202,12 +985,19 @@ with col_l:
                 except:
                     verses_to_search = []
 
+            # 장의 절 수를 넘는 절은 조회하지 않음 (예: "1-999")
+            book_id_ref = resolve_book_id(normalized_book)
+            if book_id_ref is not None and str(actual_chap).isdigit():
+                verses_to_search = clamp_verses(book_id_ref, int(actual_chap), verses_to_search) or verses_to_search
+
             if verses_to_search:
                 stat.text(f"외부 주석 검색 중... ({len(verses_to_search)}개 절: {', '.join(map(str, verses_to_search))})")
 
+                # [일괄 조회] 범위 전체를 파일당 1회 쿼리로 가져온 뒤 절별로 처리
+                comm_by_verse = get_external_commentaries_range(normalized_book, int(actual_chap), verses_to_search, selected_folders)
                 for i, verse_num in enumerate(verses_to_search):
-                    stat.text(f"외부 주석 검색 중... (절 {verse_num} 처리 중 {i+1}/{len(verses_to_search)})")
-                    comm_res = get_external_commentaries(normalized_book, int(actual_chap), verse_num, selected_folders)
+                    stat.text(f"외부 주석 정리 중... (절 {verse_num} 처리 중 {i+1}/{len(verses_to_search)})")
+                    comm_res = comm_by_verse.get(verse_num, "")
                     if comm_res:
                         comm_sections = comm_res.split("\n\n#### 📚 [")
                         for idx, section in enumerate(comm_sections):
@@ -1222,11 +1012,11 @@ with col_l:
                                         if bible_ref_match:
                                             bible_ref = bible_ref_match.group(0)
                                             content_without_filename = re.sub(r'\[(.*?)\]', '', content, 1).strip()
-                                            st.session_state.scan_res.append({"file": f"📚 {file_title}", "content": f"{bible_ref}\n{content_without_filename}"})
+                                            st.session_state.scan_res.append(store_item(f"📚 {file_title}", f"{bible_ref}\n{content_without_filename}"))
                                         else:
-                                            st.session_state.scan_res.append({"file": f"📚 {file_title}", "content": f"#### 📚 [{file_title}]\n{content}"})
+                                            st.session_state.scan_res.append(store_item(f"📚 {file_title}", f"#### 📚 [{file_title}]\n{content}"))
                                     else:
-                                        st.session_state.scan_res.append({"file": "📚 외부 주석 모듈", "content": section})
+                                        st.session_state.scan_res.append(store_item("📚 외부 주석 모듈", section))
                             else:
                                 full_section = "[" + section
                                 lines = full_section.split('\n', 1)
@@ -1238,9 +1028,17 @@ with col_l:
                                     if bible_ref_match:
                                         bible_ref = bible_ref_match.group(0)
                                         content_without_filename = re.sub(r'\[(.*?)\]', '', content, 1).strip()
-                                        st.session_state.scan_res.append({"file": f"📚 {file_title}", "content": f"{bible_ref}\n{content_without_filename}"})
+                                        st.session_state.scan_res.append(store_item(f"📚 {file_title}", f"{bible_ref}\n{content_without_filename}"))
                                     else:
-                                        st.session_state.scan_res.append({"file": f"📚 {file_title}", "content": f"#### 📚 [{file_title}]\n{content}"})
+                                        st.session_state.scan_res.append(store_item(f"📚 {file_title}", f"#### 📚 [{file_title}]\n{content}"))
+
+                # [역본 대조] 설치된 모든 성경 모듈에서 같은 절 범위를 동시에 조회
+                if book_id_ref is not None:
+                    stat.text("역본 대조 중...")
+                    std_name = book_code(book_id_ref)
+                    for verse_num, texts in get_parallel_versions(book_id_ref, int(actual_chap), verses_to_search, selected_folders):
+                        body = "\n\n".join(f"**{name}**: {text}" for name, text in texts)
+                        st.session_state.scan_res.append(store_item("📖 역본 대조", f"[{std_name} {actual_chap}:{verse_num}]\n{body}"))
 
                 stat.text(f"외부 주석 검색 완료! {len(st.session_state.scan_res)}개 결과")
             else:
@@ -1324,14 +1122,14 @@ with col_l:
                     content_lines = txt.split('\n', 1)
                     if len(content_lines) >= 2 and content_lines[0].startswith('#### ['):
                         bible_ref = content_lines[0].replace('#### ', '')
-                        st.session_state.basket.append({"file": item, "content": f"#### 📄 [{item}]\n{bible_ref}\n{content_lines[1]}"})
+                        st.session_state.basket.append(store_item(item, f"#### 📄 [{item}]\n{bible_ref}\n{content_lines[1]}"))
                     else:
-                        st.session_state.basket.append({"file": item, "content": f"#### 📄 [{item}]\n{txt}"})
+                        st.session_state.basket.append(store_item(item, f"#### 📄 [{item}]\n{txt}"))
                     st.toast("담기 완료!")
 
     with t3:
         if st.session_state.basket:
-            all_text = "\n\n".join([i['content'] for i in st.session_state.basket])
+            all_text = "\n\n".join([item_content(i) for i in st.session_state.basket])
             st.code(all_text, language="text")
 
     st.divider()
@@ -1339,39 +1137,41 @@ with col_l:
     if st.session_state.scan_res:
         if st.button("📥 일괄 바구니담기", use_container_width=True):
             for res in st.session_state.scan_res:
-                st.session_state.basket.append(res)
+                st.session_state.basket.append(expand_search_result(res))
             st.toast(f"모든 결과 {len(st.session_state.scan_res)}개를 바구니에 담았습니다!")
             st.rerun()  # [버그수정] 바구니 숫자 즉시 갱신
 
     for i, res in enumerate(st.session_state.scan_res):
         cb, ca, cc, cd = st.columns([2.5, 1, 1, 1])
         if cb.button(f"📍 {res['file']}", key=f"res_{i}", use_container_width=True):
+            res_text = item_content(expand_search_result(res))  # 파일 검색 결과는 이 시점에 전체 본문을 읽음
             if res['file'].startswith('📚'):
-                st.session_state.v_content = f"#### 📄 [{res['file']}]\n{res['content']}"
+                st.session_state.v_content = f"#### 📄 [{res['file']}]\n{res_text}"
             else:
-                content_lines = res['content'].split('\n', 1)
+                content_lines = res_text.split('\n', 1)
                 if len(content_lines) >= 2 and content_lines[0].startswith('#### ['):
                     bible_ref = content_lines[0].replace('#### ', '')
                     st.session_state.v_content = f"#### 📄 [{res['file']}]\n{bible_ref}\n{content_lines[1]}"
                 else:
-                    st.session_state.v_content = f"#### 📄 [{res['file']}]\n{res['content']}"
+                    st.session_state.v_content = f"#### 📄 [{res['file']}]\n{res_text}"
         if ca.button("🧺", key=f"ad_{i}"):
-            st.session_state.basket.append(res)
+            st.session_state.basket.append(expand_search_result(res))
             st.toast("바구니 저장!")
             st.rerun()  # [버그수정] 바구니 숫자 즉시 갱신
 
         # 카드형 보기 버튼 수정 - 별도 창으로 열기
         if cc.button("🔍", key=f"win_{i}"):
+            res_text = item_content(expand_search_result(res))
             content_to_display = ""
             if res['file'].startswith('📚'):
-                content_to_display = f"#### 📄 [{res['file']}]\n{res['content']}"
+                content_to_display = f"#### 📄 [{res['file']}]\n{res_text}"
             else:
-                content_lines = res['content'].split('\n', 1)
+                content_lines = res_text.split('\n', 1)
                 if len(content_lines) >= 2 and content_lines[0].startswith('#### ['):
                     bible_ref = content_lines[0].replace('#### ', '')
                     content_to_display = f"#### 📄 [{res['file']}]\n{bible_ref}\n{content_lines[1]}"
                 else:
-                    content_to_display = f"#### 📄 [{res['file']}]\n{res['content']}"
+                    content_to_display = f"#### 📄 [{res['file']}]\n{res_text}"
 
             content_escaped_lt = content_to_display.replace('<', '&lt;')
             content_escaped_gt = content_escaped_lt.replace('>', '&gt;')
@@ -1455,14 +1255,16 @@ with col_r:
                     st.markdown(f"**📄 {res['file']}**")
 
                     # 텍스트 미리보기 최적화 (메모리 절약)
-                    content_preview = "\n".join(res['content'].split('\n')[:3]) + " ..." if len(res['content'].split('\n')) > 3 else res['content']
+                    res_preview = item_preview(res)
+                    content_preview = "\n".join(res_preview.split('\n')[:3]) + " ..." if len(res_preview.split('\n')) > 3 else res_preview
                     st.caption(content_preview)
 
                     btn_col1, btn_col2 = st.columns([1, 1])
                     with btn_col1:
                         if st.button(f"🧺 담기", key=f"add_basket_{i}", use_container_width=True):
-                            if res not in st.session_state.basket:
-                                st.session_state.basket.append(res)
+                            full_res = expand_search_result(res)
+                            if full_res not in st.session_state.basket:
+                                st.session_state.basket.append(full_res)
                                 st.toast(f"바구니에 담겼습니다!", icon="📥")
                                 st.rerun()  # [버그수정] 바구니 숫자 즉시 갱신
                             else:
@@ -1470,7 +1272,7 @@ with col_r:
                     with btn_col2:
                         # 카드형 보기 버튼도 별도 창으로 열기
                         if st.button(f"🔍 보기", key=f"view_detail_{i}", use_container_width=True):
-                            content_to_display = f"#### 📄 [{res['file']}]\n{res['content']}"
+                            content_to_display = f"#### 📄 [{res['file']}]\n{item_content(expand_search_result(res))}"
 
                             content_escaped_lt = content_to_display.replace('<', '&lt;')
                             content_escaped_gt = content_escaped_lt.replace('>', '&gt;')
@@ -1560,6 +1362,101 @@ if 'trigger_search' in st.session_state and st.session_state.trigger_search:
 else:
     user_input = st.chat_input("🔍 주제어 검색 / 명령(생성, 담아줘) / 로컬AI 질문(?)")
 
+def open_dark_viewer(title, content):
+    """전체 본문을 다크모드 뷰어 HTML 로 만들어 새 브라우저 창으로 엽니다."""
+    html_safe_content = content.replace('<', '&lt;').replace('>', '&gt;').replace('\n', '<br>')
+    html_safe_title = title.replace('<', '&lt;').replace('>', '&gt;')
+    viewer_html = f"""
+    <html>
+    <head>
+        <title>Dark Viewer - {html_safe_title}</title>
+        <meta charset="UTF-8">
+        <style>
+            body {{ background: #1e1e1e; color: #d4d4d4; font-family: 'Malgun Gothic', sans-serif; padding: 40px; line-height: 1.9; }}
+            .header {{ border-bottom: 2px solid #3e3e42; padding-bottom: 15px; margin-bottom: 25px; display: flex; justify-content: space-between; align-items: center; }}
+            h2 {{ color: #569cd6; margin: 0; font-size: 1.5em; }}
+            .content {{ white-space: pre-wrap; font-size: 1.15em; letter-spacing: 0.05em; }}
+            .no-print {{ background: #333; color: #fff; border: none; padding: 7px 15px; cursor: pointer; border-radius: 4px; }}
+            @media print {{ .no-print {{ display: none; }} body {{ background: white; color: black; }} }}
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h2>📂 {html_safe_title}</h2>
+            <button class="no-print" onclick="window.print()">🖨️ 프린트</button>
+        </div>
+        <div class="content">{html_safe_content}</div>
+        <br><br>
+        <center><button class="no-print" onclick="window.close()" style="background:#444;">닫기</button></center>
+    </body>
+    </html>
+    """
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.html', encoding='utf-8') as f:
+        f.write(viewer_html)
+        temp_file_path = f.name
+    webbrowser.open('file://' + os.path.abspath(temp_file_path))
+
+
+def render_agent_search_results():
+    """
+    에이전트 검색 결과를 페이지 단위로 표시합니다.
+    현재 페이지 항목의 미리보기만 그리고, 전체 본문은 전문 보기를 누른 항목만 읽습니다.
+    """
+    results = st.session_state.last_search_results
+    query = st.session_state.last_search_query
+    page_count = max(1, (len(results) + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE)
+    page = min(max(st.session_state.search_page, 0), page_count - 1)
+    page_start = page * SEARCH_PAGE_SIZE
+
+    st.subheader(f"🔎 에이전트 검색 결과 ({len(results)}건)")
+    st.caption(f"검색어: **{query}** | 조건 검색(+필수, -제외) 지원")
+
+    # --- 결과 출력 시작 (현재 페이지만) ---
+    for i, item in enumerate(results[page_start:page_start + SEARCH_PAGE_SIZE], start=page_start):
+        with st.container(border=True):
+            # [NEW 1] 관련도 점수 표시
+            score = item.get('relevance_score', 0)
+            if score > 0:
+                st.markdown(f"### 📂 {item['file']} 🎯 관련도: {score}점")
+            else:
+                st.markdown(f"### 📂 {item['file']}")
+
+            # 미리보기: 처음 300자만 표시
+            content_lines = item_preview(item).split('\n')
+            preview_lines = []
+            char_count = 0
+            for line in content_lines:
+                if char_count + len(line) > 300:
+                    preview_lines.append(line[:300-char_count] + "...")
+                    break
+                preview_lines.append(line)
+                char_count += len(line)
+
+            preview = "\n".join(preview_lines)
+            st.write(preview)
+
+            # [다크모드 전문 보기 버튼 로직 - 수정된 버전]
+            # 카드는 미리보기만 그리고, 전체 본문은 버튼을 눌렀을 때 그 항목만 읽어 별도 창으로 엶
+            if st.button("🔍 다크모드 전문 보기", key=f"agent_view_{i}"):
+                open_dark_viewer(item['file'], item_content(expand_search_result(item)))
+
+            # [NEW 4, 5] 복사 및 AI 요약 버튼 추가 - 이 부분 삭제 2026-02-26
+
+    # --- 페이지 이동 ---
+    if page_count > 1:
+        nav_prev, nav_info, nav_next = st.columns([1, 2, 1])
+        with nav_prev:
+            if st.button("◀ 이전", key="search_page_prev", disabled=page == 0, use_container_width=True):
+                st.session_state.search_page = page - 1
+                st.rerun()
+        with nav_info:
+            st.caption(f"{page + 1} / {page_count} 페이지 ({page_start + 1}~{min(page_start + SEARCH_PAGE_SIZE, len(results))}번째)")
+        with nav_next:
+            if st.button("다음 ▶", key="search_page_next", disabled=page >= page_count - 1, use_container_width=True):
+                st.session_state.search_page = page + 1
+                st.rerun()
+
+
 if user_input:
     # Store the current user input
     st.session_state.last_user_input = user_input
@@ -1640,7 +1537,7 @@ if user_input:
             st.warning("🧺 바구니가 비어 있습니다. 자료를 먼저 담아주세요.")
         else:
             # 바구니 내용을 텍스트로 결합
-            combined_context = "\n\n".join([f"--- {item['file']} ---\n{item['content']}" for item in st.session_state.basket])
+            combined_context = "\n\n".join([f"--- {item['file']} ---\n{item_content(item)}" for item in st.session_state.basket])
             final_prompt = get_custom_prompt(combined_context)
 
             # 클립보드 복사 및 출력
@@ -1659,6 +1556,7 @@ if user_input:
         if st.session_state.scan_res:
             added_count = 0
             for item in st.session_state.scan_res:
+                item = expand_search_result(item)
                 if item not in st.session_state.basket:
                     st.session_state.basket.append(item)
                     # [NEW 3] 현재 그룹에도 추가
@@ -1697,48 +1595,33 @@ if user_input:
                 )
 
                 # [버그수정] 주석 모듈(DB) 검색 병행 실행 - 기존에는 누락되었음
-                # 현재 검색어를 성경 절로 해석하기보다 텍스트 포함 여부로 DB 주석을 별도 탐색
+                # 주석 본문은 FTS5 전문 색인에서 검색 (색인 갱신은 바뀐 모듈만 백그라운드에서)
                 db_results = []
                 try:
                     com_files = scan_commentary_files(selected_folders)
                     if com_files:
-                        # 주석 DB에서 텍스트 포함 검색 (키워드 매칭)
+                        # 갱신 중이 아니고 바뀐 모듈이 있을 때만 백그라운드 갱신 시작
+                        if not get_build_status()["running"]:
+                            start_background_refresh(com_files)
                         query_lower = user_input.lower()
-                        for com_path in com_files:
-                            try:
-                                conn = sqlite3.connect(com_path)
-                                cur = conn.cursor()
-                                # 가능한 테이블/컬럼 조합 시도
-                                for table, col in [
-                                    ("commentary", "data"), ("content", "data"),
-                                    ("commentaries", "text"), ("Verses", "Comments"),
-                                    ("VerseCommentary", "Comments"),
-                                ]:
-                                    try:
-                                        cur.execute(
-                                            f"SELECT {col} FROM {table} WHERE lower({col}) LIKE ? LIMIT 5",
-                                            (f"%{query_lower}%",)
-                                        )
-                                        rows = cur.fetchall()
-                                        for row in rows:
-                                            if row[0]:
-                                                decoded = decode_rtf(row[0]) if isinstance(row[0], (str, bytes)) else str(row[0])
-                                                snippet = decoded.strip()[:500]
-                                                if snippet:
-                                                    fname = os.path.basename(com_path)
-                                                    db_results.append({
-                                                        "file": f"📚 {fname}",
-                                                        "content": f"#### 📚 [{fname}]\n{snippet}",
-                                                        "relevance_score": snippet.lower().count(query_lower) * 10
-                                                    })
-                                        break  # 성공한 테이블에서만 읽음
-                                    except Exception:
-                                        continue
-                                conn.close()
-                            except Exception:
-                                pass
-                except Exception:
-                    pass
+                        for hit in search_commentary_index(user_input, com_files, limit=COMMENTARY_SEARCH_LIMIT):
+                            if hit.score:
+                                score = max(1, int(round(-hit.score * 10)))
+                            else:
+                                score = hit.snippet.lower().count(query_lower) * 10
+                            db_results.append({
+                                "file": f"📚 {hit.module}",
+                                "content": f"#### 📚 [{hit.module}] {format_commentary_ref(hit)}\n{hit.snippet}",
+                                "relevance_score": score
+                            })
+                        fts_status = get_build_status()
+                        if fts_status["running"]:
+                            st.caption(
+                                f"📚 주석 검색 색인 갱신 중... ({fts_status['done']}/{fts_status['total']}) "
+                                "- 색인이 끝난 모듈부터 검색됩니다."
+                            )
+                except Exception as e:
+                    st.warning(f"📚 주석 검색 중 오류가 발생했습니다: {e}")
 
                 total_results = bible_results + file_results + db_results
 
@@ -1749,84 +1632,14 @@ if user_input:
             else:
                 total_results = locals().get('total_results', [])
                 st.session_state.last_search_results = total_results
+                st.session_state.last_search_query = user_input
+                st.session_state.search_page = 0
                 st.session_state.scan_res = total_results
 
                 # [NEW 2] 검색 히스토리에 저장
                 save_search_history(user_input)
 
-                st.subheader(f"🔎 에이전트 검색 결과 ({len(total_results)}건)")
-                st.caption(f"검색어: **{user_input}** | 조건 검색(+필수, -제외) 지원")
-
-                # --- 결과 출력 시작 ---
-                for i, item in enumerate(total_results):
-                    with st.container(border=True):
-                        # [NEW 1] 관련도 점수 표시
-                        score = item.get('relevance_score', 0)
-                        if score > 0:
-                            st.markdown(f"### 📂 {item['file']} 🎯 관련도: {score}점")
-                        else:
-                            st.markdown(f"### 📂 {item['file']}")
-
-                        # 미리보기: 처음 300자만 표시
-                        content_lines = item['content'].split('\n')
-                        preview_lines = []
-                        char_count = 0
-                        for line in content_lines:
-                            if char_count + len(line) > 300:
-                                preview_lines.append(line[:300-char_count] + "...")
-                                break
-                            preview_lines.append(line)
-                            char_count += len(line)
-
-                        preview = "\n".join(preview_lines)
-                        st.write(preview)
-
-                        # [다크모드 전문 보기 버튼 로직 - 수정된 버전]
-                        safe_content = item['content'].replace("'", "\'").replace("\n", "\n").replace('"', '"')
-
-                        # JavaScript에서 안전하게 사용할 수 있도록 이스케이프 처리
-                        html_safe_content = item['content'].replace('<', '&lt;').replace('>', '&gt;').replace('\n', '<br>')
-
-                        viewer_html = f"""
-                        <div style="margin-top: 10px;">
-                            <button onclick="openDarkViewer{i}()"
-                               style="cursor:pointer; background-color:#1e1e1e; color:#569cd6; padding:8px 20px; border-radius:5px; border:1px solid #569cd6; font-size:14px; font-weight:bold;">🔍 다크모드 전문 보기</button>
-                        </div>
-                        <script>
-                        function openDarkViewer{i}() {{
-                            var win = window.open("", "_blank", "width=900,height=850");
-                            var content = `{html_safe_content}`;
-                            win.document.write(`
-                                <html>
-                                <head>
-                                    <title>Dark Viewer - {item['file']}</title>
-                                    <meta charset="UTF-8">
-                                    <style>
-                                        body {{ background: #1e1e1e; color: #d4d4d4; font-family: 'Malgun Gothic', sans-serif; padding: 40px; line-height: 1.9; }}
-                                        .header {{ border-bottom: 2px solid #3e3e42; padding-bottom: 15px; margin-bottom: 25px; display: flex; justify-content: space-between; align-items: center; }}
-                                        h2 {{ color: #569cd6; margin: 0; font-size: 1.5em; }}
-                                        .content {{ white-space: pre-wrap; font-size: 1.15em; letter-spacing: 0.05em; }}
-                                        .no-print {{ background: #333; color: #fff; border: none; padding: 7px 15px; cursor: pointer; border-radius: 4px; }}
-                                        @media print {{ .no-print {{ display: none; }} body {{ background: white; color: black; }} }}
-                                    </style>
-                                </head>
-                                <body>
-                                    <div class="header">
-                                        <h2>📂 {item['file']}</h2>
-                                        <button class="no-print" onclick="window.print()">🖨️ 프린트</button>
-                                    </div>
-                                    <div class="content">` + content + `</div>
-                                    <br><br>
-                                    <center><button class="no-print" onclick="window.close()" style="background:#444;">닫기</button></center>
-                                </body>
-                                </html>
-                            `);
-                        }}
-                        </script>
-                        """
-                        components.html(viewer_html, height=70)
-
-                        # [NEW 4, 5] 복사 및 AI 요약 버튼 추가 - 이 부분 삭제 2026-02-26
+                render_agent_search_results()
 
     # Display stored AI response if it exists and no new input
     if st.session_state.show_ai_response and st.session_state.ai_response and not user_input:
@@ -1864,4 +1677,10 @@ if user_input:
 
     # 하단 제어바 제거됨
 
+# 새 입력 없이 다시 그려질 때(페이지 이동 등) 직전 에이전트 검색 결과와 페이지 이동 버튼 표시
+# (페이지 버튼의 st.rerun() 뒤에는 chat_input 이 None 이라 위의 if user_input: 블록을 타지 않음)
+if not user_input and st.session_state.last_search_results:
+    with st.chat_message("ai"):
+        render_agent_search_results()
+
 st.markdown("**제작: 경인노회 (<a href='https://kinohoi.blogspot.com' target='_blank'>https://kinohoi.blogspot.com</a>) 신학연구원 BibleAI Team**", unsafe_allow_html=True)
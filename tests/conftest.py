@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# 앱 폴더(main.py 가 있는 곳)를 import 경로에 추가 (core/ 는 패키지 설치 없이 사용)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """영구 캐시(.bibleai_cache)를 테스트마다 임시 폴더로 바꿔 앱 폴더를 건드리지 않게 함"""
+    from core import cache_utils
+
+    path = tmp_path / "cache"
+    monkeypatch.setattr(cache_utils, "CACHE_DIR", str(path))
+    return path
@@ -0,0 +1,105 @@
+import os
+import sqlite3
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from core import bible_binary
+from core.bible_binary import bible_binary_path, compile_bible_module, get_bible_binary
+from core.bible_utils import decode_rtf_text
+
+ROWS = [
+    (1, 1, 1, "태초에 하나님이 천지를 창조하시니라"),
+    (1, 1, 2, "땅이 \\b 혼돈하고\\b0  공허하며"),
+    (1, 1, 3, ""),  # 빈 절은 없는 절로
+    (1, 1, 5, "하나님이 빛을 낮이라 \\u54620?"),
+    (1, 1, 5, "같은 절의 두 번째 행은 무시"),
+    (1, 2, 0, "2장 머리말"),
+    (43, 3, 16, "<b>하나님이</b> 세상을 이처럼 사랑하사"),
+    (43, 1000, 1, "장 번호가 커도 저장"),
+    (43, 3, 1200, "절 번호가 너무 크면 무시"),
+]
+
+
+@pytest.fixture
+def module_path(tmp_path):
+    bible_binary_path.cache_clear()
+    path = str(tmp_path / "KRV.mybible")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE verses (book INTEGER, chapter INTEGER, verse INTEGER, text TEXT)")
+    conn.executemany("INSERT INTO verses VALUES (?, ?, ?, ?)", ROWS)
+    conn.commit()
+    conn.close()
+    yield path
+    bible_binary.close_bible_binaries()
+    bible_binary_path.cache_clear()
+
+
+def expected_verses():
+    verses = {}
+    for book, chap, verse, raw in ROWS:
+        text = decode_rtf_text(raw).strip()
+        if text and verse <= bible_binary.MAX_VERSE_SLOT:
+            verses.setdefault((book, chap, verse), text)
+    return verses
+
+
+def test_round_trip(module_path):
+    count, size = compile_bible_module(module_path)
+    expected = expected_verses()
+    assert count == len(expected)
+    assert size == os.path.getsize(bible_binary_path(module_path))
+
+    binary = get_bible_binary(module_path)
+    assert binary is not None
+    assert binary.chapters() == [(1, 1), (1, 2), (43, 3), (43, 1000)]
+    assert {(b, c, v): t for b, c, v, t in binary.iter_verses()} == expected
+    for (book, chap, verse), text in expected.items():
+        assert binary.verse(book, chap, verse) == text
+        assert bytes(binary.verse_bytes(book, chap, verse)) == text.encode("utf-8")
+    assert binary.chapter(1, 1) == {v: t for (b, c, v), t in expected.items() if (b, c) == (1, 1)}
+
+
+def test_missing_verses(module_path):
+    compile_bible_module(module_path)
+    binary = get_bible_binary(module_path)
+
+    assert binary.verse(1, 1, 3) is None
+    assert binary.verse(1, 1, 4) is None
+    assert binary.verse(1, 1, 99) is None
+    assert binary.verse(2, 1, 1) is None
+    assert binary.verse_bytes(1, 1, 3) is None
+    assert binary.chapter(9, 9) == {}
+
+
+def test_stale_binary_is_not_used(module_path):
+    compile_bible_module(module_path)
+    assert get_bible_binary(module_path) is not None
+
+    conn = sqlite3.connect(module_path)
+    conn.execute("UPDATE verses SET text = '바뀐 본문' WHERE book = 1 AND chapter = 1 AND verse = 1")
+    conn.commit()
+    conn.close()
+    os.utime(module_path, ns=(1, 1))
+    assert get_bible_binary(module_path) is None
+
+    compile_bible_module(module_path)
+    assert get_bible_binary(module_path).verse(1, 1, 1) == "바뀐 본문"
+
+
+def test_up_to_date_binary_is_not_rebuilt(module_path):
+    compile_bible_module(module_path)
+    bin_path = bible_binary_path(module_path)
+    mtime = os.stat(bin_path).st_mtime_ns
+
+    compile_bible_module(module_path)
+    assert os.stat(bin_path).st_mtime_ns == mtime
+
+
+def test_non_bible_file(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("본문", encoding="utf-8")
+
+    assert compile_bible_module(str(path)) is None
+    assert get_bible_binary(str(path)) is None
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from core.bible_refs import ReferenceRecognizer, find_bible_references, get_reference_recognizer
+
+
+def refs(text, chapter_only=True):
+    return [(text[r.start : r.end], r.book, r.chapter, r.verse_from, r.verse_to) for r in find_bible_references(text, chapter_only)]
+
+
+def test_free_form_references():
+    text = "요 3:16 과 롬8:28-30, 그리고 1Cor 13 및 요한복음 3장 16절을 보라."
+
+    assert refs(text) == [
+        ("요 3:16", "Joh", 3, 16, None),
+        ("롬8:28-30", "Rom", 8, 28, 30),
+        ("1Cor 13", "1Co", 13, None, None),
+        ("요한복음 3장 16절", "Joh", 3, 16, None),
+    ]
+
+
+def test_longest_alias_wins():
+    assert refs("요한1서 4:8") == [("요한1서 4:8", "1Jo", 4, 8, None)]
+
+
+def test_psalm_counter():
+    assert refs("시편 23편 1절", chapter_only=False) == [("시편 23편 1절", "Psa", 23, 1, None)]
+    assert refs("시편 23편") == [("시편 23편", "Psa", 23, None, None)]
+    assert refs("시 119편 105-106절을 읽고") == [("시 119편 105-106절", "Psa", 119, 105, 106)]
+    assert get_reference_recognizer().parse("시편 23편 1절").verse_input() == "1"
+
+
+def test_alias_inside_word_is_ignored():
+    assert refs("Joseph 3:1") == []
+    assert refs("abcJoh 3:16") == []
+
+
+def test_chapter_only_references_can_be_excluded():
+    assert refs("Rom 8 and Rom 8:1", chapter_only=False) == [("Rom 8:1", "Rom", 8, 1, None)]
+
+
+def test_out_of_range_numbers():
+    assert refs("Psa 151:1") == []
+    assert refs("Psa 119:177") == []
+    # 범위 끝이 시작보다 앞이면 단일 절로
+    assert refs("Joh 3:16-2") == [("Joh 3:16-2", "Joh", 3, 16, None)]
+
+
+def test_verse_input():
+    recognizer = get_reference_recognizer()
+
+    assert recognizer.parse("롬 8:28-30").verse_input() == "28-30"
+    assert recognizer.parse("1 Cor 13").verse_input() == "0"
+    assert recognizer.parse("요 3:16 참조") is None
+    assert recognizer.leading_book("1 Cor 13") == "1Co"
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_alias_hits_match_substring_search(seed):
+    recognizer = get_reference_recognizer()
+    aliases = sorted(recognizer._aliases)
+    rng = random.Random(seed)
+    words = rng.sample(aliases, 30) + ["", " ", "x", "말씀", "3:16", "."]
+    text = "".join(rng.choice(words) + rng.choice(["", " "]) for _ in range(40))
+    folded = text.lower()
+
+    expected = sorted(
+        (start, start + len(alias), std)
+        for alias, std in recognizer._aliases.items()
+        for start in range(len(folded))
+        if folded.startswith(alias, start) and (start == 0 or not text[start - 1].isalnum())
+    )
+    actual = recognizer._alias_hits(text, folded)
+
+    assert sorted(actual) == expected
+    assert actual == sorted(actual, key=lambda h: (h[0], h[0] - h[1]))
+
+
+def test_custom_alias_map():
+    recognizer = ReferenceRecognizer({"gen": "Gen", "창": "Gen", "exo": "Exo"}, {"Gen": [], "Exo": []})
+
+    assert len(recognizer) == 3
+    assert [(r.book, r.book_id, r.chapter) for r in recognizer.findall("창1:1, Exo 20")] == [("Gen", 1, 1), ("Exo", 2, 20)]
@@ -0,0 +1,126 @@
+import os
+import sqlite3
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from core import chapter_cache
+from core.chapter_cache import ChapterCache, load_bible_chapter
+
+
+@pytest.fixture
+def module_path(tmp_path):
+    path = str(tmp_path / "KRV.mybible")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE verses (book INTEGER, chapter INTEGER, verse INTEGER, text TEXT)")
+    conn.executemany(
+        "INSERT INTO verses VALUES (?, ?, ?, ?)",
+        [
+            (43, 1, 1, "태초에 말씀이 계시니라"),
+            (43, 1, 2, "그가 태초에 하나님과 함께"),
+            (43, 2, 1, "사흘째 되던 날"),
+            (43, 3, 16, "하나님이 세상을 이처럼 사랑하사"),
+            (43, 3, 17, "\\b 심판하려\\b0  하심이 아니요"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _wait_prefetch(cache):
+    if cache._executor is not None:
+        cache._executor.shutdown(wait=True)
+        cache._executor = None
+
+
+def test_load_chapter(module_path):
+    assert load_bible_chapter(module_path, 43, 3) == {16: "하나님이 세상을 이처럼 사랑하사", 17: "심판하려 하심이 아니요"}
+    assert load_bible_chapter(module_path, 43, 9) == {}
+    assert load_bible_chapter(module_path + ".txt", 43, 3) == {}
+
+
+def test_memory_usage_counts_overhead(module_path):
+    cache = ChapterCache(prefetch=False)
+    texts = cache.get(module_path, 43, 1)
+
+    assert cache.memory_usage() == sum(len(t) for t in texts.values()) + chapter_cache._ENTRY_OVERHEAD
+    # 없는 장도 여유분만큼 차지
+    assert cache.get(module_path, 43, 50) == {}
+    assert len(cache) == 2
+    assert cache.memory_usage() == sum(len(t) for t in texts.values()) + 2 * chapter_cache._ENTRY_OVERHEAD
+
+
+def test_least_recently_used_chapter_is_evicted(module_path):
+    cache = ChapterCache(prefetch=False)
+    sizes = {
+        chap: sum(map(len, cache.get(module_path, 43, chap).values())) + chapter_cache._ENTRY_OVERHEAD
+        for chap in (1, 2, 3)
+    }
+    cache.clear()
+    cache.memory_limit = sizes[1] + sizes[2] + sizes[3] - 1
+
+    cache.get(module_path, 43, 1)
+    cache.get(module_path, 43, 2)
+    cache.get(module_path, 43, 1)  # 1장을 최근 사용으로
+    cache.get(module_path, 43, 3)
+
+    assert [key[4] for key in cache._chapters] == [1, 3]
+    assert cache.memory_usage() == sizes[1] + sizes[3]
+    assert cache.memory_usage() <= cache.memory_limit
+
+
+def test_single_chapter_larger_than_limit_is_kept(module_path):
+    cache = ChapterCache(memory_limit=1, prefetch=False)
+
+    assert cache.get(module_path, 43, 3)
+    assert len(cache) == 1
+
+
+def test_next_chapter_is_prefetched(module_path):
+    cache = ChapterCache()
+    cache.get(module_path, 43, 1)
+    _wait_prefetch(cache)
+
+    assert [key[4] for key in cache._chapters] == [1, 2]
+    assert cache._pending == set()
+    # 미리 읽은 장은 다시 읽지 않음
+    cache.get(module_path, 43, 2, prefetch=False)
+    assert len(cache) == 2
+
+
+def test_no_prefetch_after_empty_chapter(module_path):
+    cache = ChapterCache()
+    cache.get(module_path, 43, 9)
+    _wait_prefetch(cache)
+
+    assert [key[4] for key in cache._chapters] == [9]
+
+
+def test_changed_module_is_read_again(module_path):
+    cache = ChapterCache(prefetch=False)
+    assert cache.get(module_path, 43, 2) == {1: "사흘째 되던 날"}
+
+    conn = sqlite3.connect(module_path)
+    conn.execute("UPDATE verses SET text='가나의 혼인 잔치' WHERE chapter=2")
+    conn.commit()
+    conn.close()
+    os.utime(module_path, ns=(1, 1))
+
+    assert cache.get(module_path, 43, 2) == {1: "가나의 혼인 잔치"}
+    assert cache.get(module_path + ".missing", 43, 2) == {}
+
+
+def test_generic_sqlite_bible_uses_detected_schema(tmp_path):
+    path = str(tmp_path / "KJV.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE bible (book_number INTEGER, ch INTEGER, v INTEGER, content TEXT)")
+    conn.executemany(
+        "INSERT INTO bible VALUES (?, ?, ?, ?)",
+        [(43, 3, 16, "For God so loved the world"), (43, 3, 17, "For God sent not his Son"), (43, 4, 1, "When")],
+    )
+    conn.commit()
+    conn.close()
+
+    assert load_bible_chapter(path, 43, 3) == {16: "For God so loved the world", 17: "For God sent not his Son"}
@@ -0,0 +1,85 @@
+import sqlite3
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from core import commentary_fts
+from core.commentary_fts import needs_refresh, refresh_commentary_index, search_commentary_index
+
+
+@pytest.fixture(params=["trigram", "like"])
+def index_format(request, monkeypatch):
+    if request.param == "trigram":
+        if not commentary_fts.trigram_supported():
+            pytest.skip("이 SQLite 는 FTS5 trigram 을 지원하지 않음")
+    else:
+        # 오래된 SQLite 처럼 모든 검색어를 LIKE 로
+        monkeypatch.setattr(commentary_fts, "trigram_supported", lambda: False)
+    return request.param
+
+
+@pytest.fixture
+def module_path(tmp_path):
+    path = str(tmp_path / "Sample.cmti")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE VerseCommentary (Book INT, ChapterBegin INT, VerseBegin INT, ChapterEnd INT, VerseEnd INT, Comments TEXT);
+        CREATE TABLE ChapterCommentary (Book INT, Chapter INT, Comments TEXT);
+        CREATE TABLE BookCommentary (Book INT, Comments TEXT);
+        """
+    )
+    conn.executemany(
+        "INSERT INTO VerseCommentary VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (43, 3, 16, 3, 16, "<p>하나님의 사랑은 독생자를 주신 사랑이다</p>"),
+            (43, 3, 17, 3, 18, "세상을 심판하려 하심이 아니요 구원하려 하심"),
+            (1, 1, 1, 1, 1, "태초에 God created 100% of it"),
+        ],
+    )
+    conn.execute("INSERT INTO ChapterCommentary VALUES (43, 3, '니고데모와의 대화')")
+    conn.execute("INSERT INTO BookCommentary VALUES (43, '요한복음 서론: 사랑의 복음')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _refs(hits):
+    return sorted((h.book, h.chapter, h.verse_from, h.verse_to) for h in hits)
+
+
+def test_search_finds_entries(index_format, module_path):
+    assert refresh_commentary_index([module_path]) == 1
+
+    assert _refs(search_commentary_index("사랑")) == [(43, 0, 0, 0), (43, 3, 16, 16)]
+    assert _refs(search_commentary_index("독생자")) == [(43, 3, 16, 16)]
+    assert _refs(search_commentary_index("구원하려 심판")) == [(43, 3, 17, 18)]
+    assert _refs(search_commentary_index("니고데모")) == [(43, 3, 0, 0)]
+    assert _refs(search_commentary_index("god")) == [(1, 1, 1, 1)]
+    assert search_commentary_index("없는말") == []
+
+
+def test_exclude_and_like_escapes(index_format, module_path):
+    refresh_commentary_index([module_path])
+
+    assert _refs(search_commentary_index("사랑 -서론")) == [(43, 3, 16, 16)]
+    assert _refs(search_commentary_index("100%")) == [(1, 1, 1, 1)]
+    # % 와 _ 는 LIKE 와일드카드가 아닌 글자로
+    assert search_commentary_index("1_0") == []
+    assert search_commentary_index("-사랑") == []
+
+
+def test_search_limited_to_files(index_format, module_path, tmp_path):
+    refresh_commentary_index([module_path])
+
+    assert search_commentary_index("사랑", files=[]) == []
+    assert search_commentary_index("사랑", files=[str(tmp_path / "Other.cmti")]) == []
+    assert len(search_commentary_index("사랑", files=[module_path])) == 2
+
+
+def test_refresh_only_when_changed(index_format, module_path):
+    assert needs_refresh([module_path])
+    refresh_commentary_index([module_path])
+    assert not needs_refresh([module_path])
+    assert refresh_commentary_index([module_path]) == 0
@@ -0,0 +1,106 @@
+import os
+import random
+import sqlite3
+
+import pytest
+
+from core.commentary_intervals import IntervalIndex, find_esword_verse_comments
+from core.verse_keys import verse_key
+
+
+def brute_overlapping(intervals, lo, hi):
+    return sorted(v for s, e, v in intervals if s <= hi and e >= lo)
+
+
+def test_empty_index():
+    index = IntervalIndex([])
+
+    assert len(index) == 0
+    assert index.overlapping(0, 100) == []
+
+
+def test_overlapping_returns_sorted_positions():
+    index = IntervalIndex([(10, 20, 1), (5, 8, 2), (15, 15, 3), (30, 40, 4)])
+
+    assert list(index.starts) == [5, 10, 15, 30]
+    assert index.overlapping(8, 15) == [0, 1, 2]
+    assert [index.values[i] for i in index.overlapping(21, 29)] == []
+    assert [index.values[i] for i in index.overlapping(40, 50)] == [4]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    intervals = []
+    for value in range(rng.randint(1, 300)):
+        start = rng.randint(0, 1000)
+        # 대부분 짧은 구간, 가끔 아주 긴 구간 (장 전체/책 전체 주석)
+        length = rng.choice([0, 0, 1, 3, 10, rng.randint(0, 1000)])
+        intervals.append((start, start + length, value))
+    index = IntervalIndex(intervals)
+
+    for _ in range(50):
+        lo = rng.randint(-10, 1010)
+        hi = lo + rng.choice([0, 0, 2, 20])
+        found = sorted(index.values[i] for i in index.overlapping(lo, hi))
+        assert found == brute_overlapping(intervals, lo, hi)
+
+
+# ========== e-Sword 모듈 ==========
+
+@pytest.fixture
+def commentary_path(tmp_path):
+    path = str(tmp_path / "commentary.cmti")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE VerseCommentary (Book INT, ChapterBegin INT, VerseBegin INT, ChapterEnd INT, VerseEnd INT, Comments TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO VerseCommentary VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (43, 3, 16, 3, 16, "3:16 주석"),
+            (43, 3, 30, 4, 5, "장을 넘는 구간"),
+            (43, 4, 1, 4, 3, "4:1-3 주석"),
+            (43, 4, 10, None, None, "끝이 빈 행"),
+            (43, 4, 20, 4, 2, "끝이 시작보다 앞"),
+            (1, 1, 1, 1, 1, "다른 책"),
+            (43, 4, 3, 4, 3, ""),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _comments(path, chap, first, last):
+    return [text for _, _, text in find_esword_verse_comments(path, "VerseCommentary", 43, chap, first, last)]
+
+
+def test_esword_spans_across_chapters(commentary_path):
+    assert _comments(commentary_path, 4, 3, 3) == ["장을 넘는 구간", "4:1-3 주석"]
+    assert _comments(commentary_path, 3, 16, 16) == ["3:16 주석"]
+    assert _comments(commentary_path, 4, 10, 10) == ["끝이 빈 행"]
+    assert _comments(commentary_path, 4, 20, 20) == ["끝이 시작보다 앞"]
+    assert _comments(commentary_path, 4, 6, 9) == []
+
+
+def test_esword_returns_verse_keys(commentary_path):
+    rows = find_esword_verse_comments(commentary_path, "VerseCommentary", 43, 3, 31, 31)
+
+    assert rows == [(verse_key(43, 3, 30), verse_key(43, 4, 5), "장을 넘는 구간")]
+
+
+def test_esword_index_rebuilds_after_change(commentary_path):
+    assert _comments(commentary_path, 5, 1, 1) == []
+
+    conn = sqlite3.connect(commentary_path)
+    conn.execute("INSERT INTO VerseCommentary VALUES (43, 5, 1, 5, 1, '새 주석')")
+    conn.commit()
+    conn.close()
+    os.utime(commentary_path, ns=(1, 1))
+
+    assert _comments(commentary_path, 5, 1, 1) == ["새 주석"]
+
+
+def test_esword_unknown_table(commentary_path):
+    assert find_esword_verse_comments(commentary_path, "Missing", 43, 3, 16, 16) is None
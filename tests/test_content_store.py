@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+
+from core.content_store import ContentStore, content_id, make_preview, prune_spill_dir
+
+
+def test_same_text_same_id():
+    store = ContentStore(memory_limit=1000)
+
+    assert store.put("태초에") == store.put("태초에") == content_id("태초에")
+    assert store.memory_usage() == 3
+
+
+def test_evicted_text_is_read_back_from_disk(tmp_path):
+    store = ContentStore(memory_limit=10, spill_dir=str(tmp_path))
+    ids = [store.put(f"본문 {i:04d}") for i in range(5)]
+
+    assert store.memory_usage() <= 10
+    assert [store.get(cid) for cid in ids] == [f"본문 {i:04d}" for i in range(5)]
+    assert store.get(content_id("없는 본문")) is None
+
+
+def test_text_is_readable_while_spill_is_in_progress(tmp_path):
+    store = ContentStore(memory_limit=10, spill_dir=str(tmp_path))
+    first = store.put("첫 번째 본문")
+    started, release = threading.Event(), threading.Event()
+    seen = []
+    original_spill = store._spill
+
+    def slow_spill(cid, text):
+        started.set()
+        release.wait(5)
+        return original_spill(cid, text)
+
+    store._spill = slow_spill
+    writer = threading.Thread(target=store.put, args=("두 번째 본문",))
+    writer.start()
+    assert started.wait(5)
+    # 메모리에서는 밀려났지만 아직 디스크에 없는 동안에도 읽을 수 있어야 함
+    seen.append(store.get(first))
+    release.set()
+    writer.join(5)
+
+    assert seen == ["첫 번째 본문"]
+    assert store.get(first) == "첫 번째 본문"
+
+
+def test_failed_spill_keeps_text_in_memory(tmp_path):
+    store = ContentStore(memory_limit=10, spill_dir=str(tmp_path))
+    store._spill = lambda cid, text: False
+    first = store.put("첫 번째 본문")
+    store.put("두 번째 본문")
+
+    assert store.get(first) == "첫 번째 본문"
+
+
+def _write(path, size, age):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    t = time.time() - age
+    os.utime(path, (t, t))
+
+
+def test_prune_removes_old_files_then_least_recently_used(tmp_path):
+    _write(str(tmp_path / "aa" / "old"), 10, age=100)
+    _write(str(tmp_path / "aa" / "older_used"), 10, age=50)
+    _write(str(tmp_path / "bb" / "recent"), 10, age=1)
+    _write(str(tmp_path / "bb" / "writing.tmp"), 10, age=1)
+
+    assert prune_spill_dir(str(tmp_path), max_bytes=1000, max_age=80) == 1
+    assert not (tmp_path / "aa" / "old").exists()
+
+    assert prune_spill_dir(str(tmp_path), max_bytes=20, max_age=80) == 1
+    assert not (tmp_path / "aa" / "older_used").exists()
+    assert (tmp_path / "bb" / "recent").exists()
+    assert (tmp_path / "bb" / "writing.tmp").exists()
+
+
+def test_reading_refreshes_spill_file(tmp_path):
+    store = ContentStore(memory_limit=10, spill_dir=str(tmp_path))
+    first = store.put("첫 번째 본문")
+    store.put("두 번째 본문")
+    path = store._spill_path(first)
+    os.utime(path, (1, 1))
+
+    store.put("세 번째 본문")
+    assert store.get(first) == "첫 번째 본문"
+    assert os.stat(path).st_mtime > 1
+
+
+def test_make_preview():
+    assert make_preview("짧은 글", limit=10) == "짧은 글"
+    assert make_preview("가" * 12, limit=10) == "가" * 10 + "..."
@@ -0,0 +1,150 @@
+import os
+import sqlite3
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from core import db_pool
+from core.db_pool import ModuleConnectionPool
+
+
+def _make_db(path, value):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (v TEXT)")
+    conn.execute("INSERT INTO t VALUES (?)", (value,))
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def modules(tmp_path):
+    return [_make_db(str(tmp_path / f"m{i}.mybible"), f"모듈 {i}") for i in range(3)]
+
+
+def _read(pool, path):
+    with pool.connection(path) as conn:
+        return conn.execute("SELECT v FROM t").fetchone()[0]
+
+
+def _is_closed(conn):
+    try:
+        conn.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+
+def test_connection_is_reused_and_read_only(modules):
+    pool = ModuleConnectionPool()
+    with pool.connection(modules[0]) as first:
+        with pytest.raises(sqlite3.OperationalError):
+            first.execute("INSERT INTO t VALUES ('x')")
+    with pool.connection(modules[0]) as second:
+        assert second is first
+    assert _read(pool, modules[0]) == "모듈 0"
+
+
+def test_missing_file(tmp_path):
+    pool = ModuleConnectionPool()
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.connection(str(tmp_path / "없음.mybible")):
+            pass
+    assert not (tmp_path / "없음.mybible").exists()
+
+
+def test_least_recently_used_connection_is_closed(modules):
+    pool = ModuleConnectionPool(max_open=2)
+    conns = {}
+    for path in (modules[0], modules[1], modules[0], modules[2]):
+        with pool.connection(path) as conn:
+            conns[path] = conn
+
+    assert list(pool._entries) == [os.path.abspath(modules[0]), os.path.abspath(modules[2])]
+    assert _is_closed(conns[modules[1]])
+    assert not _is_closed(conns[modules[0]])
+
+
+def test_connection_in_use_is_not_evicted(modules):
+    pool = ModuleConnectionPool(max_open=1)
+    with pool.connection(modules[0]) as held:
+        assert _read(pool, modules[1]) == "모듈 1"
+        assert not _is_closed(held)
+    # 반납 뒤 다음 대여 때 정리
+    assert _read(pool, modules[2]) == "모듈 2"
+    assert list(pool._entries) == [os.path.abspath(modules[2])]
+    assert _is_closed(held)
+
+
+def test_idle_connection_is_closed(modules, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(db_pool, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    pool = ModuleConnectionPool(idle_timeout=10)
+    with pool.connection(modules[0]) as idle:
+        pass
+
+    clock[0] += 5
+    _read(pool, modules[1])
+    assert not _is_closed(idle)
+
+    clock[0] += 6
+    _read(pool, modules[1])
+    assert _is_closed(idle)
+    assert list(pool._entries) == [os.path.abspath(modules[1])]
+
+
+def test_changed_file_gets_new_connection(modules):
+    pool = ModuleConnectionPool()
+    with pool.connection(modules[0]) as old:
+        pass
+
+    conn = sqlite3.connect(modules[0])
+    conn.execute("UPDATE t SET v='바뀐 모듈'")
+    conn.commit()
+    conn.close()
+    os.utime(modules[0], ns=(1, 1))
+
+    assert _read(pool, modules[0]) == "바뀐 모듈"
+    assert _is_closed(old)
+
+
+def test_one_thread_per_connection(modules):
+    pool = ModuleConnectionPool()
+    holding, release = threading.Event(), threading.Event()
+    order = []
+
+    def first():
+        with pool.connection(modules[0]):
+            order.append("first in")
+            holding.set()
+            release.wait(5)
+            order.append("first out")
+
+    def second():
+        with pool.connection(modules[0]):
+            order.append("second in")
+
+    t1 = threading.Thread(target=first)
+    t1.start()
+    assert holding.wait(5)
+    t2 = threading.Thread(target=second)
+    t2.start()
+    t2.join(0.2)
+    # 다른 파일은 막히지 않음
+    assert _read(pool, modules[1]) == "모듈 1"
+    assert order == ["first in"]
+
+    release.set()
+    t1.join(5)
+    t2.join(5)
+    assert order == ["first in", "first out", "second in"]
+
+
+def test_close_all_keeps_connections_in_use(modules):
+    pool = ModuleConnectionPool()
+    _read(pool, modules[1])
+    with pool.connection(modules[0]) as held:
+        pool.close_all()
+        assert not _is_closed(held)
+        assert list(pool._entries) == [os.path.abspath(modules[0])]
@@ -0,0 +1,264 @@
+import random
+import re
+from typing import Dict, List
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from core.bible_utils import get_ultimate_bible_map
+from core.search_engine import fetch_intro
+
+BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP = get_ultimate_bible_map()
+
+
+# ========== 비교 대상: 예전 구현 (변경 전 코드 그대로) ==========
+
+def legacy_fetch_intro(
+    text: str,
+    std: str,
+    chap: str,
+    verse_input: str,
+    bible_alias_flat: Dict[str, str],
+    bible_raw_map: Dict[str, List[str]],
+) -> Dict[str, str]:
+    """
+    책 서론 / 장 서론을 추출하는 로직을 담당합니다.
+    기존 search_engine 내부의 서론 관련 정규식 로직을 그대로 이동했습니다.
+    """
+    results_dict: Dict[str, str] = {}
+
+    # 책 서론 패턴
+    book_intro_patterns = [
+        r"(?:\[\[\s*@Bible:)([A-Za-z 가 - 힣\d]+)\s+(\d+)(?:\s*\]\])(.*?)(?=\[\[\s*@Bible:|[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)",
+        r"(?:\[\[@Bible:)([A-Za-z 가 - 힣\d]+)\s+(\d+)(?:\]\])(.*?)(?=\[\[@Bible:|[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)",
+        r"(?:\[\[\s*@Bible:)([A-Za-z 가 - 힣\d]+)\s+(\d+)(?:\s*\]\])(.*?)(?=\[\[\s*@Bible:|[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)",
+        r"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)([A-Za-z 가 - 힣\d]+)\s*0:0(?!\s*\]\]\s*>>\s*\1\s*0:0\s*\]\])(?:\s*\]\]|\]\]|:\d+|\b)(.*?)(?=(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)",
+        r"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)([A-Za-z 가 - 힣\d]+)\s*0:00(?!\s*\]\]\s*>>\s*\1\s*0:00\s*\]\])(?:\s*\]\]|\]\]|:\d+|\b)(.*?)(?=(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)",
+        r"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)([A-Za-z 가 - 힣\d]+)\s*0\s+0(?!\s*\]\]\s*>>\s*\1\s*0\s+0\s*\]\])(?:\s*\]\]|\]\]|:\d+|\b)(.*?)(?=(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)",
+    ]
+
+    # verse_input != "0" 인 경우, 책/장 서론 패턴 먼저 스캔
+    if verse_input != "0":
+        for pattern in book_intro_patterns:
+            matches = re.finditer(pattern, text, re.DOTALL | re.IGNORECASE)
+            for m in matches:
+                groups = m.groups()
+                if pattern in [book_intro_patterns[0], book_intro_patterns[1], book_intro_patterns[2]]:
+                    book, chapter, content = groups
+                    normalized_book = book.strip()
+                    std_book = bible_alias_flat.get(normalized_book)
+                    if std_book and std_book == std:
+                        content = content.strip()
+                        if content:
+                            key = f"#### [{std_book} {chapter} (장 서론)]"
+                            if key not in results_dict:
+                                results_dict[key] = content
+                else:
+                    book, content = groups[:2]
+                    normalized_book = book.strip()
+                    std_book = bible_alias_flat.get(normalized_book)
+                    if std_book and std_book == std:
+                        content = content.strip()
+                        if content:
+                            key = f"#### [{std_book} 0:0 (서론)]"
+                            if key not in results_dict:
+                                results_dict[key] = content
+
+    # 장 서론 패턴
+    chapter_intro_pattern = (
+        r"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)([A-Za-z 가 - 힣\d]+)\s*(\d+):0(?!\s*\]\]\s*>>\s*\1\s*\2:0\s*\]\])"
+        r"(?:\s*\]\]|\]\]|:\d+|\b)(.*?)(?=(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:)"
+        r"[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])|$)"
+    )
+    matches = re.finditer(chapter_intro_pattern, text, re.DOTALL | re.IGNORECASE)
+    for m in matches:
+        book, chapter, content = m.groups()
+        normalized_book = book.strip()
+        std_book = bible_alias_flat.get(normalized_book)
+        if std_book and std_book == std and chapter == chap:
+            content = content.strip()
+            if content:
+                key = f"#### [{std_book} {chapter}:0 (장 서론)]"
+                if key not in results_dict:
+                    results_dict[key] = content
+
+    # 책 서론 처리 (chap == "0")
+    if chap == "0":
+        intro_pattern = rf"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:){re.escape(std)}\s*1:1(?:\s*\]\]|\]\])"
+        match = re.search(intro_pattern, text, re.IGNORECASE)
+        if match:
+            intro_content = text[: match.start()].strip()
+            last_bible_ref = re.findall(
+                r"(?:\[\[\s*@Bible:|\[\[@Bible:|\[\[@Bible:|@Bible:)[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\]).*?"
+                r"(?=(?:\[\[\s*@Bible:|\[\[@Bible:|\[\[@Bible:|@Bible:)[A-Za-z 가 - 힣\d]+\s*\d+:\d+|$)",
+                text[: match.start()],
+                re.DOTALL | re.IGNORECASE,
+            )
+            if last_bible_ref:
+                last_match = re.search(
+                    r"(?:\[\[\s*@Bible:|\[\[@Bible:|\[\[@Bible:|@Bible:)"
+                    r"[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])",
+                    last_bible_ref[-1],
+                    re.IGNORECASE,
+                )
+                if last_match:
+                    intro_content = last_bible_ref[-1][last_match.end() :].strip()
+            else:
+                intro_content = text[: match.start()].strip()
+
+            if intro_content:
+                key = f"#### [{std} 0:0 (서론)]"
+                if key not in results_dict:
+                    results_dict[key] = intro_content
+
+    # 장 서론 처리 (chap != "0" 이고 verse_input == "0")
+    elif verse_input == "0":
+        all_names = [std] + bible_raw_map.get(std, [])
+        intro_start_pattern = "(?:"
+        for i, name in enumerate(all_names):
+            if i > 0:
+                intro_start_pattern += "|"
+            intro_start_pattern += (
+                rf"\[\[\s*@Bible:{re.escape(name)}\s*{chap}\s*\]\]|"
+                rf"\[\[@Bible:{re.escape(name)}\s*{chap}\s*\]\]|"
+                rf"\[\[@Bible:{re.escape(name)}\s*{chap}\s*\]\]|"
+                rf"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:){re.escape(name)}\s*{chap}:0(?:\s*\]\]|\]\])"
+            )
+        intro_start_pattern += ")"
+
+        intro_end_pattern = "(?:"
+        for i, name in enumerate(all_names):
+            if i > 0:
+                intro_end_pattern += "|"
+            intro_end_pattern += (
+                rf"\[\[\s*@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
+                rf"\[\[@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
+                rf"\[\[@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
+                rf"\[\[@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
+                rf"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:){re.escape(name)}\s*{chap}:1(?:\s*\]\]|\]\])"
+            )
+        intro_end_pattern += ")"
+
+        start_match = re.search(intro_start_pattern, text, re.IGNORECASE)
+        end_match = re.search(intro_end_pattern, text, re.IGNORECASE)
+
+        if start_match and end_match and start_match.start() < end_match.start():
+            intro_content = text[start_match.end() : end_match.start()].strip()
+            if intro_content:
+                key = f"#### [{std} {chap}:0 (장 서론)]"
+                if key not in results_dict:
+                    results_dict[key] = intro_content
+        else:
+            fallback_pattern = "(?:"
+            for i, name in enumerate(all_names):
+                if i > 0:
+                    fallback_pattern += "|"
+                fallback_pattern += (
+                    rf"\[\[\s*@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
+                    rf"\[\[@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
+                    rf"\[\[@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
+                    rf"\[\[@Bible:{re.escape(name)}\s*{chap}:1\s*\]\]|"
+                    rf"(?:\[\[\s*@Bible:|\[\[@Bible:|@Bible:){re.escape(name)}\s*{chap}:1(?:\s*\]\]|\]\])"
+                )
+            fallback_pattern += ")"
+
+            match = re.search(fallback_pattern, text, re.IGNORECASE)
+            if match:
+                intro_content = text[: match.start()].strip()
+                last_bible_ref = re.findall(
+                    r"(?:\[\[\s*@Bible:|\[\[@Bible:|\[\[@Bible:|@Bible:)"
+                    r"[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\]).*?"
+                    r"(?=(?:\[\[\s*@Bible:|\[\[@Bible:|\[\[@Bible:|@Bible:)[A-Za-z 가 - 힣\d]+\s*\d+:\d+|$)",
+                    text[: match.start()],
+                    re.DOTALL | re.IGNORECASE,
+                )
+                if last_bible_ref:
+                    last_match = re.search(
+                        r"(?:\[\[\s*@Bible:|\[\[@Bible:|\[\[@Bible:|@Bible:)"
+                        r"[A-Za-z 가 - 힣\d]+\s*\d+:\d+(?:\s*\]\]|\]\])",
+                        last_bible_ref[-1],
+                        re.IGNORECASE,
+                    )
+                    if last_match:
+                        intro_content = last_bible_ref[-1][last_match.end() :].strip()
+                else:
+                    intro_content = text[: match.start()].strip()
+
+                if intro_content:
+                    key = f"#### [{std} {chap}:0 (장 서론)]"
+                    if key not in results_dict:
+                        results_dict[key] = intro_content
+
+    return results_dict
+
+
+# ========== 임의 문서 생성 ==========
+
+def _bracketed_markers(rng: random.Random) -> List[str]:
+    return [
+        f"[[@Bible:Joh {rng.randint(1, 3)}:{rng.randint(1, 3)}]]",
+        f"[[@Bible:Joh {rng.randint(1, 3)}]]",
+        f"[[@Bible:Joh {rng.randint(1, 3)}:0]]",
+        "[[@Bible:Joh 0:0]]",
+        "[[@Bible:Joh 0:0]] >> Joh 0:0]]",
+        f"[[@Bible:Rom {rng.randint(1, 3)}:{rng.randint(1, 3)}]]",
+    ]
+
+
+def _bare_markers(rng: random.Random) -> List[str]:
+    return [
+        f"@Bible:Joh {rng.randint(1, 3)}:{rng.randint(1, 3)}",
+        f"@Bible:Joh {rng.randint(1, 3)}:0",
+        "@Bible:Joh 0:0",
+        f"@Bible:Rom {rng.randint(1, 3)}:{rng.randint(1, 3)}",
+        "@Bible:Rom 0:0",
+    ]
+
+
+def _intro_forms(rng: random.Random) -> List[str]:
+    return ["@Bible:Joh 0 0", "@Bible:Joh 0:00", f"[[@Bible:Joh {rng.randint(1, 3)}:00]]"]
+
+
+LAYOUTS = {
+    "bracketed": [_bracketed_markers],
+    "bare": [_bare_markers],
+    "mixed": [_bracketed_markers, _bare_markers],
+    "intro_forms": [_bracketed_markers, _bare_markers, _intro_forms],
+}
+FILLERS = ["", " 본문 ", "\n서론 글\n", " 가나다 ", " x "]
+QUERIES = [("0", "0"), ("0", "1"), ("1", "0"), ("2", "0"), ("3", "0"), ("1", "1"), ("2", "2")]
+
+
+def random_document(rng: random.Random, layout: str) -> str:
+    markers = [m for make in LAYOUTS[layout] for m in make(rng)]
+    parts = [rng.choice(FILLERS) + rng.choice(markers) for _ in range(rng.randint(1, 7))]
+    return "".join(parts) + rng.choice(FILLERS)
+
+
+# ========== 테스트 ==========
+
+def test_book_intro_before_first_verse():
+    text = "[[@Bible:Luk 24:53]] 누가 끝\n요한복음 서론\n[[@Bible:Joh 1:1]] 태초에"
+    result = fetch_intro(text, "Joh", "0", "0", BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP)
+
+    assert result == {"#### [Joh 0:0 (서론)]": "누가 끝\n요한복음 서론"}
+
+
+def test_chapter_marker_intro():
+    text = "[[@Bible:Joh 3]] 3장 개요 [[@Bible:Joh 3:1]] 니고데모 [[@Bible:Joh 3:2]] 밤에"
+    result = fetch_intro(text, "Joh", "3", "1", BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP)
+
+    assert result == {"#### [Joh 3 (장 서론)]": "3장 개요"}
+
+
+@pytest.mark.parametrize("layout", sorted(LAYOUTS))
+def test_fetch_intro_matches_previous_regexes(layout):
+    rng = random.Random(layout)
+    for _ in range(300):
+        text = random_document(rng, layout)
+        for chap, verse_input in QUERIES:
+            expected = legacy_fetch_intro(text, "Joh", chap, verse_input, BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP)
+            actual = fetch_intro(text, "Joh", chap, verse_input, BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP)
+            # 결과 순서도 같아야 함 (화면에 이 순서로 표시)
+            assert list(actual.items()) == list(expected.items()), text
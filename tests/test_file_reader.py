@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+file_reader = pytest.importorskip("core.file_reader")
+from core.cache_utils import file_signature
+
+
+@pytest.fixture
+def extract_calls(monkeypatch):
+    calls = []
+    original = file_reader.extract_text
+
+    def counting_extract(path):
+        calls.append(path)
+        return original(path)
+
+    monkeypatch.setattr(file_reader, "extract_text", counting_extract)
+    return calls
+
+
+def _write(path, text, ns):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(ns, ns))
+    return str(path)
+
+
+def test_file_signature(tmp_path):
+    path = _write(tmp_path / "a.rtf", "본문", 10**18)
+
+    assert file_signature(path) == (os.path.abspath(path), 10**18, len("본문".encode("utf-8")))
+    assert file_signature(str(tmp_path / "없음.rtf")) is None
+
+
+def test_unchanged_file_is_read_from_cache(tmp_path, extract_calls):
+    path = _write(tmp_path / "sermon.rtf", "{\\rtf1 태초에}", 10**18)
+
+    first = file_reader.read_file(path)
+    assert file_reader.read_file(path) == first
+    assert extract_calls == [path]
+    assert os.path.exists(os.path.join(file_reader.get_cache_path(""), file_reader.TEXT_CACHE_DB))
+
+
+def test_changed_mtime_or_size_is_extracted_again(tmp_path, extract_calls):
+    path = _write(tmp_path / "sermon.rtf", "첫 번째 본문", 10**18)
+    assert file_reader.read_file(path) == "첫 번째 본문"
+
+    # 크기가 같아도 mtime 이 바뀌면 다시 추출
+    _write(tmp_path / "sermon.rtf", "두 번째 본문", 10**18 + 1)
+    assert file_reader.read_file(path) == "두 번째 본문"
+
+    # mtime 이 같아도 크기가 바뀌면 다시 추출
+    _write(tmp_path / "sermon.rtf", "세 번째의 긴 본문", 10**18 + 1)
+    assert file_reader.read_file(path) == "세 번째의 긴 본문"
+    assert len(extract_calls) == 3
+
+
+def test_read_errors_are_not_cached(tmp_path, monkeypatch):
+    path = _write(tmp_path / "broken.rtf", "본문", 10**18)
+
+    def failing_extract(_path):
+        raise ValueError("손상된 파일")
+
+    original = file_reader.extract_text
+    monkeypatch.setattr(file_reader, "extract_text", failing_extract)
+    assert file_reader.read_file(path).startswith("파일 읽기 오류")
+    assert file_reader._load_cached_text(file_signature(path)) is None
+
+    monkeypatch.setattr(file_reader, "extract_text", original)
+    assert file_reader.read_file(path) == "본문"
+
+
+def test_txt_is_not_cached(tmp_path, extract_calls):
+    path = _write(tmp_path / "notes.txt", "메모", 10**18)
+
+    assert file_reader.read_file(path) == "메모"
+    assert file_reader.read_file(path) == "메모"
+    assert len(extract_calls) == 2
+    assert file_reader.read_file(str(tmp_path / "없음.rtf")) == ""
+    assert file_reader.read_file(_write(tmp_path / "data.bin", "x", 10**18)) == ""
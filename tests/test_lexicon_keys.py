@@ -0,0 +1,115 @@
+import os
+import random
+import sqlite3
+from typing import List
+
+import pytest
+
+from core.lexicon_keys import LexiconKeyIndex, fold_key, get_lexicon_key_index, suggest_lexicon_keys
+
+STRONG_KEYS = [f"G{n}" for n in range(1, 300)] + [f"H{n}" for n in range(1, 50)]
+
+
+def osa_distance(a: str, b: str) -> int:
+    """삽입/삭제/치환/인접 글자 뒤바뀜 편집 거리 (기준 구현)"""
+    d = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i][0] = i
+    for j in range(len(b) + 1):
+        d[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[len(a)][len(b)]
+
+
+def test_prefix_uses_natural_order():
+    index = LexiconKeyIndex(STRONG_KEYS)
+
+    assert index.prefix("G2", 6) == ["G2", "G20", "G21", "G22", "G23", "G24"]
+    assert index.prefix("g29", 3) == ["G29", "G290", "G291"]
+    assert index.prefix("X", 5) == []
+
+
+def test_exact_key_comes_first():
+    index = LexiconKeyIndex(["사랑하다", "사랑", "사랑의", "G26"])
+
+    assert index.prefix("사랑") == ["사랑", "사랑의", "사랑하다"]
+
+
+def test_fold_ignores_case_and_normalization_form():
+    decomposed = "\u1109\u1161\u1105\u1161\u11bc"  # NFD "사랑"
+    index = LexiconKeyIndex(["Agape", "사랑"])
+
+    assert fold_key(" AGAPE ") == "agape"
+    assert "agape" in index
+    assert index.prefix(decomposed) == ["사랑"]
+
+
+def test_duplicates_and_blanks_are_ignored():
+    index = LexiconKeyIndex(["G1", "g1", "", None, "  ", "G2"])
+
+    assert len(index) == 2
+    assert index.first(10) == ["G1", "G2"]
+
+
+def test_large_prefix_range_scans_natural_order():
+    keys = [f"G{n}" for n in range(1, 6000)]
+    index = LexiconKeyIndex(keys)
+
+    assert index.prefix("G", 4) == ["G1", "G2", "G3", "G4"]
+    assert index.prefix("G1", 3) == ["G1", "G10", "G11"]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_fuzzy_finds_every_key_within_one_edit(seed):
+    rng = random.Random(seed)
+    alphabet = "abcd가나"
+    keys: List[str] = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 5))) for _ in range(150)})
+    index = LexiconKeyIndex(keys)
+
+    for _ in range(30):
+        query = "".join(rng.choice(alphabet) for _ in range(rng.randint(2, 5)))
+        found = index.fuzzy(query, limit=len(keys))
+        expected = {k for k in keys if osa_distance(query, k) <= 1}
+        assert expected <= set(found), query
+        assert all(abs(len(k) - len(query)) <= 1 for k in found)
+
+
+def test_complete_fills_with_typo_matches():
+    index = LexiconKeyIndex(["agape", "agapao", "phileo", "eros"])
+
+    assert index.complete("agap") == ["agapao", "agape"]
+    assert index.complete("phlieo") == ["phileo"]
+
+
+def _write_lexicon(path: str, keys: List[str]) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE topics (id INTEGER PRIMARY KEY, topic TEXT)")
+    conn.executemany("INSERT INTO topics (topic) VALUES (?)", [(k,) for k in keys])
+    conn.commit()
+    conn.close()
+
+
+def test_index_reloads_when_lexicon_changes(tmp_path):
+    path = str(tmp_path / "strong.dct.twm")
+    _write_lexicon(path, ["G1", "G2", "G26"])
+
+    first = get_lexicon_key_index(path, "topic")
+    assert get_lexicon_key_index(path, "topic") is first
+    assert first.prefix("G2") == ["G2", "G26"]
+
+    _write_lexicon(path, ["G1", "G2", "G26", "G27", "G28"])
+    os.utime(path, ns=(1, 1))
+    assert get_lexicon_key_index(path, "topic").prefix("G2") == ["G2", "G26", "G27", "G28"]
+    # 접두어 결과가 모자라면 오타 허용 결과(G1)로 채움
+    assert suggest_lexicon_keys(path, "topic", "G2", limit=5) == ["G2", "G26", "G27", "G28", "G1"]
+
+
+def test_missing_lexicon_has_no_suggestions(tmp_path):
+    assert suggest_lexicon_keys(str(tmp_path / "none.dct.twm"), "topic", "G") == []
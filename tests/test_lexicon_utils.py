@@ -0,0 +1,149 @@
+import os
+import sqlite3
+import time
+import zlib
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from core import lexicon_utils
+from core.lexicon_utils import (
+    build_lexicon_store,
+    decode_lexicon_entry,
+    get_lexicon_build_status,
+    is_lexicon_store_complete,
+    lookup_lexicon,
+    prewarm_lexicons,
+    start_background_lexicon_build,
+)
+
+ENTRIES = [
+    (1, "G26", "사랑 (아가페)", None),
+    (2, "G2889", "세상 \\u53076?", None),
+    (3, "G26", "같은 키의 두 번째 항목", None),
+    (4, "H430", None, zlib.compress("엘로힘 하나님".encode("utf-8"))),
+    (5, "G0", "", None),
+]
+
+
+def _write_lexicon(path, entries):
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE topics (id INTEGER PRIMARY KEY, subject TEXT);
+        CREATE TABLE content (topic_id INTEGER, data TEXT, data2 BLOB);
+        """
+    )
+    # content 는 id 역순으로 넣어 행 순서와 topics.id 순서가 다르게 함
+    for topic_id, key, data, data2 in reversed(entries):
+        conn.execute("INSERT INTO topics VALUES (?, ?)", (topic_id, key))
+        conn.execute("INSERT INTO content VALUES (?, ?, ?)", (topic_id, data, data2))
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def lexicon_path(tmp_path):
+    return _write_lexicon(str(tmp_path / "Strong.dct.twm"), ENTRIES)
+
+
+def _store_rows(path):
+    conn = sqlite3.connect(lexicon_utils.lexicon_store_path(path))
+    try:
+        return {key: lexicon_utils._unpack(blob) for key, blob in conn.execute("SELECT key, plain FROM entries")}
+    finally:
+        conn.close()
+
+
+def test_decode_entry():
+    assert decode_lexicon_entry("세상 \\u53076?") == "세상 코"
+    assert decode_lexicon_entry(None, zlib.compress("압축 본문".encode("utf-8"))) == "압축 본문"
+    assert decode_lexicon_entry("") is None
+
+
+def test_lookup_decodes_and_stores(lexicon_path):
+    assert lookup_lexicon(lexicon_path, " G2889 ", "subject") == ("세상 코", "세상 코")
+    assert lookup_lexicon(lexicon_path, "H430", "subject")[0] == "엘로힘 하나님"
+    assert lookup_lexicon(lexicon_path, "없음", "subject") == (None, None)
+    assert lookup_lexicon(lexicon_path, "G26", "") == (None, None)
+
+    # 결과 없음도 저장
+    assert _store_rows(lexicon_path) == {"G2889": "세상 코", "H430": "엘로힘 하나님", "없음": None}
+
+
+def test_lookup_and_build_keep_the_same_duplicate(lexicon_path, tmp_path):
+    assert lookup_lexicon(lexicon_path, "G26", "subject")[0] == "사랑 (아가페)"
+
+    other = _write_lexicon(str(tmp_path / "Other.dct.twm"), ENTRIES)
+    assert build_lexicon_store(other, "subject") == 4
+    assert _store_rows(other)["G26"] == "사랑 (아가페)"
+    assert lookup_lexicon(other, "G26", "subject")[0] == "사랑 (아가페)"
+
+
+def test_store_is_cleared_when_lexicon_changes(lexicon_path):
+    assert build_lexicon_store(lexicon_path, "subject") == 4
+    assert is_lexicon_store_complete(lexicon_path, "subject")
+    assert build_lexicon_store(lexicon_path, "subject") == 0
+
+    conn = sqlite3.connect(lexicon_path)
+    conn.execute("UPDATE content SET data='고친 항목' WHERE topic_id=1")
+    conn.commit()
+    conn.close()
+    os.utime(lexicon_path, ns=(1, 1))
+
+    assert not is_lexicon_store_complete(lexicon_path, "subject")
+    assert _store_rows(lexicon_path) == {}
+    assert lookup_lexicon(lexicon_path, "G26", "subject")[0] == "고친 항목"
+
+
+def test_index_column_change_clears_store(lexicon_path):
+    build_lexicon_store(lexicon_path, "subject")
+
+    assert not is_lexicon_store_complete(lexicon_path, "id")
+    assert _store_rows(lexicon_path) == {}
+
+
+def _wait_build(path):
+    deadline = time.monotonic() + 10
+    while get_lexicon_build_status(path)["running"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return get_lexicon_build_status(path)
+
+
+def test_background_build_runs_once(lexicon_path):
+    assert get_lexicon_build_status(lexicon_path)["running"] is False
+    assert start_background_lexicon_build(lexicon_path, "subject")
+
+    status = _wait_build(lexicon_path)
+    assert status["running"] is False and status["error"] is None
+    assert is_lexicon_store_complete(lexicon_path, "subject")
+    # 완료된 저장소는 스레드를 다시 만들지 않음
+    assert not start_background_lexicon_build(lexicon_path, "subject")
+
+
+def test_prewarm_lexicons(lexicon_path, tmp_path):
+    other = _write_lexicon(str(tmp_path / "Other.dct.twm"), ENTRIES[:2])
+    empty = _write_lexicon(str(tmp_path / "Empty.dct.twm"), [])
+    progress = []
+
+    stats = prewarm_lexicons(
+        [lexicon_path, other, empty, str(tmp_path / "없음.dct.twm")],
+        max_workers=1,
+        progress_callback=lambda done, total, path: progress.append((done, total)),
+    )
+
+    by_name = {os.path.basename(s.path): s for s in stats}
+    assert sorted(by_name) == ["Empty.dct.twm", "Other.dct.twm", "Strong.dct.twm"]
+    assert (by_name["Strong.dct.twm"].entries, by_name["Strong.dct.twm"].rows) == (4, 5)
+    assert by_name["Other.dct.twm"].entries == 2
+    assert by_name["Empty.dct.twm"].entries == 0
+    assert progress == [(1, 2), (2, 2)]
+    assert all(is_lexicon_store_complete(path, "subject") for path in (lexicon_path, other, empty))
+    assert _store_rows(lexicon_path)["G26"] == "사랑 (아가페)"
+
+    again = prewarm_lexicons([lexicon_path], max_workers=1)
+    assert again[0].skipped and again[0].entries == 4
+    forced = prewarm_lexicons([lexicon_path], max_workers=1, force=True)
+    assert not forced[0].skipped and forced[0].added == 4
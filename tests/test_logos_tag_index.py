@@ -0,0 +1,99 @@
+import random
+from typing import Dict, List, Tuple
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from core.bible_utils import get_ultimate_bible_map
+from core.search_engine import BookTagIndex, fetch_bible_text, scan_logos_verse_tags
+
+BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP = get_ultimate_bible_map()
+
+
+# ========== 비교 대상: 예전 구현 (태그 목록 선형 탐색, 변경 전 fetch_bible_text 의 인덱스 모드) ==========
+
+def legacy_fetch_with_index(
+    text: str, tag_index: Dict[str, List[Tuple[int, int, str, str]]], std: str, chap: str, verses: List[str]
+) -> Dict[str, str]:
+    results_dict: Dict[str, str] = {}
+    for verse in verses:
+        matched_positions = []
+        if std in tag_index:
+            for start_pos, end_pos, indexed_chap, indexed_verse in tag_index[std]:
+                if indexed_chap == chap and indexed_verse == verse:
+                    matched_positions.append((start_pos, end_pos))
+
+        if matched_positions:
+            start_pos, end_pos = matched_positions[0]
+            content_end = len(text)
+            next_verse_num = int(verse) + 1
+            for start_pos_next, end_pos_next, indexed_chap, indexed_verse in tag_index.get(std, []):
+                if indexed_chap == chap and indexed_verse == str(next_verse_num):
+                    if start_pos_next > end_pos:
+                        content_end = start_pos_next
+                        break
+
+            content = text[end_pos:content_end].strip()
+            if content:
+                result_key = f"#### [{std} {chap}:{verse}]"
+                if result_key not in results_dict:
+                    results_dict[result_key] = content
+    return results_dict
+
+
+def legacy_tag_index(text: str) -> Dict[str, List[Tuple[int, int, str, str]]]:
+    """새 토크나이저가 찾은 태그를 예전 인덱스 형식 {책: [(시작, 끝, "장", "절"), ...]} 으로 변환"""
+    index: Dict[str, List[Tuple[int, int, str, str]]] = {}
+    for start, end, book, chap, verse in scan_logos_verse_tags(text, BIBLE_ALIAS_FLAT):
+        index.setdefault(book, []).append((start, end, str(chap), str(verse)))
+    return index
+
+
+def random_document(rng: random.Random, tags: int) -> str:
+    parts = []
+    for i in range(tags):
+        book = rng.choice(["Joh", "Rom", "요", "1Co"])
+        chap = rng.randint(1, 4)
+        verse = rng.randint(1, 6)
+        parts.append(f"[[@Bible:{book} {chap}:{verse}]]")
+        parts.append(rng.choice(["", " ", f" 본문 {i} ", f"\ntext {i}\n"]))
+    return "".join(parts)
+
+
+# ========== 테스트 ==========
+
+def test_book_tag_index_find_and_next_start():
+    entries = [(3, 16, 100, 110), (3, 17, 200, 210), (3, 16, 300, 310), (3, 17, 50, 60), (4, 1, 400, 410)]
+    index = BookTagIndex(entries)
+
+    assert len(index) == 5
+    assert index.find(3, 16) == (100, 110)
+    assert index.find(3, 18) is None
+    assert index.first_start_after(3, 17, 110) == 200
+    assert index.first_start_after(3, 17, 40) == 50
+    assert index.first_start_after(3, 17, 200) is None
+
+
+def test_fetch_bible_text_reads_until_next_verse():
+    text = "[[@Bible:Joh 3:16]] 하나님이 세상을 [[@Bible:Joh 3:17]] 아들을 보내신 것은 [[@Bible:Joh 4:1]] 끝"
+    result = fetch_bible_text(text, "Joh", "3", ["16", "17"], BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP)
+
+    assert result == {
+        "#### [Joh 3:16]": "하나님이 세상을",
+        "#### [Joh 3:17]": "아들을 보내신 것은 [[@Bible:Joh 4:1]] 끝",
+    }
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_fetch_bible_text_matches_linear_scan(seed):
+    rng = random.Random(seed)
+    text = random_document(rng, rng.randint(0, 60))
+    old_index = legacy_tag_index(text)
+
+    for std in ("Joh", "Rom", "1Co"):
+        for chap in ("1", "2", "3", "4"):
+            verses = [str(v) for v in range(1, 8)]
+            rng.shuffle(verses)
+            expected = legacy_fetch_with_index(text, old_index, std, chap, verses)
+            assert fetch_bible_text(text, std, chap, verses, BIBLE_ALIAS_FLAT, BIBLE_RAW_MAP) == expected
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from core import parallel_scan
+from core.parallel_scan import MIN_FILES_FOR_POOL, map_files_parallel
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i in range(MIN_FILES_FOR_POOL):
+        path = tmp_path / f"{i}.txt"
+        path.write_text("x" * i, encoding="utf-8")
+        paths.append(str(path))
+    # 없는 파일은 os.path.getsize 가 예외를 냄
+    paths[3] = str(tmp_path / "없음.txt")
+    return paths
+
+
+def _expected(files):
+    return {i: (None if i == 3 else i) for i in range(len(files))}
+
+
+def _run(files, **kwargs):
+    results = list(map_files_parallel(os.path.getsize, files, **kwargs))
+    assert sorted(i for i, _, _ in results) == list(range(len(files)))
+    assert all(files[i] == path for i, path, _ in results)
+    return {i: res for i, _, res in results}
+
+
+def test_sequential_for_few_files(files, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("파일이 적으면 풀을 만들지 않음")
+
+    monkeypatch.setattr(parallel_scan, "ProcessPoolExecutor", no_pool)
+    few = files[:MIN_FILES_FOR_POOL - 1]
+
+    assert _run(few, max_workers=4) == {i: v for i, v in _expected(files).items() if i < len(few)}
+    assert _run(files, max_workers=1) == _expected(files)
+
+
+def test_process_pool_keeps_indexes_and_failures(files):
+    assert _run(files, max_workers=2) == _expected(files)
+
+
+def test_falls_back_when_pool_cannot_start(files, monkeypatch):
+    def broken_pool(*args, **kwargs):
+        raise OSError("프로세스를 만들 수 없음")
+
+    monkeypatch.setattr(parallel_scan, "ProcessPoolExecutor", broken_pool)
+
+    assert _run(files, max_workers=2) == _expected(files)
+
+
+def test_broken_pool_finishes_remaining_files_sequentially(files, monkeypatch):
+    class Done:
+        def __init__(self, value):
+            self.value = value
+
+        def result(self):
+            return self.value
+
+    class Broken:
+        def result(self):
+            raise parallel_scan.BrokenProcessPool("워커 종료")
+
+    class HalfBrokenPool:
+        def __init__(self, *args, **kwargs):
+            self.submitted = 0
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, func, path, *args):
+            self.submitted += 1
+            return Done(func(path, *args)) if self.submitted <= 2 else Broken()
+
+    monkeypatch.setattr(parallel_scan, "ProcessPoolExecutor", HalfBrokenPool)
+    monkeypatch.setattr(parallel_scan, "as_completed", lambda futures: list(futures))
+
+    results = list(map_files_parallel(os.path.getsize, files, max_workers=2))
+    # 풀에서 끝난 두 파일 뒤에 나머지를 순차 처리 (중복 없이)
+    assert [i for i, _, _ in results] == list(range(len(files)))
+    assert {i: res for i, _, res in results} == _expected(files)
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from core.result_heap import TopK
+
+
+def test_keeps_highest_scores_in_order():
+    top = TopK(3)
+    for score, item in [(1.0, "a"), (5.0, "b"), (3.0, "c"), (4.0, "d"), (0.5, "e")]:
+        top.push(score, item)
+
+    assert len(top) == 3
+    assert top.items() == ["b", "d", "c"]
+
+
+def test_push_reports_whether_item_was_kept():
+    top = TopK(2)
+
+    assert top.push(1.0, "a")
+    assert top.push(2.0, "b")
+    assert not top.push(0.5, "c")
+    assert top.push(3.0, "d")
+    assert top.items() == ["d", "b"]
+
+
+def test_ties_keep_insertion_order():
+    top = TopK(2)
+    for item in "abcd":
+        top.push(1.0, item)
+
+    assert top.items() == ["a", "b"]
+
+
+def test_zero_k_keeps_nothing():
+    top = TopK(0)
+
+    assert not top.push(1.0, "a")
+    assert top.items() == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_full_sort(seed):
+    rng = random.Random(seed)
+    k = rng.randint(1, 15)
+    # 동점이 자주 나오도록 점수 범위를 좁게
+    scored = [(float(rng.randint(0, 10)), i) for i in range(rng.randint(0, 60))]
+    top = TopK(k)
+    for score, item in scored:
+        top.push(score, item)
+
+    expected = [item for _, item in sorted(scored, key=lambda e: e[0], reverse=True)][:k]
+    assert top.items() == expected
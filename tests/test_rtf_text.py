@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from core.rtf_text import strip_rtf_html
+from tools.bench_rtf_decoder import legacy_clean_rtf_html, legacy_decode_rtf
+
+# 실제 모듈 행에 나오는 조각 (\u 이스케이프는 비 ASCII 문자만, 실제 e-Sword/MySword 출력과 같음)
+PIECES = [
+    "\\b ", "\\b0 ", "\\par\n", "\\fs24", "\\cf1 ", "\\i0", "\\u54620?", "\\u-3913?", "\\u945?",
+    "{\\fonttbl x}", "{\\colortbl;\\red0;}", "{\\u54620 x}", "{", "}", "<b>", "</b>", "<br/>",
+    "<i\n>", "<a href='x'>", "하나님", "Jesus", "λόγος", " ", "\n", "  ", "\t", "abc", "12", "-",
+    "\\", "<", ">", "?", "\\\\",
+]
+
+
+def random_row(rng: random.Random) -> str:
+    return "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 12)))
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("\\b 태초에\\b0  하나님이\\par", "태초에 하나님이"),
+        ("{\\rtf1 \\b 태초에}", ""),
+        ("\\u54620?\\u44544? 성경", "한글 성경"),
+        ("<p>믿음 <b>소망</b></p>\n사랑", "믿음 소망 사랑"),
+        ("{\\fonttbl {\\f0 Arial;}}본문", "본문"),
+        ("", ""),
+    ],
+)
+def test_examples(raw, expected):
+    assert strip_rtf_html(raw) == expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_decode_rtf_matches_previous_regexes(seed):
+    rng = random.Random(seed)
+    for _ in range(2000):
+        row = random_row(rng)
+        assert strip_rtf_html(row) == legacy_decode_rtf(row), row
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_clean_rtf_html_matches_previous_regexes(seed):
+    rng = random.Random(seed)
+    for _ in range(2000):
+        row = random_row(rng)
+        expected = legacy_clean_rtf_html(row)
+        if "<>" in expected and "<>" not in row:
+            # 알려진 차이: 제어어/중괄호를 지우고 나서 비게 된 태그를 예전 구현은 "<>" 로 남김
+            continue
+        assert strip_rtf_html(row, multiline=True) == expected, row
+
+
+def test_markup_only_tag_is_removed():
+    assert legacy_clean_rtf_html("말씀<\\b >") == "말씀<>"
+    assert strip_rtf_html("말씀<\\b >", multiline=True) == "말씀"
+
+
+def test_braces_inside_tag():
+    row = "b{가{><}\\par >"
+    assert legacy_clean_rtf_html(row) == "b가><>"
+    assert strip_rtf_html(row, multiline=True) == "b가>"
+
+
+def test_control_word_after_removed_block():
+    # 예전 clean_rtf_html 은 제어 블록을 먼저 지운 뒤 제어어를 찾았음 (\fs24 가 뒤의 탭까지 지움)
+    row = "-<br/>\\fs24{\\fonttbl x}\t\\b Jesus"
+    assert strip_rtf_html(row, multiline=True) == legacy_clean_rtf_html(row) == "-Jesus"
+
+
+def test_out_of_range_escape_is_dropped():
+    # 예전 decode_rtf 와 같이 제어어로 지우고 대체 문자만 남김
+    assert strip_rtf_html("a\\u9999999?b") == legacy_decode_rtf("a\\u9999999?b")
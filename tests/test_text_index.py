@@ -0,0 +1,202 @@
+import os
+import random
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+text_index = pytest.importorskip("core.text_index")
+
+from core.text_index import (
+    find_proximity_hit,
+    match_documents,
+    normalize_text,
+    normalize_with_offsets,
+    parse_search_query,
+    corpus_stats,
+    refresh_text_index,
+    term_doc_freq,
+    term_positions,
+)
+
+
+def brute_proximity_hit(positions: Dict[str, List[int]], terms: List[str], window: int) -> Optional[Tuple[int, int]]:
+    """모든 출현 위치를 직접 비교하는 기준 구현"""
+    terms = [t for t in dict.fromkeys(terms) if t]
+    if not terms or any(not positions.get(t) for t in terms):
+        return None
+    anchor = min(terms, key=lambda t: len(positions[t]))
+    for p in positions[anchor]:
+        lo, hi = p - window, p + len(anchor) + window
+        start, end = p, p + len(anchor)
+        for term in terms:
+            if term == anchor:
+                continue
+            inside = [q for q in positions[term] if q >= lo and q + len(term) <= hi]
+            if not inside:
+                break
+            start, end = min(start, inside[0]), max(end, inside[0] + len(term))
+        else:
+            return start, end
+    return None
+
+
+def find_all(text: str, term: str) -> List[int]:
+    return [i for i in range(len(text) - len(term) + 1) if text.startswith(term, i)]
+
+
+# ========== 정규화 ==========
+
+def test_normalize_folds_case_accents_and_final_sigma():
+    assert normalize_text("ΆΓΙΟΣ Λόγος") == "αγιοσ λογοσ"
+    assert normalize_text("Café") == "cafe"
+
+
+def test_normalize_drops_hebrew_points_and_keeps_offsets():
+    text = "בְּרֵאשִׁית ברא"
+    norm, offsets = normalize_with_offsets(text)
+
+    assert norm == "בראשית ברא"
+    assert offsets is not None and len(offsets) == len(norm)
+    assert [text[i] for i in offsets] == list(norm)
+
+
+def test_normalize_composes_conjoining_jamo():
+    text = "\u1112\u1161\u11ab\u1100\u1173\u11af 성경"  # 첫가끝 "한글"
+    norm, offsets = normalize_with_offsets(text)
+
+    assert norm == "한글 성경"
+    assert offsets[:2] == [0, 3]
+
+
+def test_normalize_collapses_whitespace():
+    norm, offsets = normalize_with_offsets("태초에  \n 하나님이")
+
+    assert norm == "태초에 하나님이"
+    assert offsets[3:5] == [3, 7]
+
+
+# ========== 근접 검색 ==========
+
+def test_proximity_uses_later_occurrences():
+    positions = {"믿음": [0, 500], "소망": [510]}
+
+    assert find_proximity_hit(positions, ["믿음", "소망"], 20) == (500, 512)
+    assert find_proximity_hit(positions, ["믿음", "소망"], 5) is None
+
+
+def test_proximity_missing_term():
+    assert find_proximity_hit({"a": [1], "b": []}, ["a", "b"], 10) is None
+    assert find_proximity_hit({}, [], 10) is None
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_proximity_matches_brute_force(seed):
+    rng = random.Random(seed)
+    terms = ["ab", "cde", "f", "gh"][: rng.randint(2, 4)]
+    positions = {t: sorted(rng.sample(range(400), rng.randint(0, 12))) for t in terms}
+    window = rng.choice([0, 3, 10, 40])
+
+    assert find_proximity_hit(positions, terms, window) == brute_proximity_hit(positions, terms, window)
+
+
+# ========== 색인 검색 ==========
+
+DOCS = {
+    "창세기 강해.txt": "태초에 하나님이 천지를 창조하시니라. 땅이 혼돈하고 공허하며",
+    "요한복음.txt": "태초에 말씀이 계시니라 이 말씀이 하나님과 함께 계셨으니 말씀은 곧 하나님이시니라",
+    "로마서.txt": "믿음 소망 사랑 " + "은혜 " * 40 + "믿음으로 말미암아",
+    "Greek.txt": "ἐν ἀρχῇ ἦν ὁ λόγος, καὶ ὁ λόγος ἦν πρὸς τὸν θεόν",
+}
+
+
+@pytest.fixture
+def library(tmp_path):
+    paths = []
+    for name, content in DOCS.items():
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+        paths.append(str(path))
+    assert refresh_text_index(paths) == len(paths)
+    return paths
+
+
+def _names(matches) -> List[str]:
+    return sorted(os.path.basename(m.path) for m in matches)
+
+
+def test_refresh_skips_unchanged_files(library):
+    assert refresh_text_index(library) == 0
+
+
+def test_term_positions_match_text(library):
+    conn = text_index._connect_text_index()
+    try:
+        doc_ids = {path: doc_id for doc_id, path in conn.execute("SELECT id, path FROM docs")}
+        for term in ["태초에", "말씀", "하나님", "믿음", "λογοσ", "은", "니라"]:
+            found = term_positions(conn, term, set(doc_ids.values()))
+            for path, doc_id in doc_ids.items():
+                with open(path, encoding="utf-8") as f:
+                    expected = find_all(normalize_text(f.read()), term)
+                assert found.get(doc_id, []) == expected, (term, path)
+    finally:
+        conn.close()
+
+
+def test_match_documents_operators(library):
+    assert _names(match_documents(library, parse_search_query("태초에"))) == ["요한복음.txt", "창세기 강해.txt"]
+    assert _names(match_documents(library, parse_search_query("태초에 -말씀"))) == ["창세기 강해.txt"]
+    assert _names(match_documents(library, parse_search_query('"말씀이 계시니라"'))) == ["요한복음.txt"]
+    assert _names(match_documents(library, parse_search_query("λόγος"))) == ["Greek.txt"]
+
+
+def test_match_documents_proximity_window(library):
+    # "믿음" 과 "말미암아" 는 문서 뒤쪽에서만 가까이 나옴
+    near = match_documents(library, parse_search_query("+믿음 +말미암아 ~10"))
+    assert _names(near) == ["로마서.txt"]
+    text = DOCS["로마서.txt"]
+    assert near[0].hit == (text.rindex("믿음"), text.rindex("말미암아") + len("말미암아"))
+
+    assert match_documents(library, parse_search_query("+소망 +말미암아 ~10")) == []
+
+
+def test_match_documents_hit_maps_to_original_text(library):
+    (match,) = match_documents(library, parse_search_query("λόγος"))
+    start, end = match.hit
+
+    assert DOCS["Greek.txt"][start:end] == "λόγος"
+
+
+# ========== 순위 통계 ==========
+
+def _expected_stats(paths: List[str], terms: List[str]) -> Tuple[int, int, Dict[str, int]]:
+    texts = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            texts.append(normalize_text(f.read()))
+    texts = [t for t in texts if t]
+    return len(texts), sum(map(len, texts)), {t: sum(t in text for text in texts) for t in terms}
+
+
+def test_corpus_stats_follow_updates_and_deletes(library, tmp_path):
+    os.remove(library[0])
+    with open(library[1], "w", encoding="utf-8") as f:
+        f.write("말씀이 육신이 되어 우리 가운데 거하시매")
+    empty = tmp_path / "빈 문서.txt"
+    empty.write_text("", encoding="utf-8")
+    paths = library[1:] + [str(empty)]
+    refresh_text_index(paths)
+
+    terms = ["말", "말씀", "태초", "은혜", "λ", "없음"]
+    doc_count, total_length, doc_freq = _expected_stats(paths, terms)
+    conn = text_index._connect_text_index()
+    try:
+        stats = corpus_stats(conn, terms)
+        # 3글자 이상은 bigram 문서 수의 최솟값 (실제 문서 수 이상)
+        assert term_doc_freq(conn, "말미암아") >= 1
+        assert term_doc_freq(conn, "하나님이") == 0
+    finally:
+        conn.close()
+
+    assert stats.doc_count == doc_count
+    assert stats.avg_length == pytest.approx(total_length / doc_count)
+    assert stats.doc_freq == doc_freq
@@ -0,0 +1,142 @@
+import pytest
+
+pytest.importorskip("streamlit")
+
+from core.bible_utils import get_ultimate_bible_map
+from core.verse_index import (
+    KIND_MENTION,
+    KIND_TAG,
+    MAX_MENTION_VERSES,
+    MENTION_CONTEXT,
+    _paragraph_span,
+    candidate_files,
+    index_text_mentions,
+    index_text_tags,
+    mention_results,
+    refresh_verse_index,
+)
+
+DOCS = {
+    "verse.txt": "[[@Bible:Joh 3:16]] 하나님이 세상을 이처럼\n[[@Bible:Joh 3:17]] 심판하려 하심이 아니요",
+    "book_intro.txt": "@Bible:Joh 0:0 요한복음 서론\n[[@Bible:Joh 1:1]] 태초에 말씀이",
+    "chapter_intro.txt": "[[@Bible:Joh 3:0]] 3장 서론\n[[@Bible:Joh 3:1]] 니고데모",
+    "chapter_marker.txt": "[[@Bible:Joh 5]] 5장 머리말",
+    "other_book.txt": "[[@Bible:Rom 8:28]] 모든 것이 합력하여",
+    "mention.txt": "요 3:16 을 본문에서만 언급",
+    "other_chapter.txt": "[[@Bible:Joh 4:1]] 4장",
+}
+
+
+@pytest.fixture
+def library(tmp_path):
+    paths = {}
+    for name, text in DOCS.items():
+        path = tmp_path / name
+        path.write_text(text, encoding="utf-8")
+        paths[name] = str(path)
+    refresh_verse_index(list(paths.values()))
+    return paths
+
+
+def _names(library, found):
+    by_path = {path: name for name, path in library.items()}
+    return sorted(by_path[p] for p in found)
+
+
+def test_verse_mode_includes_intro_and_chapter_markers(library):
+    found = candidate_files(library.values(), "Joh", "3", ["16"], "verse")
+
+    assert _names(library, found) == ["book_intro.txt", "chapter_intro.txt", "chapter_marker.txt", "verse.txt"]
+
+
+def test_verse_mode_other_chapter(library):
+    found = candidate_files(library.values(), "Joh", "4", ["1"], "verse")
+
+    assert _names(library, found) == ["book_intro.txt", "chapter_marker.txt", "other_chapter.txt"]
+
+
+def test_intro_mode_matches_whole_book(library):
+    found = candidate_files(library.values(), "Joh", "0", [], "intro")
+
+    assert _names(library, found) == [
+        "book_intro.txt",
+        "chapter_intro.txt",
+        "chapter_marker.txt",
+        "other_chapter.txt",
+        "verse.txt",
+    ]
+
+
+def test_keeps_input_order_and_rejects_bad_input(library):
+    files = list(library.values())[::-1]
+    found = candidate_files(files, "Joh", "3", ["16"], "verse")
+
+    assert found == [p for p in files if p in found]
+    assert candidate_files(files, "Xyz", "3", ["16"], "verse") == []
+    assert candidate_files(files, "Joh", "3", ["a"], "verse") == []
+
+
+def test_refresh_skips_unchanged_files(library):
+    assert refresh_verse_index(list(library.values())) == 0
+    assert candidate_files([library["verse.txt"]], "Joh", "3", ["16"], "verse") == [library["verse.txt"]]
+
+
+# ========== 본문 언급 (태그 없는 문서) ==========
+
+def _mention_verses(rows):
+    return [(book, chap, verse) for book, chap, verse, *_, kind in rows if kind == KIND_MENTION]
+
+
+def test_mention_range_is_expanded_and_capped():
+    rows = index_text_mentions("롬 8:28-30 과 시 119:1-100 을 보라", [])
+
+    assert _mention_verses(rows)[:3] == [("Rom", 8, 28), ("Rom", 8, 29), ("Rom", 8, 30)]
+    psalm = [verse for book, _, verse in _mention_verses(rows) if book == "Psa"]
+    assert psalm == list(range(1, MAX_MENTION_VERSES + 1))
+    # 장만 있는 참조는 색인하지 않음
+    assert index_text_mentions("요한복음 3장을 보라", []) == []
+
+
+def test_mention_body_is_the_paragraph():
+    text = "첫 문단\n\n둘째 문단 요 3:16 설명\n이어지는 줄\n\n셋째 문단"
+    (row,) = index_text_mentions(text, [])
+
+    assert text[row[4] : row[5]] == "둘째 문단 요 3:16 설명\n이어지는 줄"
+
+
+def test_long_paragraph_is_clipped_at_word_boundary():
+    before = "앞말 " * 300
+    after = " 뒷말" * 300
+    text = before + "요 3:16" + after
+    start = len(before)
+    lo, hi = _paragraph_span(text, start, start + len("요 3:16"))
+
+    assert start - MENTION_CONTEXT <= lo and hi <= start + len("요 3:16") + MENTION_CONTEXT
+    assert text[lo - 1] == " " and text[hi] == " "
+    assert text[lo:hi].startswith("앞말") and text[lo:hi].endswith("뒷말")
+
+
+def test_references_inside_logos_tags_are_not_mentions():
+    bible_alias_flat = get_ultimate_bible_map()[0]
+    rows = index_text_tags("[[@Bible:Joh 3:16]] 본문에서 롬 8:28 을 인용", bible_alias_flat)
+
+    assert [(r[0], r[1], r[2]) for r in rows if r[6] == KIND_TAG] == [("Joh", 3, 16)]
+    assert _mention_verses(rows) == [("Rom", 8, 28)]
+
+
+def test_mention_results_from_untagged_file(tmp_path):
+    sermon = tmp_path / "sermon.txt"
+    sermon.write_text(
+        "서론 문단\n\n요한복음 3장 16-17절 말씀은 사랑을 말합니다.\n\n다른 문단에서 요 3:17 을 다시 봅니다.",
+        encoding="utf-8",
+    )
+    files = [str(sermon)]
+    refresh_verse_index(files)
+
+    assert candidate_files(files, "Joh", "3", ["16"], "verse") == []
+    results = mention_results(files, "Joh", "3", ["16", "17"])
+    assert results == {
+        str(sermon): "#### [Joh 3:16 (본문 언급)]\n요한복음 3장 16-17절 말씀은 사랑을 말합니다.\n\n"
+        "#### [Joh 3:17 (본문 언급)]\n다른 문단에서 요 3:17 을 다시 봅니다."
+    }
+    assert mention_results(files, "Joh", "3", ["18"]) == {}
@@ -0,0 +1,106 @@
+import pytest
+
+from core.verse_keys import (
+    BOOK_CODES,
+    TOTAL_VERSES,
+    VERSE_COUNTS,
+    book_code,
+    book_id,
+    chapter_count,
+    clamp_verses,
+    is_valid_key,
+    key_from_number,
+    merge_by_verse_key,
+    split_verse_key,
+    verse_count,
+    verse_key,
+    verse_keys_between,
+    verse_number,
+)
+
+
+def test_versification_totals():
+    assert len(BOOK_CODES) == 66
+    assert sum(len(chapters) for chapters in VERSE_COUNTS) == 1189
+    assert TOTAL_VERSES == 31102
+
+
+def test_key_layout():
+    assert verse_key(43, 3, 16) == 43003016
+    assert split_verse_key(43003016) == (43, 3, 16)
+    assert verse_key(1, 0, 0) < verse_key(1, 1, 0) < verse_key(1, 1, 1) < verse_key(2, 0, 0)
+
+
+def test_book_codes():
+    assert book_id("Joh") == 43
+    assert book_id("joh") == 43
+    assert book_id(" REV ") == 66
+    assert book_id("") is None
+    assert book_id("Xyz") is None
+    assert book_code(43) == "Joh"
+    assert book_code(0) is None
+    assert book_code(67) is None
+    assert all(book_id(book_code(b)) == b for b in range(1, 67))
+
+
+def test_counts():
+    assert chapter_count(19) == 150
+    assert verse_count(19, 119) == 176
+    assert verse_count(43, 3) == 36
+    assert verse_count(43, 22) == 0
+    assert chapter_count(99) == 0
+
+
+def test_verse_numbers_round_trip():
+    assert verse_number(verse_key(1, 1, 1)) == 0
+    assert verse_number(verse_key(66, 22, 21)) == TOTAL_VERSES - 1
+    previous = -1
+    for b, chapters in enumerate(VERSE_COUNTS, 1):
+        for c, count in enumerate(chapters, 1):
+            for v in sorted({1, count}):
+                key = verse_key(b, c, v)
+                number = verse_number(key)
+                assert number > previous
+                assert key_from_number(number) == key
+                previous = number
+
+
+def test_invalid_keys():
+    for key in (verse_key(43, 3, 0), verse_key(43, 3, 37), verse_key(43, 22, 1), verse_key(67, 1, 1)):
+        assert not is_valid_key(key)
+        assert verse_number(key) is None
+    assert key_from_number(-1) is None
+    assert key_from_number(TOTAL_VERSES) is None
+
+
+def test_verses_between_crosses_chapters_and_books():
+    keys = list(verse_keys_between(verse_key(43, 3, 35), verse_key(43, 4, 2)))
+    assert keys == [verse_key(43, 3, 35), verse_key(43, 3, 36), verse_key(43, 4, 1), verse_key(43, 4, 2)]
+
+    keys = list(verse_keys_between(verse_key(1, 50, 26), verse_key(2, 1, 1)))
+    assert keys == [verse_key(1, 50, 26), verse_key(2, 1, 1)]
+
+    assert list(verse_keys_between(verse_key(43, 4, 2), verse_key(43, 3, 35))) == []
+    assert list(verse_keys_between(verse_key(43, 3, 0), verse_key(43, 3, 2))) == []
+
+
+def test_clamp_verses():
+    assert clamp_verses(43, 3, [34, 35, 36, 37, 40]) == [34, 35, 36]
+    # 절 수를 모르는 장이면 그대로
+    assert clamp_verses(43, 30, [1, 99]) == [1, 99]
+
+
+def test_merge_by_verse_key_is_stable():
+    first = [(verse_key(43, 3, 16), "a"), (verse_key(43, 3, 18), "a")]
+    second = [(verse_key(43, 3, 16), "b"), (verse_key(43, 3, 17), "b")]
+
+    assert [v for _, v in merge_by_verse_key(first, second)] == ["a", "b", "b", "a"]
+
+
+def test_book_order_matches_bible_map():
+    pytest.importorskip("streamlit")
+    from core.bible_utils import get_ultimate_bible_map
+
+    _, bible_raw_map = get_ultimate_bible_map()
+    assert len(bible_raw_map) == 66
+    assert [book_id(code) for code in bible_raw_map] == list(range(1, 67))
@@ -0,0 +1,136 @@
+"""
+RTF/HTML 평문 변환 마이크로 벤치마크
+
+실제 모듈 파일의 본문 행을 읽어, 예전 다단계 정규식 구현(decode_rtf / clean_rtf_html)과
+core.rtf_text.strip_rtf_html 의 처리량(MB/s)과 결과 일치율을 비교합니다.
+
+사용법 (앱 폴더에서):
+    python -m tools.bench_rtf_decoder 주석.cmti 사전.dct.twm 성경.mybible
+    python -m tools.bench_rtf_decoder --rows 20000 --repeat 5 commentaries/
+"""
+import argparse
+import os
+import re
+import sqlite3
+import time
+from typing import Callable, Iterable, List
+
+from core.rtf_text import strip_rtf_html
+
+MODULE_EXTS = (".mybible", ".twm", ".sqlite3", ".sqlite", ".cdb", ".cmti", ".cmtx", ".dcti", ".lexi", ".bbli")
+
+
+# ========== 비교 대상: 예전 구현 (변경 전 코드 그대로) ==========
+
+def legacy_decode_rtf(raw):
+    if not raw:
+        return ""
+    try:
+        raw = raw.decode("utf-8") if isinstance(raw, bytes) else str(raw)
+
+        def repl(m):
+            try:
+                return chr(int(m.group(1)))
+            except Exception:
+                return m.group(0)
+
+        text = re.sub(r"\\u(-?\d+)\??", repl, raw)
+        text = re.sub(r"\{\\.*?\}|\\([a-z]{1,10})(-?\d+)? ?|<.*?>", "", text)
+        return re.sub(r"\s+", " ", text.replace("}", "").replace("{", "")).strip()
+    except Exception:
+        return str(raw)
+
+
+def legacy_clean_rtf_html(text):
+    if not text:
+        return ""
+    text = re.sub(r'\\u(-?\d+)\??', lambda m: chr(int(m.group(1))) if int(m.group(1)) >= 0 else m.group(0), text)
+    text = re.sub(r'\{\\[^\}]*\}', '', text)
+    text = re.sub(r'\\[a-z]{1,10}(-?\d+)?\s?', '', text)
+    text = text.replace('{', '').replace('}', '')
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+# ========== 본문 행 수집 ==========
+
+def _expand_paths(paths: Iterable[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in names if n.lower().endswith(MODULE_EXTS))
+        elif os.path.isfile(path):
+            files.append(path)
+    return files
+
+
+def collect_rows(paths: Iterable[str], max_rows: int) -> List[str]:
+    """모듈 DB 의 모든 테이블에서 RTF/HTML 이 섞인 텍스트 값을 모읍니다."""
+    rows: List[str] = []
+    for path in _expand_paths(paths):
+        try:
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        except sqlite3.Error:
+            continue
+        try:
+            tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+            for table in tables:
+                columns = [c[1] for c in conn.execute(f"PRAGMA table_info('{table}')")]
+                for col in columns:
+                    sql = f"SELECT \"{col}\" FROM \"{table}\" WHERE typeof(\"{col}\")='text' LIMIT ?"
+                    for (value,) in conn.execute(sql, (max_rows - len(rows),)):
+                        if any(ch in value for ch in ("\\", "<", "{")):
+                            rows.append(value)
+                    if len(rows) >= max_rows:
+                        return rows
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+    return rows
+
+
+# ========== 측정 ==========
+
+def _throughput(func: Callable[[str], str], rows: List[str], repeat: int) -> float:
+    total_bytes = sum(len(r.encode("utf-8")) for r in rows) * repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for row in rows:
+            func(row)
+    elapsed = time.perf_counter() - start
+    return total_bytes / (1024 * 1024) / elapsed if elapsed > 0 else float("inf")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RTF/HTML 평문 변환 처리량 비교")
+    parser.add_argument("paths", nargs="+", help="모듈 파일 또는 폴더")
+    parser.add_argument("--rows", type=int, default=50000, help="최대 본문 행 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수")
+    args = parser.parse_args()
+
+    rows = collect_rows(args.paths, args.rows)
+    if not rows:
+        print("RTF/HTML 이 포함된 본문 행을 찾지 못했습니다.")
+        return
+    size_mb = sum(len(r.encode("utf-8")) for r in rows) / (1024 * 1024)
+    print(f"본문 행 {len(rows):,}개 ({size_mb:.2f} MB), {args.repeat}회 반복")
+
+    cases = (
+        ("decode_rtf", legacy_decode_rtf, strip_rtf_html),
+        ("clean_rtf_html", legacy_clean_rtf_html, lambda text: strip_rtf_html(text, multiline=True)),
+    )
+    for name, legacy, single_pass in cases:
+        old_rate = _throughput(legacy, rows, args.repeat)
+        new_rate = _throughput(single_pass, rows, args.repeat)
+        same = sum(1 for r in rows if legacy(r) == single_pass(r))
+        print(
+            f"{name:>15}: 예전 {old_rate:8.2f} MB/s → 단일 패스 {new_rate:8.2f} MB/s "
+            f"(x{new_rate / old_rate:.2f}), 결과 일치 {same / len(rows):.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
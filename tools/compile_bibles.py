@@ -0,0 +1,52 @@
+"""
+성경 모듈 바이너리 변환
+
+설치된 성경 모듈(.mybible/.twm/.cdb/.sqlite3)을 core.bible_binary 형식으로 한 번 변환해
+.bibleai_cache/bible_bin/*.bbin 에 저장합니다. 변환된 모듈은 이후 절/장 조회를
+SQLite 와 RTF 디코딩 없이 mmap 에서 바로 읽습니다. (원본이 바뀌면 자동으로 원본을 다시 씀)
+
+사용법 (앱 폴더에서):
+    python -m tools.compile_bibles
+    python -m tools.compile_bibles bibles 다른폴더 --force
+"""
+import argparse
+import os
+import time
+
+from core.bible_binary import compile_bible_modules
+from core.search_engine import scan_bible_module_files
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="성경 모듈 바이너리 변환")
+    parser.add_argument("folders", nargs="*", default=["."], help="성경 모듈을 찾을 폴더 (기본: . 과 bibles)")
+    parser.add_argument("--force", action="store_true", help="최신 바이너리가 있어도 다시 변환")
+    args = parser.parse_args()
+
+    files = scan_bible_module_files(args.folders)
+    if not files:
+        print("성경 모듈을 찾지 못했습니다.")
+        return
+    print(f"성경 모듈 {len(files)}개 변환 시작")
+
+    def _progress(done: int, total: int, path: str) -> None:
+        print(f"\r  {done}/{total} ({os.path.basename(path)})", end="", flush=True)
+
+    started = time.perf_counter()
+    results = compile_bible_modules(files, force=args.force, progress_callback=_progress)
+    elapsed = time.perf_counter() - started
+    print()
+
+    converted = 0
+    for path in files:
+        res = results.get(path)
+        if res is None:
+            continue
+        converted += 1
+        verses, size = res
+        print(f"  {os.path.basename(path)}: 절 {verses:,}개, {size / (1024 * 1024):.1f} MB")
+    print(f"{converted}개 변환 (성경 본문이 없는 모듈 {len(files) - converted}개 제외), {elapsed:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
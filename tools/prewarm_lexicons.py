@@ -0,0 +1,72 @@
+"""
+사전 일괄 디코딩 (미리 읽기)
+
+dct 폴더의 모든 *.dct.twm 사전 항목을 프로세스 풀로 디코딩해
+사전별 저장소(.bibleai_cache/lexicon/*.db)를 채웁니다.
+화면을 띄우기 전에 한 번 실행해 두면 원어 해설창 조회가 첫 사용부터 키 조회 한 번으로 끝납니다.
+
+사용법 (앱 폴더에서):
+    python -m tools.prewarm_lexicons
+    python -m tools.prewarm_lexicons dct 다른폴더/krstrong.dct.twm --workers 4 --force
+"""
+import argparse
+import os
+import time
+from typing import Iterable, List
+
+from core.lexicon_utils import prewarm_lexicons
+
+DICTIONARY_EXT = ".dct.twm"
+
+
+def find_dictionaries(paths: Iterable[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(DICTIONARY_EXT):
+                    files.append(os.path.join(path, name))
+        elif os.path.isfile(path):
+            files.append(path)
+    return files
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="사전 항목 일괄 디코딩")
+    parser.add_argument("paths", nargs="*", default=["dct"], help="사전 파일 또는 폴더 (기본: dct)")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--force", action="store_true", help="이미 완료된 저장소도 비우고 다시 디코딩")
+    args = parser.parse_args()
+
+    files = find_dictionaries(args.paths)
+    if not files:
+        print("*.dct.twm 사전 파일을 찾지 못했습니다.")
+        return
+    print(f"사전 {len(files)}개 디코딩 시작")
+
+    def _progress(done: int, total: int, path: str) -> None:
+        print(f"\r  작업 {done}/{total} ({os.path.basename(path)})", end="", flush=True)
+
+    started = time.perf_counter()
+    stats = prewarm_lexicons(files, max_workers=args.workers, force=args.force, progress_callback=_progress)
+    elapsed = time.perf_counter() - started
+    print()
+
+    total_rows = 0
+    for st in stats:
+        name = os.path.basename(st.path)
+        size_mb = st.store_bytes / (1024 * 1024)
+        if st.skipped:
+            print(f"  {name}: 이미 완료 ({st.entries:,}개, {size_mb:.1f} MB) - 건너뜀")
+            continue
+        rate = st.rows / st.decode_seconds if st.decode_seconds > 0 else 0.0
+        print(
+            f"  {name} [{st.index_column}]: {st.entries:,}개 (신규 {st.added:,}) / 행 {st.rows:,}, "
+            f"디코딩 {st.decode_seconds:.1f}초 ({rate:,.0f}행/초), 완료 {st.elapsed:.1f}초, {size_mb:.1f} MB"
+        )
+        total_rows += st.rows
+    print(f"전체 {elapsed:.1f}초, 행 {total_rows:,}개 ({total_rows / elapsed if elapsed > 0 else 0:,.0f}행/초)")
+
+
+if __name__ == "__main__":
+    main()